@@ -0,0 +1,51 @@
+"""
+Batch environment benchmark: match steps per second against batch size
+
+Steps batches of matches in lockstep, with a quantum player measuring a
+uniform superposition, and prints the throughput for growing batch sizes.
+Run from the repository root:
+
+    python benchmarks/batch.py [--steps N]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# pylint: disable=wrong-import-position
+from qpong.model.batch_game import BatchGame
+from qpong.utils.parameters import QUBIT_NUM
+
+
+def main():
+    """
+    Print match steps per second for each batch size
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--steps", type=int, default=3000)
+    args = parser.parse_args()
+
+    actions = np.full(2**QUBIT_NUM, 1 / 2**QUBIT_NUM)
+    for num_matches in (1, 10, 100, 1000, 10000):
+        env = BatchGame(num_matches, rng=0)
+        env.reset()
+        matches = 0
+        start = time.perf_counter()
+        for _ in range(args.steps):
+            _, _, done, _ = env.step(actions)
+            matches += np.count_nonzero(done)
+        elapsed = time.perf_counter() - start
+        print(
+            "{:6} matches  {:10.0f} match steps/s  {:6} matches played".format(
+                num_matches, num_matches * args.steps / elapsed, matches
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
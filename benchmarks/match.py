@@ -0,0 +1,50 @@
+"""
+Match simulation benchmark: simulation steps per second without a display
+
+Plays full matches on the display-free game state, with an empty circuit
+for the quantum player, and checks that pygame is never imported. Run from
+the repository root:
+
+    python benchmarks/match.py [--matches N]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# pylint: disable=wrong-import-position
+from qpong.model.circuit_grid_model import CircuitGridModel
+from qpong.model.game_state import GameState
+from qpong.utils.parameters import CIRCUIT_DEPTH, EASY, EXPERT, NORMAL, QUBIT_NUM
+
+
+def main():
+    """
+    Print simulation steps per second at each difficulty
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--matches", type=int, default=20)
+    args = parser.parse_args()
+
+    for name, speed_factor in (("easy", EASY), ("normal", NORMAL), ("expert", EXPERT)):
+        steps = 0
+        start = time.perf_counter()
+        for seed in range(args.matches):
+            model = CircuitGridModel(QUBIT_NUM, CIRCUIT_DEPTH, "numpy", seed)
+            state = GameState(model, QUBIT_NUM, rng=random.Random(seed))
+            state.ball.initial_speed_factor = speed_factor
+            state.ball.reset()
+            while state.winner() is None:
+                state.step()
+                steps += 1
+        elapsed = time.perf_counter() - start
+        print("{:7} {:9} steps  {:8.0f} steps/s".format(name, steps, steps / elapsed))
+    assert "pygame" not in sys.modules
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Rendering benchmark: pixels pushed to the display and draw time per frame
+
+Plays a headless game for a number of frames, with the ball moving, the
+computer paddle following it and a gate edit every second, and compares
+redrawing and flipping the whole screen every frame to the dirty-rectangle
+renderer. Run from the repository root:
+
+    python benchmarks/render.py [--frames N]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import statistics
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# pylint: disable=wrong-import-position
+import pygame
+
+from qpong.utils.ball import Ball
+from qpong.utils.level import Level
+from qpong.utils.renderer import Renderer
+from qpong.utils.scene import Scene
+from qpong.utils.parameters import LAYOUT
+
+
+def play(frames, dirty_rects):
+    """
+    Play frames and return the pixels pushed and the draw time of each frame
+    """
+    random.seed(0)
+    screen = pygame.display.set_mode(LAYOUT.window_size)
+    scene = Scene()
+    level = Level()
+    ball = Ball()
+    level.setup(scene, ball)
+    ball.reset()
+
+    renderer = Renderer(screen, scene, ball)
+    renderer.add(level.right_statevector.sprites())
+    renderer.add(level.circuit_grid.sprites())
+    renderer.add(level.left_paddle, level.right_paddle, ball)
+    moving_sprites = pygame.sprite.Group(ball, level.left_paddle, level.right_paddle)
+    screen_pixels = screen.get_width() * screen.get_height()
+
+    pixels = []
+    draw_times = []
+    for frame in range(frames):
+        ball.update()
+        if frame % 18 == 0:
+            level.left_paddle.rect.y = ball.get_ypos() + random.randint(
+                -LAYOUT.width_unit * 4, LAYOUT.width_unit * 4
+            )
+            level.left_paddle.dirty = 1
+        if frame % 60 == 30:
+            with contextlib.redirect_stdout(io.StringIO()):
+                level.circuit_grid.move_to_adjacent_node(random.randint(1, 4))
+                level.circuit_grid.handle_input_h()
+                level.statevector_grid.paddle_before_measurement(
+                    level.circuit_grid_model, scene.qubit_num
+                )
+                level.right_statevector.arrange()
+        ball.action()
+
+        start = time.perf_counter()
+        if dirty_rects:
+            renderer.draw()
+            pixels.append(renderer.pixels_pushed)
+        else:
+            scene.hud(screen, ball)
+            level.right_statevector.draw(screen)
+            level.circuit_grid.draw(screen)
+            moving_sprites.draw(screen)
+            pygame.display.flip()
+            pixels.append(screen_pixels)
+        draw_times.append(time.perf_counter() - start)
+    return pixels, draw_times
+
+
+def main():
+    """
+    Print pixels pushed and draw time per frame for both renderers
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--frames", type=int, default=600)
+    args = parser.parse_args()
+
+    pygame.init()
+    for name, dirty_rects in (("full flip", False), ("dirty rects", True)):
+        pixels, draw_times = play(args.frames, dirty_rects)
+        print(
+            "{:12} pixels/frame mean {:9.0f} median {:9.0f}   draw {:.3f} ms".format(
+                name,
+                statistics.mean(pixels),
+                statistics.median(pixels),
+                1000 * statistics.median(draw_times),
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Startup benchmark: import time, time to first frame and memory footprint
+
+Each sample runs in a fresh interpreter so that module caches do not
+hide the import cost. The lazy mode starts the game as shipped, the eager
+mode first imports qiskit and every module of the package, as the game
+did before imports were made lazy. Run from the repository root:
+
+    python benchmarks/startup.py [--samples N]
+"""
+
+import argparse
+import importlib
+import json
+import os
+import pkgutil
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+MODES = ("lazy", "eager")
+
+
+def import_everything():
+    """
+    Import qiskit and every module of the qpong package up front
+    """
+    # pylint: disable=import-outside-toplevel
+    import qiskit.quantum_info  # pylint: disable=unused-import
+
+    import qpong
+
+    for module_info in pkgutil.walk_packages(qpong.__path__, "qpong."):
+        importlib.import_module(module_info.name)
+
+
+def first_frame(eager=False):
+    """
+    Import the game, build a level and draw one frame, reporting timings
+
+    Parameters:
+    eager (boolean): import qiskit and the whole package before the game
+    """
+    start = time.perf_counter()
+
+    if eager:
+        import_everything()
+
+    # pylint: disable=import-outside-toplevel
+    import pygame
+
+    from qpong.utils.ball import Ball
+    from qpong.utils.level import Level
+    from qpong.utils.scene import Scene
+    from qpong.utils.parameters import LAYOUT
+
+    imported = time.perf_counter()
+
+    pygame.init()
+    screen = pygame.display.set_mode(LAYOUT.window_size)
+    scene = Scene()
+    level = Level()
+    ball = Ball()
+    level.setup(scene, ball)
+    level.right_statevector.draw(screen)
+    level.circuit_grid.draw(screen)
+    pygame.display.flip()
+
+    drawn = time.perf_counter()
+
+    # pylint: disable=import-outside-toplevel
+    import resource
+
+    return {
+        "import_s": imported - start,
+        "first_frame_s": drawn - start,
+        "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "qiskit_loaded": "qiskit" in sys.modules,
+    }
+
+
+def run_samples(samples, mode):
+    """
+    Run first_frame in fresh headless interpreters and collect the results
+
+    Parameters:
+    samples (integer): number of interpreters to start
+    mode (string): one of MODES
+    """
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy")
+    env["PYTHONPATH"] = ROOT_DIR + os.pathsep + env.get("PYTHONPATH", "")
+    results = []
+    for _ in range(samples):
+        output = subprocess.run(
+            [sys.executable, __file__, "--child", mode],
+            env=env,
+            cwd=ROOT_DIR,
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+    return results
+
+
+def main():
+    """
+    Print median startup timings of the lazy and eager modes
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--samples", type=int, default=5)
+    parser.add_argument("--child", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(first_frame(eager=args.child == "eager")))
+        return
+
+    results = {mode: run_samples(args.samples, mode) for mode in MODES}
+    print("samples:        ", args.samples)
+    print("{:15} {:>12} {:>12}".format("", *MODES))
+    for key, unit in (("import_s", "s"), ("first_frame_s", "s"), ("max_rss_mb", "MB")):
+        print(
+            "{:15} {:>12} {:>12}".format(
+                key + ":",
+                *(
+                    "{:.3f} {}".format(
+                        statistics.median(r[key] for r in results[mode]), unit
+                    )
+                    for mode in MODES
+                )
+            )
+        )
+    print(
+        "{:15} {:>12} {:>12}".format(
+            "qiskit loaded:",
+            *(str(any(r["qiskit_loaded"] for r in results[mode])) for mode in MODES)
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -2,31 +2,173 @@
 Quantum version of the classic Pong game
 """
 
-import random
+import argparse
+import os
+import time
 
 import pygame
 from pygame import DOUBLEBUF, HWSURFACE, FULLSCREEN
 
+from qpong.model.game_state import GameState
+from qpong.resolution import DEFAULT_RESOLUTION, fit_resolution, parse_resolution
 from qpong.utils.ball import Ball
+from qpong.utils.capture import FrameCapture
 from qpong.utils.input import Input
 from qpong.utils.level import Level
+from qpong.utils.profiler import PROFILER, ProfilerOverlay
+from qpong.utils.renderer import Renderer
 from qpong.utils.scene import Scene
+from qpong.utils.timestep import FixedTimestep
 from qpong.utils.parameters import (
-    WINDOW_SIZE,
-    CLASSICAL_COMPUTER,
-    QUANTUM_COMPUTER,
-    WIN_SCORE,
-    WIDTH_UNIT,
-    MEASURE_RIGHT,
+    LAYOUT,
+    NORMAL,
+    RENDER_RATE,
+    SIMULATION_RATE,
 )
-from qpong.utils.colors import BLACK
 
 
-def main():
+def parse_args():
+    """
+    Parse command line options
+    """
+    parser = argparse.ArgumentParser(description="Quantum version of Pong")
+    parser.add_argument(
+        "--resolution",
+        type=parse_resolution,
+        help="logical resolution as WIDTHxHEIGHT, fitted to the display by default",
+    )
+    parser.add_argument(
+        "--windowed", action="store_true", help="play in a window, not full screen"
+    )
+    parser.add_argument(
+        "--headless",
+        action="store_true",
+        help="run without a display or sound, uncapped, and report the frame rate",
+    )
+    parser.add_argument(
+        "--frames",
+        type=int,
+        default=0,
+        help="stop after this many frames, 0 to play until quit",
+    )
+    parser.add_argument(
+        "--capture-every",
+        type=int,
+        default=0,
+        metavar="N",
+        help="capture every Nth frame, F12 captures on demand",
+    )
+    parser.add_argument(
+        "--capture-dir",
+        help="directory of the captured PNG frames, captures by default, "
+        "created on the first capture",
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="PATH",
+        help="time each stage of the game loop and write the timings to a CSV "
+        "file, or JSON if PATH ends with .json, on exit. F3 shows them",
+    )
+    parser.add_argument(
+        "--sim-rate",
+        type=int,
+        help="simulation steps per second, 60 by default",
+    )
+    parser.add_argument(
+        "--fps",
+        type=int,
+        help="frames per second at most, 0 for uncapped, 60 by default",
+    )
+    return parser.parse_args()
+
+
+def open_display(resolution=None, windowed=False):
+    """
+    Pick the logical resolution and open the display
+
+    The game is rendered directly at the logical resolution, set on LAYOUT
+    before any game object is built, so that assets are scaled once when
+    loaded and never per frame. In full screen the game is centered on the
+    desktop when it is smaller.
+
+    Parameters:
+    resolution (tuple): (width, height), or None to fit the display
+    windowed (bool): open a window instead of going full screen, always
+        the case with the dummy video driver
+
+    Returns:
+        pygame.Surface: surface of the size of the logical resolution
+    """
+    desktop_size = pygame.display.get_desktop_sizes()[0]
+    if pygame.display.get_driver() == "dummy":
+        windowed = True
+        if resolution is None:
+            resolution = DEFAULT_RESOLUTION
+    if resolution is None:
+        if windowed:
+            # leave room for the window decorations and task bars
+            desktop_size = (desktop_size[0] * 9 // 10, desktop_size[1] * 9 // 10)
+        resolution = fit_resolution(desktop_size)
+    LAYOUT.set_resolution(resolution)
+
+    if windowed:
+        return pygame.display.set_mode(resolution, DOUBLEBUF)
+
+    # hardware acceleration to reduce flickering. Works only in full screen
+    flags = DOUBLEBUF | HWSURFACE | FULLSCREEN
+    if resolution[0] > desktop_size[0] or resolution[1] > desktop_size[1]:
+        return pygame.display.set_mode(resolution, flags)
+    window = pygame.display.set_mode(desktop_size, flags)
+    game_rect = pygame.Rect((0, 0), resolution)
+    game_rect.center = window.get_rect().center
+    return window.subsurface(game_rect)
+
+
+# pylint: disable=too-many-locals disable=too-many-statements
+# pylint: disable=too-many-branches disable=too-many-arguments
+def main(
+    resolution=None,
+    windowed=False,
+    headless=False,
+    frames=0,
+    capture_every=0,
+    capture_dir=None,
+    profile=None,
+    simulation_rate=None,
+    render_rate=None,
+):
     """
     Main game loop
+
+    Parameters:
+    resolution (tuple): (width, height), or None to fit the display
+    windowed (bool): open a window instead of going full screen
+    headless (bool): use SDL's dummy video and audio drivers, never present
+        frames nor cap the frame rate, skip the start and game over screens
+        and report the frame rate reached
+    frames (integer): stop after this many frames, 0 to play until quit
+    capture_every (integer): capture every Nth frame, 0 to capture only on
+        demand
+    capture_dir (string): directory of the captured PNG frames, None to keep
+        them as NumPy arrays
+    profile (string): path of the CSV or JSON file the stage timings are
+        written to on exit, None to record them only while the profiler
+        overlay is shown
+    simulation_rate (integer): simulation steps per second, SIMULATION_RATE
+        by default
+    render_rate (integer): frames per second at most, 0 for uncapped,
+        RENDER_RATE by default. Headless runs are always uncapped and
+        simulate one step per frame
+
+    Returns:
+        FrameCapture: the captured frames
     """
 
+    if headless:
+        # the drivers are picked when pygame is initialized
+        os.environ["SDL_VIDEODRIVER"] = "dummy"
+        os.environ["SDL_AUDIODRIVER"] = "dummy"
+
     if not pygame.get_init():
         print("Warning, fonts disabled")
         pygame.init()
@@ -39,15 +181,17 @@ def main():
         print("Warning, sound disabled")
         pygame.mixer.init()
 
-    # hardware acceleration to reduce flickering. Works only in full screen
-    flags = DOUBLEBUF | HWSURFACE | FULLSCREEN
-    screen = pygame.display.set_mode(WINDOW_SIZE, flags)
+    screen = open_display(resolution, windowed)
+
+    if simulation_rate is None:
+        simulation_rate = SIMULATION_RATE
+    if render_rate is None:
+        render_rate = RENDER_RATE
 
     pygame.display.set_caption("QPong")
 
     # clock for timing
     clock = pygame.time.Clock()
-    old_clock = pygame.time.get_ticks()
 
     # initialize scene, level and input Classes
     scene = Scene()
@@ -56,106 +200,148 @@ def main():
 
     # define ball
     ball = Ball()
-    balls = (
-        pygame.sprite.Group()
-    )  # sprite group type is needed for sprite collide function in pygame
-    balls.add(ball)
 
     # Show start screen to select difficulty
-    input.running = scene.start(screen, ball)  # start screen returns running flag
+    if headless:
+        ball.initial_speed_factor = NORMAL
+    else:
+        input.running = scene.start(screen, ball)  # start screen returns running flag
     level.setup(scene, ball)
 
-    # Put all moving sprites a group so that they can be drawn together
-    moving_sprites = pygame.sprite.Group()
-    moving_sprites.add(ball)
-    moving_sprites.add(level.left_paddle)
-    moving_sprites.add(level.right_paddle)
-
-    # update the screen
-    pygame.display.flip()
+    # Draw all sprites through one renderer, from back to front, so that
+    # only changed regions are redrawn and pushed to the display
+    renderer = Renderer(screen, scene, ball, present=not headless)
+    capture = FrameCapture(screen, capture_every, capture_dir)
+    renderer.add(level.right_statevector.sprites())
+    renderer.add(level.circuit_grid.sprites())
+    renderer.add(level.left_paddle, level.right_paddle, ball)
+    overlay = ProfilerOverlay()
+    renderer.add(overlay)
+    PROFILER.clear()
+    PROFILER.export_requested = profile is not None
+    PROFILER.enabled = PROFILER.export_requested
 
     # reset the ball
     ball.reset()
 
-    # a valuable to record the time when the paddle is measured
-    measure_time = 100000
-
-    # Main Loop
-    while input.running:
-        # set maximum frame rate
-        clock.tick(60)
-        # refill whole screen with black color at each frame
-        screen.fill(BLACK)
-
-        ball.update()  # update ball position
-        scene.dashed_line(screen, ball)  # draw dashed line in the middle of the screen
-        scene.score(screen, ball)  # print score
-
-        # level.statevector_grid.display_statevector(scene.qubit_num) # generate statevector grid
-        level.right_statevector.draw(
-            screen
-        )  # draw right paddle together with statevector grid
-        level.circuit_grid.draw(screen)  # draw circuit grid
-        moving_sprites.draw(screen)  # draw moving sprites
-
-        # Show game over screen if the score reaches WIN_SCORE, reset everything if replay == TRUE
-        if ball.score.get_score(CLASSICAL_COMPUTER) >= WIN_SCORE:
-            scene.gameover(screen, CLASSICAL_COMPUTER)
-            scene.replay(
-                screen, ball.score, level.circuit_grid_model, level.circuit_grid
-            )
-            input.update_paddle(level, screen, scene)
-
-        if ball.score.get_score(QUANTUM_COMPUTER) >= WIN_SCORE:
-            scene.gameover(screen, QUANTUM_COMPUTER)
-            scene.replay(
-                screen, ball.score, level.circuit_grid_model, level.circuit_grid
-            )
-            input.update_paddle(level, screen, scene)
-
-        # computer paddle movement
-        if pygame.time.get_ticks() - old_clock > 300:
-            level.left_paddle.rect.y = (
-                ball.get_ypos()
-                - level.statevector_grid.block_size / 2
-                + random.randint(-WIDTH_UNIT * 4, WIDTH_UNIT * 4)
-            )
-            old_clock = pygame.time.get_ticks()
-
-        # handle input events
-        input.handle_input(level, screen, scene)
-
-        # check ball location and decide what to do
-        ball.action()
-
-        if ball.ball_action == MEASURE_RIGHT:
-            circuit = level.circuit_grid_model.construct_circuit()
+    def measure():
+        with PROFILER.stage("measure"):
             pos = level.statevector_grid.paddle_after_measurement(
-                circuit, scene.qubit_num
+                level.circuit_grid_model, scene.qubit_num
             )
             level.right_statevector.arrange()
+        return pos
 
-            # paddle after measurement
-            level.right_paddle.rect.y = pos * ball.screenheight / (2**scene.qubit_num)
-            measure_time = pygame.time.get_ticks()
+    # the rules of the match, drawn by the sprites
+    state = GameState(level.circuit_grid_model, scene.qubit_num, ball, measure=measure)
+    paddle_views = (
+        (level.left_paddle, state.left_paddle),
+        (level.right_paddle, state.right_paddle),
+    )
 
-        if pygame.sprite.spritecollide(level.right_paddle, balls, False):
-            ball.bounce_edge()
+    # the simulation runs in steps of fixed duration, independent of the
+    # frame rate, and the ball is drawn between its last two positions
+    timestep = FixedTimestep(simulation_rate)
 
-        if pygame.sprite.spritecollide(level.left_paddle, balls, False):
-            ball.bounce_edge()
+    start_time = time.perf_counter()
+    frame_num = 0
+    clock.tick()
 
-        if pygame.time.get_ticks() - measure_time > 400:
+    # Main Loop
+    while input.running:
+        if headless:
+            # one step per frame, so that headless runs are reproducible
+            frame_time = timestep.step
+        else:
+            # set maximum frame rate
+            frame_time = clock.tick(render_rate) / 1000
+        frame_start = time.perf_counter()
+
+        for _ in timestep.advance(frame_time):
+            with PROFILER.stage("step"):
+                state.step(timestep.step)
+
+        for sprite, paddle in paddle_views:
+            if sprite.rect.topleft != (paddle.xpos, paddle.ypos):
+                sprite.rect.topleft = (paddle.xpos, paddle.ypos)
+                sprite.dirty = 1
+
+        if state.refresh_requested:
             # refresh the screen a moment after measurement to update visual
-            input.update_paddle(level, screen, scene)
-            # add a buffer time before measure again
-            measure_time = pygame.time.get_ticks() + 100000
+            input.request_paddle_update()
+            state.refresh_requested = False
+
+        # Show game over screen if the score reaches WIN_SCORE, reset everything if replay == TRUE
+        player = state.winner()
+        if player is not None:
+            if headless:
+                scene.reset_game(
+                    ball.score, level.circuit_grid_model, level.circuit_grid
+                )
+            else:
+                scene.gameover(screen, player)
+                scene.replay(
+                    screen, ball.score, level.circuit_grid_model, level.circuit_grid
+                )
+                # do not simulate the time spent on the game over screen
+                clock.tick()
+            input.request_paddle_update()
+            renderer.repaint()
+
+        # handle input events, then simulate the circuit once if they changed it
+        with PROFILER.stage("events"):
+            input.handle_input(level)
+        with PROFILER.stage("paddle update"):
+            input.update_frame(level, scene)
+
+        ball.interpolate(timestep.alpha)
+
+        if input.profiler_toggle_requested:
+            overlay.toggle()
+            input.profiler_toggle_requested = False
+        overlay.update()
+
+        # Update the changed regions of the screen
+        with PROFILER.stage("draw"):
+            renderer.draw()
+
+        capture.end_frame(frame_num)
+        if input.capture_requested:
+            capture.capture(frame_num)
+            input.capture_requested = False
+        frame_num += 1
+        if frame_num == frames:
+            input.running = False
+
+        if PROFILER.enabled:
+            PROFILER.record("frame", time.perf_counter() - frame_start)
+            PROFILER.end_frame()
+
+    if headless:
+        elapsed = time.perf_counter() - start_time
+        print(
+            "{} frames in {:.2f} s: {:.1f} frames per second uncapped".format(
+                frame_num, elapsed, frame_num / elapsed
+            )
+        )
 
-        # Update the screen
-        pygame.display.flip()
+    if profile is not None:
+        PROFILER.export(profile)
 
     pygame.quit()
+    return capture
 
 
 if __name__ == "__main__":
-    main()
+    ARGS = parse_args()
+    main(
+        ARGS.resolution,
+        ARGS.windowed,
+        ARGS.headless,
+        ARGS.frames,
+        ARGS.capture_every,
+        ARGS.capture_dir or "captures",
+        ARGS.profile,
+        ARGS.sim_rate,
+        ARGS.fps,
+    )
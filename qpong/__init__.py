@@ -1,16 +1,33 @@
 """
 QPong game
+
+Subpackages and the names they export are imported on first access, so
+that importing qpong does not pull in pygame, NumPy or qiskit.
 """
 
+import importlib
 import os
 
-from .containers import *
-from .utils import *
-from .viz import *
-from .model import *
-from .controls import *
+SUBPACKAGES = ("containers", "utils", "viz", "model", "controls")
 
 with open(
     os.path.abspath(os.path.join(os.path.dirname(__file__), "VERSION.txt")), "r"
 ) as _ver_file:
     __version__ = _ver_file.read().rstrip()
+
+
+def __getattr__(name):
+    if name in SUBPACKAGES:
+        return importlib.import_module("." + name, __name__)
+    for subpackage_name in SUBPACKAGES:
+        subpackage = importlib.import_module("." + subpackage_name, __name__)
+        if name in subpackage.__all__:
+            return getattr(subpackage, name)
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+
+def __dir__():
+    names = set(globals())
+    for subpackage_name in SUBPACKAGES:
+        names.update(importlib.import_module("." + subpackage_name, __name__).__all__)
+    return sorted(names)
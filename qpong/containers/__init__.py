@@ -2,4 +2,9 @@
 Sprite container
 """
 
-from .vbox import VBox
+from qpong.lazy import lazy_attributes
+
+_LAZY_ATTRIBUTES = {"VBox": ".vbox"}
+
+__getattr__, __dir__ = lazy_attributes(__name__, _LAZY_ATTRIBUTES)
+__all__ = list(_LAZY_ATTRIBUTES)
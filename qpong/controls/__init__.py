@@ -2,4 +2,9 @@
 Circuit grid
 """
 
-from .circuit_grid import CircuitGrid
+from qpong.lazy import lazy_attributes
+
+_LAZY_ATTRIBUTES = {"CircuitGrid": ".circuit_grid"}
+
+__getattr__, __dir__ = lazy_attributes(__name__, _LAZY_ATTRIBUTES)
+__all__ = list(_LAZY_ATTRIBUTES)
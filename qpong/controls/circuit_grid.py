@@ -9,17 +9,32 @@ import pygame
 
 from qpong.model import circuit_node_types as node_types
 from qpong.model.circuit_grid_model import CircuitGridNode
-from qpong.utils.colors import BLACK, WHITE, MAGENTA
+from qpong.controls.gate_atlas import EMPTY_TILE, get_gate_atlas
+from qpong.utils.colors import BLACK, WHITE
 from qpong.utils.navigation import MOVE_UP, MOVE_DOWN, MOVE_LEFT, MOVE_RIGHT
 from qpong.utils.resources import load_image
-from qpong.utils.parameters import (
-    WIDTH_UNIT,
-    LINE_WIDTH,
-    GRID_HEIGHT,
-    GRID_WIDTH,
-    GATE_TILE_WIDTH,
-    GATE_TILE_HEIGHT,
-)
+from qpong.utils.parameters import LAYOUT
+
+# gate atlas images of node types that always look the same
+GATE_IMAGES = {
+    node_types.H: "h_gate",
+    node_types.X: "x_gate",
+    node_types.Y: "y_gate",
+    node_types.Z: "z_gate",
+    node_types.S: "s_gate",
+    node_types.SDG: "sdg_gate",
+    node_types.T: "t_gate",
+    node_types.TDG: "tdg_gate",
+    node_types.TRACE: "trace_gate",
+    node_types.SWAP: "swap_gate",
+}
+
+# gate atlas images of X/Y/Z nodes turned into rotation gates
+ROTATION_IMAGES = {
+    node_types.X: "rx_gate",
+    node_types.Y: "ry_gate",
+    node_types.Z: "rz_gate",
+}
 
 # pylint: disable=too-few-public-methods
 class CircuitGrid(pygame.sprite.RenderPlain):
@@ -31,18 +46,42 @@ class CircuitGrid(pygame.sprite.RenderPlain):
         self.circuit_grid_model = circuit_grid_model
         self.selected_wire = 0
         self.selected_column = 0
-        self.circuit_grid_background = CircuitGridBackground(circuit_grid_model)
-        self.circuit_grid_cursor = CircuitGridCursor()
+
+        # shrink the tiles of grids with more than 3 wires so that they fit
+        # in the height of a 3 wire grid
+        self.tile_scale = min(1.0, 4 / (circuit_grid_model.max_wires + 1))
+        self.width_unit = LAYOUT.width_unit
+        self.grid_width = LAYOUT.grid_width * self.tile_scale
+        self.grid_height = LAYOUT.grid_height * self.tile_scale
+
+        self.circuit_grid_background = CircuitGridBackground(
+            circuit_grid_model, self.tile_scale
+        )
+        self.circuit_grid_cursor = CircuitGridCursor(self.tile_scale)
         self.gate_tiles = np.empty(
             (circuit_grid_model.max_wires, circuit_grid_model.max_columns),
             dtype=CircuitGridGate,
         )
 
+        # tiles never move, so their centers are computed once
         for row_idx in range(self.circuit_grid_model.max_wires):
             for col_idx in range(self.circuit_grid_model.max_columns):
                 self.gate_tiles[row_idx][col_idx] = CircuitGridGate(
-                    circuit_grid_model, row_idx, col_idx
+                    circuit_grid_model,
+                    row_idx,
+                    col_idx,
+                    self.tile_scale,
+                    (
+                        self.xpos + self.grid_width * (col_idx + 1.5),
+                        self.ypos + self.grid_height * (row_idx + 1.0),
+                    ),
                 )
+        self.circuit_grid_background.rect.left = self.xpos
+        self.circuit_grid_background.rect.top = self.ypos
+
+        # cells changed in the model since the last update
+        self.touched_cells = set()
+        circuit_grid_model.add_listener(self.touched_cells.update)
 
         pygame.sprite.RenderPlain.__init__(
             self,
@@ -54,24 +93,12 @@ class CircuitGrid(pygame.sprite.RenderPlain):
 
     def update(self):
         """
-        Update tiles on the circuit grid, and selected_node
-        since the last update.
+        Update the tiles of the nodes changed since the last update, and
+        selected_node
         """
-        sprite_list = self.sprites()
-        for sprite in sprite_list:
-            sprite.update()
-
-        self.circuit_grid_background.rect.left = self.xpos
-        self.circuit_grid_background.rect.top = self.ypos
-
-        for row_idx in range(self.circuit_grid_model.max_wires):
-            for col_idx in range(self.circuit_grid_model.max_columns):
-                self.gate_tiles[row_idx][
-                    col_idx
-                ].rect.centerx = self.xpos + GRID_WIDTH * (col_idx + 1.5)
-                self.gate_tiles[row_idx][
-                    col_idx
-                ].rect.centery = self.ypos + GRID_HEIGHT * (row_idx + 1.0)
+        for row_idx, col_idx in self.touched_cells:
+            self.gate_tiles[row_idx][col_idx].update()
+        self.touched_cells.clear()
 
         self.highlight_selected_node(self.selected_wire, self.selected_column)
 
@@ -88,14 +115,15 @@ class CircuitGrid(pygame.sprite.RenderPlain):
         self.selected_column = column_num
         self.circuit_grid_cursor.rect.left = (
             self.xpos
-            + GRID_WIDTH * (self.selected_column + 1)
-            + round(0.375 * WIDTH_UNIT)
+            + self.grid_width * (self.selected_column + 1)
+            + round(0.375 * self.width_unit * self.tile_scale)
         )
         self.circuit_grid_cursor.rect.top = (
             self.ypos
-            + GRID_HEIGHT * (self.selected_wire + 0.5)
-            + round(0.375 * WIDTH_UNIT)
+            + self.grid_height * (self.selected_wire + 0.5)
+            + round(0.375 * self.width_unit * self.tile_scale)
         )
+        self.circuit_grid_cursor.dirty = 1
 
     def reset_cursor(self):
         """
@@ -393,7 +421,7 @@ class CircuitGrid(pygame.sprite.RenderPlain):
         Returns:
             integer: wire number of control qubit, otherwise -1.
         """
-        if self.circuit_grid_model.max_wires <= candidate_ctrl_wire_num < 0:
+        if not 0 <= candidate_ctrl_wire_num < self.circuit_grid_model.max_wires:
             return -1
         candidate_wire_gate_part = self.circuit_grid_model.get_node_gate_part(
             candidate_ctrl_wire_num, self.selected_column
@@ -457,153 +485,98 @@ class CircuitGrid(pygame.sprite.RenderPlain):
                 )
 
 
-class CircuitGridBackground(pygame.sprite.Sprite):
+class CircuitGridBackground(pygame.sprite.DirtySprite):
     """
     Background for circuit grid
     """
 
-    def __init__(self, circuit_grid_model):
-        pygame.sprite.Sprite.__init__(self)
-
-        self.image = pygame.Surface([GRID_WIDTH * (18 + 2), GRID_HEIGHT * (3 + 1)])
+    def __init__(self, circuit_grid_model, tile_scale=1.0):
+        pygame.sprite.DirtySprite.__init__(self)
+
+        grid_width = LAYOUT.grid_width * tile_scale
+        grid_height = LAYOUT.grid_height * tile_scale
+        line_width = LAYOUT.line_width
+        self.image = pygame.Surface(
+            [
+                grid_width * (circuit_grid_model.max_columns + 2),
+                grid_height * (circuit_grid_model.max_wires + 1),
+            ]
+        )
         self.image.convert()
         self.image.fill(WHITE)
         self.rect = self.image.get_rect()
-        pygame.draw.rect(self.image, BLACK, self.rect, LINE_WIDTH)
+        pygame.draw.rect(self.image, BLACK, self.rect, line_width)
 
         for wire_num in range(circuit_grid_model.max_wires):
             pygame.draw.line(
                 self.image,
                 BLACK,
-                (GRID_WIDTH * 0.5, (wire_num + 1) * GRID_HEIGHT),
-                (self.rect.width - (GRID_WIDTH * 0.5), (wire_num + 1) * GRID_HEIGHT),
-                LINE_WIDTH,
+                (grid_width * 0.5, (wire_num + 1) * grid_height),
+                (self.rect.width - (grid_width * 0.5), (wire_num + 1) * grid_height),
+                line_width,
             )
 
 
-class CircuitGridGate(pygame.sprite.Sprite):
+class CircuitGridGate(pygame.sprite.DirtySprite):
     """
     Images for nodes
     """
 
-    def __init__(self, circuit_grid_model, wire_num, column_num):
-        pygame.sprite.Sprite.__init__(self)
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self, circuit_grid_model, wire_num, column_num, tile_scale=1.0, center=(0, 0)
+    ):
+        pygame.sprite.DirtySprite.__init__(self)
         self.circuit_grid_model = circuit_grid_model
         self.wire_num = wire_num
         self.column_num = column_num
+        self.tile_scale = tile_scale
+        self.center = center
+        self.gate_atlas = get_gate_atlas(tile_scale)
 
         self.update()
 
     def update(self):
-        # pylint: disable=too-many-branches disable=too-many-statements
         """
         Update images on the circuit grid, and selected_node
         since the last update.
         """
         node = self.circuit_grid_model.get_node(self.wire_num, self.column_num)
 
-        if node.node_type == node_types.H:
-            self.image, self.rect = load_image("gate_images/h_gate.png", -1)
-        elif node.node_type == node_types.X:
-            if node.ctrl_a >= 0 or node.ctrl_b >= 0:
-                # This is a control-X gate or Toffoli gate
-                if self.wire_num > max(node.ctrl_a, node.ctrl_b):
-                    self.image, self.rect = load_image(
-                        "gate_images/not_gate_below_ctrl.png", -1
-                    )
-                else:
-                    self.image, self.rect = load_image(
-                        "gate_images/not_gate_above_ctrl.png", -1
-                    )
-            elif node.radians != 0:
-                self.image, self.rect = load_image("gate_images/rx_gate.png", -1)
-                self.rect = self.image.get_rect()
-                pygame.draw.arc(
-                    self.image, MAGENTA, self.rect, 0, node.radians % (2 * np.pi), 6
-                )
-                pygame.draw.arc(
-                    self.image,
-                    MAGENTA,
-                    self.rect,
-                    node.radians % (2 * np.pi),
-                    2 * np.pi,
-                    1,
-                )
-            else:
-                self.image, self.rect = load_image("gate_images/x_gate.png", -1)
-        elif node.node_type == node_types.Y:
-            if node.radians != 0:
-                self.image, self.rect = load_image("gate_images/ry_gate.png", -1)
-                self.rect = self.image.get_rect()
-                pygame.draw.arc(
-                    self.image, MAGENTA, self.rect, 0, node.radians % (2 * np.pi), 6
-                )
-                pygame.draw.arc(
-                    self.image,
-                    MAGENTA,
-                    self.rect,
-                    node.radians % (2 * np.pi),
-                    2 * np.pi,
-                    1,
-                )
+        if node.node_type == node_types.X and (node.ctrl_a >= 0 or node.ctrl_b >= 0):
+            # This is a control-X gate or Toffoli gate
+            if self.wire_num > max(node.ctrl_a, node.ctrl_b):
+                self.image = self.gate_atlas["not_gate_below_ctrl"]
             else:
-                self.image, self.rect = load_image("gate_images/y_gate.png", -1)
-        elif node.node_type == node_types.Z:
-            if node.radians != 0:
-                self.image, self.rect = load_image("gate_images/rz_gate.png", -1)
-                self.rect = self.image.get_rect()
-                pygame.draw.arc(
-                    self.image, MAGENTA, self.rect, 0, node.radians % (2 * np.pi), 6
-                )
-                pygame.draw.arc(
-                    self.image,
-                    MAGENTA,
-                    self.rect,
-                    node.radians % (2 * np.pi),
-                    2 * np.pi,
-                    1,
-                )
-            else:
-                self.image, self.rect = load_image("gate_images/z_gate.png", -1)
-        elif node.node_type == node_types.S:
-            self.image, self.rect = load_image("gate_images/s_gate.png", -1)
-        elif node.node_type == node_types.SDG:
-            self.image, self.rect = load_image("gate_images/sdg_gate.png", -1)
-        elif node.node_type == node_types.T:
-            self.image, self.rect = load_image("gate_images/t_gate.png", -1)
-        elif node.node_type == node_types.TDG:
-            self.image, self.rect = load_image("gate_images/tdg_gate.png", -1)
+                self.image = self.gate_atlas["not_gate_above_ctrl"]
+        elif node.node_type in ROTATION_IMAGES and node.radians != 0:
+            self.image = self.gate_atlas.rotation_tile(
+                ROTATION_IMAGES[node.node_type], node.radians
+            )
         elif node.node_type == node_types.CTRL:
             if self.wire_num > self.circuit_grid_model.get_gate_wire_for_control_node(
                 self.wire_num, self.column_num
             ):
-                self.image, self.rect = load_image(
-                    "gate_images/ctrl_gate_bottom_wire.png", -1
-                )
+                self.image = self.gate_atlas["ctrl_gate_bottom_wire"]
                 print("bottom")
             else:
-                self.image, self.rect = load_image(
-                    "gate_images/ctrl_gate_top_wire.png", -1
-                )
+                self.image = self.gate_atlas["ctrl_gate_top_wire"]
                 print("top")
-        elif node.node_type == node_types.TRACE:
-            self.image, self.rect = load_image("gate_images/trace_gate.png", -1)
-        elif node.node_type == node_types.SWAP:
-            self.image, self.rect = load_image("gate_images/swap_gate.png", -1)
         else:
-            self.image = pygame.Surface([GATE_TILE_WIDTH, GATE_TILE_HEIGHT])
-            self.image.set_alpha(0)
-            self.rect = self.image.get_rect()
+            self.image = self.gate_atlas[GATE_IMAGES.get(node.node_type, EMPTY_TILE)]
 
-        self.image.convert()
+        self.rect = self.image.get_rect(center=self.center)
+        self.dirty = 1
 
 
-class CircuitGridCursor(pygame.sprite.Sprite):
+class CircuitGridCursor(pygame.sprite.DirtySprite):
     """Cursor to highlight current grid node"""
 
-    def __init__(self):
-        pygame.sprite.Sprite.__init__(self)
+    def __init__(self, tile_scale=1.0):
+        pygame.sprite.DirtySprite.__init__(self)
         self.image, self.rect = load_image(
-            "cursor_images/circuit-grid-cursor-medium.png", -1
+            "cursor_images/circuit-grid-cursor-medium.png",
+            -1,
+            LAYOUT.image_scale * tile_scale,
         )
         self.image.convert_alpha()
@@ -0,0 +1,99 @@
+"""
+Gate images of the circuit grid, loaded and scaled once
+"""
+
+import os
+
+import numpy as np
+import pygame
+
+from qpong.resolution import DEFAULT_RESOLUTION
+from qpong.utils.colors import MAGENTA
+from qpong.utils.parameters import LAYOUT
+from qpong.utils.resources import data_dir, load_image
+
+GATE_IMAGE_DIR = "gate_images"
+
+# key of the transparent tile shown for empty nodes
+EMPTY_TILE = "empty"
+
+# rotation gates turn in steps of 2 pi / ROTATION_STEPS (pi / 8)
+ROTATION_STEPS = 16
+
+
+class GateAtlas:
+    """
+    Every image in data/images/gate_images, converted to the display format
+    and scaled for a tile scale at the resolution of LAYOUT, keyed by file
+    name without extension (e.g. "h_gate" or "ctrl_gate_top_wire")
+
+    Needs the display mode to be set, as images are converted for it.
+    """
+
+    def __init__(self, tile_scale=1.0):
+        self.tile_scale = tile_scale
+        self.width_unit = LAYOUT.width_unit
+        image_scale = LAYOUT.image_scale * tile_scale
+        self.images = {}
+        for file_name in sorted(
+            os.listdir(os.path.join(data_dir, "images", GATE_IMAGE_DIR))
+        ):
+            name, extension = os.path.splitext(file_name)
+            if extension == ".png":
+                self.images[name], _ = load_image(
+                    GATE_IMAGE_DIR + "/" + file_name, -1, image_scale
+                )
+
+        empty = pygame.Surface(
+            [LAYOUT.gate_tile_width * tile_scale, LAYOUT.gate_tile_height * tile_scale]
+        ).convert()
+        empty.set_alpha(0)
+        self.images[EMPTY_TILE] = empty
+
+        # rotation tiles drawn so far, keyed by image name and angle step
+        self.rotation_tiles = {}
+
+    def __getitem__(self, name):
+        return self.images[name]
+
+    def rotation_tile(self, name, radians):
+        """
+        Get a rotation gate image with its angle drawn as an arc, drawn
+        once per angle step
+
+        Parameters:
+        name (string): image name, e.g. "rx_gate"
+        radians (float): rotation angle, rounded to the nearest step
+        """
+        step = int(round(radians % (2 * np.pi) / (2 * np.pi) * ROTATION_STEPS))
+        step %= ROTATION_STEPS
+        key = (name, step)
+        if key not in self.rotation_tiles:
+            angle = 2 * np.pi * step / ROTATION_STEPS
+            image = self.images[name].copy()
+            rect = image.get_rect()
+            # arcs are 6 and 1 pixels wide at the default resolution
+            line_scale = self.width_unit / round(DEFAULT_RESOLUTION[0] / 100)
+            pygame.draw.arc(image, MAGENTA, rect, 0, angle, round(6 * line_scale))
+            pygame.draw.arc(
+                image, MAGENTA, rect, angle, 2 * np.pi, max(1, round(line_scale))
+            )
+            self.rotation_tiles[key] = image
+        return self.rotation_tiles[key]
+
+
+_atlases = {}
+
+
+def get_gate_atlas(tile_scale=1.0):
+    """
+    Get the gate atlas for a tile scale at the current resolution, building
+    it on first use
+
+    Parameters:
+    tile_scale (float): scale of the circuit grid tiles
+    """
+    key = (LAYOUT.window_size, tile_scale)
+    if key not in _atlases:
+        _atlases[key] = GateAtlas(tile_scale)
+    return _atlases[key]
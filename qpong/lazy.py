@@ -0,0 +1,37 @@
+"""
+Lazy attribute imports for package __init__ modules
+"""
+
+import importlib
+import sys
+
+
+def lazy_attributes(package_name, attributes):
+    """
+    Build module-level __getattr__ and __dir__ functions that import the
+    attributes of a package on first access
+
+    Parameters:
+    package_name (string): __name__ of the package
+    attributes (dict): attribute name -> module name relative to the package
+
+    Returns:
+        tuple: (__getattr__, __dir__) for the package module
+    """
+
+    def __getattr__(name):
+        try:
+            module_name = attributes[name]
+        except KeyError:
+            raise AttributeError(
+                "module {!r} has no attribute {!r}".format(package_name, name)
+            ) from None
+        value = getattr(importlib.import_module(module_name, package_name), name)
+        # cache on the package so the next lookup does not come back here
+        setattr(sys.modules[package_name], name, value)
+        return value
+
+    def __dir__():
+        return sorted(set(vars(sys.modules[package_name])) | set(attributes))
+
+    return __getattr__, __dir__
@@ -2,5 +2,31 @@
 Circuit grid model and node types on the grid
 """
 
-from .circuit_grid_model import CircuitGridModel, CircuitGridNode
+from qpong.lazy import lazy_attributes
+
 from .circuit_node_types import *
+
+_LAZY_ATTRIBUTES = {
+    "BatchGame": ".batch_game",
+    "OBSERVATION_FIELDS": ".batch_game",
+    "stack_grids": ".batch_simulator",
+    "simulate_batch": ".batch_simulator",
+    "probabilities_batch": ".batch_simulator",
+    "CircuitGridModel": ".circuit_grid_model",
+    "CircuitGridNode": ".circuit_grid_model",
+    "BallState": ".game_state",
+    "GameState": ".game_state",
+    "Paddle": ".game_state",
+    "MeasurementSampler": ".measurement_sampler",
+    "StabilizerSampler": ".stabilizer_simulator",
+    "StabilizerSimulator": ".stabilizer_simulator",
+    "StatevectorSimulator": ".statevector_simulator",
+    "BACKEND_NUMPY": ".statevector_simulator",
+    "BACKEND_QISKIT": ".statevector_simulator",
+    "simulate": ".statevector_simulator",
+}
+
+__getattr__, __dir__ = lazy_attributes(__name__, _LAZY_ATTRIBUTES)
+__all__ = [
+    name for name in dir() if not name.startswith("_") and name != "lazy_attributes"
+] + list(_LAZY_ATTRIBUTES)
@@ -0,0 +1,408 @@
+"""
+Vectorized environment stepping many QPong matches in lockstep
+
+The rules are those of qpong.model.game_state, applied to NumPy arrays with
+one entry per match, so that the cost of a step grows with the number of
+matches and not with Python loop overhead.
+"""
+
+import numpy as np
+
+from qpong.utils.parameters import (
+    COMPUTER_PADDLE_INTERVAL,
+    LAYOUT,
+    MAX_BOUNCES_PER_STEP,
+    NORMAL,
+    PADDLE_SPEEDUP,
+    QUBIT_NUM,
+    SIMULATION_RATE,
+    SPEED_TIME_UNIT,
+    WIN_SCORE,
+)
+
+# columns of the observations returned by BatchGame
+OBSERVATION_FIELDS = (
+    "ball_x",
+    "ball_y",
+    "ball_vx",
+    "ball_vy",
+    "computer_paddle_y",
+    "quantum_paddle_y",
+    "computer_score",
+    "quantum_score",
+)
+
+
+def _axis_times(pos, delta, low, high):
+    """
+    Fractions of the displacements at which balls moving along one axis
+    enter and leave the interval from low to high
+
+    Returns:
+        tuple: (entry, exit) arrays, -inf and inf for balls standing still
+        in the interval, inf and -inf for balls standing still outside
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        to_low, to_high = (low - pos) / delta, (high - pos) / delta
+    inside = (low < pos) & (pos < high)
+    entry = np.where(
+        delta == 0, np.where(inside, -np.inf, np.inf), np.minimum(to_low, to_high)
+    )
+    exit_ = np.where(
+        delta == 0, np.where(inside, np.inf, -np.inf), np.maximum(to_low, to_high)
+    )
+    return entry, exit_
+
+
+def _impact(entry, exit_, heading_in):
+    """
+    Time of impact of balls entering and leaving a rectangle at the given
+    fractions of their displacements
+
+    Returns:
+        tuple: (time of impact, inf for no impact, True where the rectangle
+        moved onto a ball heading in, which hits at time 0)
+    """
+    hit = (entry < exit_) & (exit_ > 0) & (entry <= 1)
+    overlap = hit & (entry < 0) & heading_in
+    time = np.where(hit & (entry >= 0), entry, np.inf)
+    return np.where(overlap, 0.0, time), overlap
+
+
+def _sweep(position, delta, rect, ball_size):
+    """
+    Vectorized swept test of balls against rectangles, see
+    BallState.sweep
+
+    Parameters:
+    position (tuple): xpos and ypos arrays of the balls
+    delta (tuple): displacement arrays of the balls along x and y
+    rect (tuple): left, top, width and height arrays (or scalars)
+    ball_size (integer): ball width and height
+
+    Returns:
+        tuple: (time of impact as a fraction of the displacement, inf for
+        no impact, True where the ball hits a left or right side)
+    """
+    # the ball is a point moving in the rectangle grown by its size
+    left, top, width, height = rect
+    x_entry, x_exit = _axis_times(position[0], delta[0], left - ball_size, left + width)
+    y_entry, y_exit = _axis_times(position[1], delta[1], top - ball_size, top + height)
+
+    # the paddle moved onto the ball: bounce back if the ball heads to the
+    # middle of the paddle
+    heading_in = (delta[0] > 0) == (position[0] + ball_size / 2 < left + width / 2)
+    time, overlap = _impact(
+        np.maximum(x_entry, y_entry), np.minimum(x_exit, y_exit), heading_in
+    )
+    return time, overlap | (x_entry > y_entry)
+
+
+class BatchGame:
+    """
+    Gym-style environment of many matches stepped together
+
+    The quantum player acts through the measurement probabilities of its
+    circuit: step() takes, for every match, the probability of each basis
+    state, e.g. from probabilities_batch(*stack_grids(models)). They are
+    only sampled by the matches that measure in that step. Finished matches
+    are served again from a zero score.
+    """
+
+    # pylint: disable=too-many-instance-attributes disable=too-many-arguments
+    def __init__(
+        self,
+        num_matches,
+        qubit_num=QUBIT_NUM,
+        speed_factor=NORMAL,
+        speedup=PADDLE_SPEEDUP,
+        computer_jitter=None,
+        time_step=1 / SIMULATION_RATE,
+        rng=None,
+    ):
+        """
+        Parameters:
+        num_matches (integer): number of matches
+        qubit_num (integer): number of qubits of the quantum player
+        speed_factor (float): initial ball speed in width units per speed
+            time unit, EASY, NORMAL or EXPERT
+        speedup (float): speed factor of the ball on every paddle hit
+        computer_jitter (integer): largest random offset of the computer
+            paddle from the ball, LAYOUT.computer_jitter by default
+        time_step (float): duration of a step, in seconds
+        rng (numpy.random.Generator or integer): random generator, or a
+            seed to create one
+        """
+        if not isinstance(rng, np.random.Generator):
+            rng = np.random.default_rng(rng)
+        self.rng = rng
+
+        self.num_matches = num_matches
+        self.qubit_num = qubit_num
+        self.speed_factor = speed_factor
+        self.speedup = speedup
+        if computer_jitter is None:
+            computer_jitter = LAYOUT.computer_jitter
+        self.computer_jitter = int(computer_jitter)
+        self.time_step = time_step
+
+        # same field as the display-free game state
+        self.width_unit = LAYOUT.width_unit
+        self.screenheight = round(LAYOUT.window_height * 0.7)
+        self.left_edge = self.width_unit
+        self.right_edge = LAYOUT.window_width - self.left_edge
+        self.ball_size = LAYOUT.ball_size
+        self.paddle_x = (LAYOUT.computer_paddle_x, LAYOUT.statevector_x)
+        self.paddle_height = max(1, int(round(self.screenheight / 2**qubit_num)))
+
+        shape = (num_matches,)
+        self.xpos = np.zeros(shape)
+        self.ypos = np.zeros(shape)
+        self.previous_xpos = np.zeros(shape)
+        # velocity in pixels per speed time unit
+        self.velocity_x = np.zeros(shape)
+        self.velocity_y = np.zeros(shape)
+        self.serve_left = np.ones(shape, dtype=bool)
+        self.measure_flag = np.zeros(shape, dtype=bool)
+        self.computer_paddle_y = np.zeros(shape)
+        self.quantum_paddle_y = np.zeros(shape)
+        self.time = np.zeros(shape)
+        self.computer_time = np.zeros(shape)
+        self.scores = np.zeros((2, num_matches), dtype=np.int64)
+
+        # statistics of the ongoing matches: paddle hits and measurements
+        self.hits = np.zeros(shape, dtype=np.int64)
+        self.measurements = np.zeros(shape, dtype=np.int64)
+
+    def reset(self):
+        """
+        Start all matches again
+
+        Returns:
+            numpy.ndarray: observations of shape (num_matches,
+            len(OBSERVATION_FIELDS))
+        """
+        everything = np.ones(self.num_matches, dtype=bool)
+        self.serve_left[:] = True
+        self.measure_flag[:] = False
+        self.computer_paddle_y[:] = 0
+        self.quantum_paddle_y[:] = 0
+        self.time[:] = 0
+        self.computer_time[:] = 0
+        self.scores[:] = 0
+        self.hits[:] = 0
+        self.measurements[:] = 0
+        self._serve(everything)
+        return self.observe()
+
+    def observe(self):
+        """
+        Get the observations of all matches, with the columns of
+        OBSERVATION_FIELDS
+        """
+        return np.stack(
+            (
+                self.xpos,
+                self.ypos,
+                self.velocity_x,
+                self.velocity_y,
+                self.computer_paddle_y,
+                self.quantum_paddle_y,
+                self.scores[0],
+                self.scores[1],
+            ),
+            axis=1,
+        )
+
+    def _serve(self, mask):
+        """
+        Serve the ball of the masked matches, alternately from the left and
+        the right
+        """
+        count = np.count_nonzero(mask)
+        if count == 0:
+            return
+        left = self.serve_left[mask]
+        direction = np.where(
+            left,
+            self.rng.integers(30, 120, count),
+            self.rng.integers(-120, -30, count),
+        )
+        radians = np.radians(direction)
+        speed = self.width_unit * self.speed_factor
+        self.xpos[mask] = np.where(
+            left,
+            self.left_edge + self.width_unit * 15,
+            self.right_edge - self.width_unit * 15,
+        )
+        self.ypos[mask] = self.screenheight / 2
+        self.previous_xpos[mask] = self.xpos[mask]
+        self.velocity_x[mask] = speed * np.sin(radians)
+        self.velocity_y[mask] = -speed * np.cos(radians)
+        self.serve_left[mask] = ~left
+
+    def _next_hit(self, delta_x, delta_y, remaining):
+        """
+        Find the first edge or paddle hit by the balls in what remains of
+        their displacements
+
+        Returns:
+            tuple: (fraction of the displacement until the hit or the
+            remaining fraction, mask of the balls bouncing off an edge or the
+            top or bottom of a paddle, mask of those hitting a paddle side)
+        """
+        top, bottom = 0, self.screenheight - self.ball_size
+        with np.errstate(divide="ignore", invalid="ignore"):
+            wall_time = np.where(
+                delta_y < 0,
+                np.maximum((top - self.ypos) / delta_y, 0),
+                np.where(
+                    delta_y > 0, np.maximum((bottom - self.ypos) / delta_y, 0), np.inf
+                ),
+            )
+        hit_time = np.minimum(wall_time, remaining)
+        hit_wall = wall_time < remaining
+        hit_x = np.zeros(self.num_matches, dtype=bool)
+        for paddle_x, paddle_y in zip(
+            self.paddle_x, (self.computer_paddle_y, self.quantum_paddle_y)
+        ):
+            time, x_axis = _sweep(
+                (self.xpos, self.ypos),
+                (delta_x, delta_y),
+                (paddle_x, paddle_y, self.width_unit, self.paddle_height),
+                self.ball_size,
+            )
+            closer = time < hit_time
+            hit_time = np.where(closer, time, hit_time)
+            hit_wall &= ~closer
+            hit_x = np.where(closer, x_axis, hit_x)
+            hit_wall |= closer & ~x_axis
+
+        # hit_wall covers the edges and the top or bottom of paddles
+        return hit_time, hit_wall, hit_x & ~hit_wall
+
+    def _move(self):
+        """
+        Move the balls, bouncing up to MAX_BOUNCES_PER_STEP times off the
+        edges and paddles
+        """
+        scale = self.time_step / SPEED_TIME_UNIT
+        delta_x, delta_y = self.velocity_x * scale, self.velocity_y * scale
+        self.previous_xpos[:] = self.xpos
+        remaining = np.ones(self.num_matches)
+
+        for _ in range(MAX_BOUNCES_PER_STEP):
+            hit_time, hit_wall, hit_x = self._next_hit(delta_x, delta_y, remaining)
+            self.xpos += delta_x * hit_time
+            self.ypos += delta_y * hit_time
+            remaining -= hit_time
+
+            if not (hit_wall.any() or hit_x.any()):
+                return
+            delta_y = np.where(hit_wall, -delta_y, delta_y)
+            self.velocity_y = np.where(hit_wall, -self.velocity_y, self.velocity_y)
+            factor = np.where(hit_x, self.speedup, 1.0)
+            delta_x = np.where(hit_x, -delta_x, delta_x) * factor
+            delta_y = delta_y * factor
+            self.velocity_x = (
+                np.where(hit_x, -self.velocity_x, self.velocity_x) * factor
+            )
+            self.velocity_y = self.velocity_y * factor
+            self.hits += hit_x
+
+    def _move_computer_paddle(self):
+        """
+        Move the computer paddles that are due to the ball, give or take
+        computer_jitter pixels
+        """
+        due = self.time - self.computer_time > COMPUTER_PADDLE_INTERVAL
+        jitter = self.rng.integers(
+            -self.computer_jitter, self.computer_jitter + 1, self.num_matches
+        )
+        self.computer_paddle_y = np.where(
+            due,
+            np.round(self.ypos - self.paddle_height / 2 + jitter),
+            self.computer_paddle_y,
+        )
+        self.computer_time = np.where(due, self.time, self.computer_time)
+
+    def _crossed(self, low, high):
+        """
+        Mask of the balls that went through a horizontal zone in the step
+        """
+        return (np.minimum(self.previous_xpos, self.xpos) < high) & (
+            np.maximum(self.previous_xpos, self.xpos) >= low
+        )
+
+    def _sample(self, probabilities):
+        """
+        Draw one basis state per row of probabilities
+        """
+        cumulative = np.cumsum(probabilities, axis=1)
+        draws = self.rng.random(len(cumulative)) * cumulative[:, -1]
+        outcomes = (cumulative <= draws[:, None]).sum(axis=1)
+        return np.minimum(outcomes, cumulative.shape[1] - 1)
+
+    def step(self, actions):
+        """
+        Simulate one step of all matches
+
+        Parameters:
+        actions (numpy.ndarray): measurement probabilities of the quantum
+            player, of shape (num_matches, 2**qubit_num), or (2**qubit_num,)
+            for the same circuit in all matches
+
+        Returns:
+            tuple: (observations, rewards, done, info) where rewards is +1
+            where the quantum player scored and -1 where the computer did,
+            done marks the matches won in this step, and info holds the
+            winner (0 computer, 1 quantum player, -1 none), and the paddle
+            hits and measurements of the finished matches
+        """
+        actions = np.broadcast_to(actions, (self.num_matches, 2**self.qubit_num))
+        self.time += 1000 * self.time_step
+        self._move()
+
+        self._move_computer_paddle()
+
+        # decide ball action based on the ball's position, in the order of
+        # BallState.action
+        quantum_point = self.xpos < self.left_edge
+        undecided = ~quantum_point
+        left_zone = undecided & self._crossed(
+            self.left_edge + 10 * self.width_unit,
+            self.left_edge + 12 * self.width_unit,
+        )
+        undecided &= ~left_zone
+        right_zone = undecided & self._crossed(
+            self.right_edge - 12 * self.width_unit,
+            self.right_edge - 10 * self.width_unit,
+        )
+        undecided &= ~right_zone
+        computer_point = undecided & (self.xpos > self.right_edge)
+        undecided &= ~computer_point
+
+        measure = right_zone & ~self.measure_flag
+        self.measure_flag = (self.measure_flag | left_zone | right_zone) & ~undecided
+        if measure.any():
+            outcomes = self._sample(actions[measure])
+            self.quantum_paddle_y[measure] = np.round(
+                outcomes * self.screenheight / 2**self.qubit_num
+            )
+            self.measurements += measure
+
+        self.scores[1] += quantum_point
+        self.scores[0] += computer_point
+        self._serve(quantum_point | computer_point)
+        rewards = quantum_point.astype(np.int64) - computer_point
+
+        won = self.scores >= WIN_SCORE
+        done = won[0] | won[1]
+        info = {"winner": np.where(won[1], 1, np.where(won[0], 0, -1))}
+        info["hits"] = np.where(done, self.hits, 0)
+        info["measurements"] = np.where(done, self.measurements, 0)
+        if done.any():
+            self.scores[:, done] = 0
+            self.hits[done] = 0
+            self.measurements[done] = 0
+        return self.observe(), rewards, done, info
@@ -0,0 +1,172 @@
+"""
+Vectorized simulation of many circuit grids at once
+"""
+
+import numpy as np
+
+from qpong.model import circuit_node_types as node_types
+from qpong.model.statevector_simulator import GATE_MATRICES, GATE_NAMES, node_operation
+
+# node types range from EMPTY (-1) to TRACE (11), tables are indexed by
+# node_type - EMPTY
+_NUM_NODE_TYPES = node_types.TRACE - node_types.EMPTY + 1
+_ROTATED_TYPES = (node_types.X, node_types.Y, node_types.Z)
+
+
+def _build_tables():
+    """
+    Tabulate node_operation so that the same gate rules can be applied to
+    whole arrays of nodes
+
+    Returns:
+        tuple: (gate_supported, swap_supported, matrices) where
+        gate_supported[type, controls, rotated] tells if a non-swap node
+        produces a gate, swap_supported[controls] if a swap node does, and
+        matrices[type] is the unrotated 2x2 matrix (identity if no gate)
+    """
+    gate_supported = np.zeros((_NUM_NODE_TYPES, 3, 2), dtype=bool)
+    swap_supported = np.zeros(3, dtype=bool)
+    matrices = np.tile(np.eye(2, dtype=complex), (_NUM_NODE_TYPES, 1, 1))
+    for num_controls in range(3):
+        controls = (1, 2)[:num_controls] + (-1,) * (2 - num_controls)
+        swap_supported[num_controls] = (
+            node_operation(0, node_types.SWAP, 0.0, *controls, 3) is not None
+        )
+        for node_type in range(node_types.EMPTY, node_types.TRACE + 1):
+            for rotated in range(2):
+                gate_supported[node_type - node_types.EMPTY, num_controls, rotated] = (
+                    node_operation(0, node_type, float(rotated), *controls) is not None
+                )
+    for node_type, name in GATE_NAMES.items():
+        if name in GATE_MATRICES:
+            matrices[node_type - node_types.EMPTY] = GATE_MATRICES[name]
+    return gate_supported, swap_supported, matrices
+
+
+GATE_SUPPORTED, SWAP_SUPPORTED, MATRIX_TABLE = _build_tables()
+
+
+def stack_grids(circuit_grid_models):
+    """
+    Stack the node arrays of circuit grids with the same size
+
+    Parameters:
+    circuit_grid_models (iterable): CircuitGridModel instances
+
+    Returns:
+        tuple: (node_type, radians, ctrl_a, ctrl_b, swap) arrays of shape
+        (batch, wires, columns)
+    """
+    models = list(circuit_grid_models)
+    return tuple(
+        np.stack([getattr(model, field) for model in models])
+        for field in ("node_type", "radians", "ctrl_a", "ctrl_b", "swap")
+    )
+
+
+def _bits(indices, wires):
+    """
+    Get bit wires[b] of every basis state index, for each batch entry b.
+    Negative wires read as bit 1 so that they never block a control.
+    """
+    return np.where(
+        wires[:, None] < 0, 1, (indices[None, :] >> np.maximum(wires, 0)[:, None]) & 1
+    ).astype(bool)
+
+
+def _rotation_matrices(node_type, radians):
+    """
+    Get rx/ry/rz matrices for a batch of X/Y/Z nodes
+    """
+    cos = np.cos(radians / 2)
+    sin = np.sin(radians / 2)
+    matrices = np.empty(radians.shape + (2, 2), dtype=complex)
+    is_x = node_type == node_types.X
+    is_y = node_type == node_types.Y
+    matrices[..., 0, 0] = np.where(is_x | is_y, cos, np.exp(-0.5j * radians))
+    matrices[..., 1, 1] = np.where(is_x | is_y, cos, np.exp(0.5j * radians))
+    matrices[..., 0, 1] = np.where(is_x, -1j * sin, np.where(is_y, -sin, 0))
+    matrices[..., 1, 0] = np.where(is_x, -1j * sin, np.where(is_y, sin, 0))
+    return matrices
+
+
+# pylint: disable=too-many-arguments disable=too-many-locals
+def simulate_batch(node_type, radians, ctrl_a, ctrl_b, swap):
+    """
+    Simulate a batch of circuit grids together, applying each grid node
+    slot to the whole batch in one vectorized step
+
+    Parameters:
+    node_type, radians, ctrl_a, ctrl_b, swap (numpy.ndarray): node arrays
+        of shape (batch, wires, columns), see stack_grids
+
+    Returns:
+        numpy.ndarray: statevector amplitudes of shape (batch, 2**wires)
+    """
+    node_type = np.asarray(node_type, dtype=int)
+    radians = np.asarray(radians, dtype=float)
+    ctrl_a = np.asarray(ctrl_a, dtype=int)
+    ctrl_b = np.asarray(ctrl_b, dtype=int)
+    swap = np.asarray(swap, dtype=int)
+    batch_size, num_qubits, num_columns = node_type.shape
+
+    num_controls = (ctrl_a != -1).astype(int) + (ctrl_b != -1)
+    rotated = radians != 0
+    is_swap = swap != -1
+    is_gate = (
+        ~is_swap
+        & GATE_SUPPORTED[
+            node_type - node_types.EMPTY, num_controls, rotated.astype(int)
+        ]
+    )
+    is_swap &= SWAP_SUPPORTED[num_controls]
+
+    matrices = MATRIX_TABLE[node_type - node_types.EMPTY]
+    is_rotation = rotated & np.isin(node_type, _ROTATED_TYPES)
+    matrices[is_rotation] = _rotation_matrices(
+        node_type[is_rotation], radians[is_rotation]
+    )
+
+    indices = np.arange(2**num_qubits)
+    state = np.zeros((batch_size, 2**num_qubits), dtype=complex)
+    state[:, 0] = 1
+
+    for column_num in range(num_columns):
+        for wire_num in range(num_qubits):
+            gates = is_gate[:, wire_num, column_num]
+            swaps = is_swap[:, wire_num, column_num]
+            if not gates.any() and not swaps.any():
+                continue
+
+            enabled = _bits(indices, ctrl_a[:, wire_num, column_num]) & _bits(
+                indices, ctrl_b[:, wire_num, column_num]
+            )
+
+            if gates.any():
+                # view the state as (batch, high bits, target bit, low bits)
+                tensor = state.reshape(
+                    (batch_size, 2 ** (num_qubits - 1 - wire_num), 2, 2**wire_num)
+                )
+                applied = np.einsum(
+                    "bij,bhjl->bhil", matrices[:, wire_num, column_num], tensor
+                ).reshape(state.shape)
+                state = np.where(enabled & gates[:, None], applied, state)
+
+            if swaps.any():
+                partner = np.maximum(swap[:, wire_num, column_num], 0)[:, None]
+                flip = ((indices >> wire_num) ^ (indices[None, :] >> partner)) & 1
+                permutation = indices ^ (flip << wire_num) ^ (flip << partner)
+                applied = np.take_along_axis(state, permutation, axis=1)
+                state = np.where(enabled & swaps[:, None], applied, state)
+
+    return state
+
+
+def probabilities_batch(node_type, radians, ctrl_a, ctrl_b, swap):
+    """
+    Get basis state probabilities for a batch of circuit grids
+
+    Returns:
+        numpy.ndarray: probabilities of shape (batch, 2**wires)
+    """
+    return np.abs(simulate_batch(node_type, radians, ctrl_a, ctrl_b, swap)) ** 2
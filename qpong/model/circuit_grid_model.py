@@ -4,9 +4,19 @@ Grid-based model underlying the circuit grid for the quantum player
 
 import numpy as np
 
-from qiskit import QuantumCircuit, QuantumRegister
-
 from qpong.model import circuit_node_types as node_types
+from qpong.model.lru_cache import LRUCache
+from qpong.model.measurement_sampler import MeasurementSampler
+from qpong.model.stabilizer_simulator import (
+    StabilizerSampler,
+    StabilizerSimulator,
+    is_clifford_grid,
+)
+from qpong.model.statevector_simulator import (
+    BACKEND_NUMPY,
+    StatevectorSimulator,
+    simulate,
+)
 
 NODE_IDENTIFIERS = {
     0: "i",
@@ -22,20 +32,107 @@ NODE_IDENTIFIERS = {
     10: "c",
 }
 
+RESULT_CACHE_SIZE = 512
+
+
+class _ResultCache(LRUCache):
+    """
+    Simulation results per exact content of the grid, and the content of
+    the current grid, built lazily after each edit
+    """
+
+    def __init__(self, maxsize):
+        super().__init__(maxsize)
+        self.grid_key = None
+
+
+class _PrefixCache:
+    """
+    Statevector after each column of a grid, valid for the first
+    num_valid_columns columns only, so that a simulation resumes from the
+    last column that has not changed
+    """
+
+    def __init__(self, max_wires, max_columns):
+        self.simulator = StatevectorSimulator(max_wires)
+        self.column_states = [None] * max_columns
+        self.num_valid_columns = 0
+        self.recomputed_columns = 0
+        self.last_recomputed_columns = 0
+
+    def invalidate(self, column_num):
+        """
+        Drop cached statevectors from a specified column onwards
+
+        Parameters:
+        column_num (integer): first column whose cached state is stale
+        """
+        self.num_valid_columns = min(self.num_valid_columns, column_num)
+
+    def simulate(self, circuit_grid_model):
+        """
+        Simulate a circuit grid from the last valid column state
+
+        Returns:
+            numpy.ndarray: statevector amplitudes (read-only)
+        """
+        max_columns = circuit_grid_model.max_columns
+        if self.num_valid_columns > 0:
+            state = self.column_states[self.num_valid_columns - 1].copy()
+        else:
+            state = self.simulator.initial_state()
+
+        self.last_recomputed_columns = max_columns - self.num_valid_columns
+        self.recomputed_columns += self.last_recomputed_columns
+        for column_num in range(self.num_valid_columns, max_columns):
+            self.simulator.apply_column(state, circuit_grid_model, column_num)
+            column_state = state.copy()
+            column_state.flags.writeable = False
+            self.column_states[column_num] = column_state
+        self.num_valid_columns = max_columns
+
+        if max_columns == 0:
+            state.flags.writeable = False
+            return state
+        return self.column_states[-1]
+
+
 # pylint: disable=too-few-public-methods
 class CircuitGridModel:
     """
     Grid-based model that is built when user interacts with circuit
     """
 
-    def __init__(self, max_wires, max_columns):
+    def __init__(self, max_wires, max_columns, backend=BACKEND_NUMPY, seed=None):
         self.max_wires = max_wires
         self.max_columns = max_columns
-        self.nodes = np.full(
-            (max_wires, max_columns),
-            CircuitGridNode(node_types.EMPTY),
-            dtype=CircuitGridNode,
-        )
+        self.backend = backend
+
+        # nodes are stored as parallel typed arrays indexed [wire, column]
+        shape = (max_wires, max_columns)
+        self.node_type = np.full(shape, node_types.EMPTY, dtype=np.int8)
+        self.radians = np.zeros(shape, dtype=float)
+        self.ctrl_a = np.full(shape, -1, dtype=np.int8)
+        self.ctrl_b = np.full(shape, -1, dtype=np.int8)
+        self.swap = np.full(shape, -1, dtype=np.int8)
+
+        # reverse index: for a wire used as a control or swap partner, the
+        # gate part it shows (CTRL/SWAP) and the wire of the owning gate
+        self.linked_part = np.full(shape, node_types.EMPTY, dtype=np.int8)
+        self.linked_wire = np.full(shape, -1, dtype=np.int8)
+
+        # simulation results seen per grid content
+        self.result_cache = _ResultCache(RESULT_CACHE_SIZE)
+
+        # random generator of the measurement samplers
+        self.rng = np.random.default_rng(seed)
+
+        # statevector after each column
+        self.prefix_cache = _PrefixCache(max_wires, max_columns)
+
+        # callables notified with the set of (wire, column) cells whose
+        # appearance may have changed after each edit
+        self.listeners = []
 
     def __str__(self):
         retval = ""
@@ -54,13 +151,91 @@ class CircuitGridModel:
         column_num (integer): column number
         circuit_grid_node (CircuitGridNode): node to be assigned
         """
-        self.nodes[wire_num][column_num] = CircuitGridNode(
-            circuit_grid_node.node_type,
-            circuit_grid_node.radians,
-            circuit_grid_node.ctrl_a,
-            circuit_grid_node.ctrl_b,
-            circuit_grid_node.swap,
+        self.node_type[wire_num, column_num] = circuit_grid_node.node_type
+        self.radians[wire_num, column_num] = circuit_grid_node.radians
+        self.ctrl_a[wire_num, column_num] = circuit_grid_node.ctrl_a
+        self.ctrl_b[wire_num, column_num] = circuit_grid_node.ctrl_b
+        self.swap[wire_num, column_num] = circuit_grid_node.swap
+        linked_wires = self.index_column(column_num)
+        self.prefix_cache.invalidate(column_num)
+        self.result_cache.grid_key = None
+
+        touched_cells = {(wire_num, column_num)}
+        touched_cells.update((linked_wire, column_num) for linked_wire in linked_wires)
+        self.notify_listeners(touched_cells)
+
+    def add_listener(self, listener):
+        """
+        Register a callable to be notified of changed cells
+
+        Parameters:
+        listener (callable): called with a set of (wire_num, column_num)
+            tuples after each change
+        """
+        self.listeners.append(listener)
+
+    def notify_listeners(self, touched_cells):
+        """
+        Notify listeners that the appearance of some cells may have changed
+
+        Parameters:
+        touched_cells (set): (wire_num, column_num) tuples
+        """
+        for listener in self.listeners:
+            listener(touched_cells)
+
+    def get_grid_key(self):
+        """
+        Get the exact content of the grid, the bytes of its node arrays,
+        so that two different grids never share cached results
+
+        Returns:
+            bytes: key of the simulation results of the grid
+        """
+        if self.result_cache.grid_key is None:
+            self.result_cache.grid_key = b"".join(
+                array.tobytes()
+                for array in (
+                    self.node_type,
+                    self.radians,
+                    self.ctrl_a,
+                    self.ctrl_b,
+                    self.swap,
+                )
+            )
+        return self.result_cache.grid_key
+
+    def index_column(self, column_num):
+        """
+        Rebuild the reverse control/swap index of a column
+
+        Parameters:
+        column_num (integer): column number
+
+        Returns:
+            list: wires of the column whose index entry changed, i.e. whose
+            CTRL/SWAP part or owning gate is different
+        """
+        old_part = self.linked_part[:, column_num].copy()
+        old_wire = self.linked_wire[:, column_num].copy()
+        self.linked_part[:, column_num] = node_types.EMPTY
+        self.linked_wire[:, column_num] = -1
+
+        # walk upwards so that the topmost owning gate wins
+        for wire_num in reversed(range(self.max_wires)):
+            for linked_wire_num, part in (
+                (self.swap[wire_num, column_num], node_types.SWAP),
+                (self.ctrl_b[wire_num, column_num], node_types.CTRL),
+                (self.ctrl_a[wire_num, column_num], node_types.CTRL),
+            ):
+                if linked_wire_num not in (-1, wire_num):
+                    self.linked_part[linked_wire_num, column_num] = part
+                    self.linked_wire[linked_wire_num, column_num] = wire_num
+
+        changed = (old_part != self.linked_part[:, column_num]) | (
+            old_wire != self.linked_wire[:, column_num]
         )
+        return np.flatnonzero(changed).tolist()
 
     def get_node(self, wire_num, column_num):
         """
@@ -72,10 +247,17 @@ class CircuitGridModel:
         column_num (integer): column number
 
         Returns:
+            CircuitGridNode: a copy of the node, use set_node to change it
         """
 
         if wire_num < self.max_wires and column_num < self.max_columns:
-            return self.nodes[wire_num][column_num]
+            return CircuitGridNode(
+                int(self.node_type[wire_num, column_num]),
+                float(self.radians[wire_num, column_num]),
+                int(self.ctrl_a[wire_num, column_num]),
+                int(self.ctrl_b[wire_num, column_num]),
+                int(self.swap[wire_num, column_num]),
+            )
 
         return None
 
@@ -88,22 +270,16 @@ class CircuitGridModel:
         wire_num (integer): wire number
         column_num (integer): column number
         """
-        requested_node = self.get_node(wire_num, column_num)
-        if requested_node and requested_node.node_type != node_types.EMPTY:
-            # Node is occupied so return its gate
-            return requested_node.node_type
+        if not (0 <= wire_num < self.max_wires and 0 <= column_num < self.max_columns):
+            return node_types.EMPTY
 
-        # Check for control nodes from gates in other nodes in this column
-        nodes_in_column = self.nodes[:, column_num]
-        for idx in range(self.max_wires):
-            if idx != wire_num:
-                other_node = nodes_in_column[idx]
-                if wire_num in (other_node.ctrl_a, other_node.ctrl_b):
-                    return node_types.CTRL
-                if other_node.swap == wire_num:
-                    return node_types.SWAP
+        node_type = self.node_type[wire_num, column_num]
+        if node_type != node_types.EMPTY:
+            # Node is occupied so return its gate
+            return int(node_type)
 
-        return node_types.EMPTY
+        # Control or swap part of a gate on another wire in this column
+        return int(self.linked_part[wire_num, column_num])
 
     def get_gate_wire_for_control_node(self, control_wire_num, column_num):
         """
@@ -113,32 +289,33 @@ class CircuitGridModel:
         control_wire_num (integer): wire number of control qubit
         column_num (integer): column number
         """
+        # the reverse index keeps the topmost owner and hides controls
+        # shadowed by a swap, so scan the column for the bottommost owner
+        owners = (self.ctrl_a[:, column_num] == control_wire_num) | (
+            self.ctrl_b[:, column_num] == control_wire_num
+        )
+        owners[control_wire_num] = False
         gate_wire_num = -1
-        nodes_in_column = self.nodes[:, column_num]
-        for wire_idx in range(self.max_wires):
-            if wire_idx != control_wire_num:
-                other_node = nodes_in_column[wire_idx]
-                if control_wire_num in (other_node.ctrl_a, other_node.ctrl_b):
-                    gate_wire_num = wire_idx
-                    print(
-                        "Found gate: ",
-                        self.get_node_gate_part(gate_wire_num, column_num),
-                        " on wire: ",
-                        gate_wire_num,
-                    )
+        if owners.any():
+            gate_wire_num = int(np.flatnonzero(owners)[-1])
         return gate_wire_num
 
     def construct_circuit(self):
         """
         Construct quantum circuit with instruction on circuit grid
+
+        qiskit is only imported here, so the game runs without it unless
+        the qiskit backend or a circuit export is requested.
         """
+        # pylint: disable=import-outside-toplevel
+        from qiskit import QuantumCircuit, QuantumRegister
+
         register = QuantumRegister(self.max_wires, "q")
         circuit = QuantumCircuit(register)
 
         for column_num in range(self.max_columns):
             for wire_num in range(self.max_wires):
-                print(column_num, wire_num)
-                node = self.nodes[wire_num][column_num]
+                node = self.get_node(wire_num, column_num)
                 attr = []
                 args = []
 
@@ -172,14 +349,155 @@ class CircuitGridModel:
 
         return circuit
 
+    def get_cached_result(self):
+        """
+        Get the simulation results stored for the current grid, looked up
+        by content so that grids simulated before are not simulated again
+
+        Each public getter looks the grid up once and passes the results to
+        the helpers, so that the cache counts one hit or miss per request.
+
+        Returns:
+            dict: results computed so far for this grid, filled in lazily
+        """
+        grid_key = self.get_grid_key()
+        result = self.result_cache.get(grid_key)
+        if result is None:
+            result = {}
+            self.result_cache.put(grid_key, result)
+        return result
+
+    def get_stabilizer_state(self):
+        """
+        Get the stabilizer tableau of the circuit grid when it only holds
+        Clifford gates, so that it can be measured without a dense statevector
+
+        Returns:
+            StabilizerSimulator: tableau, or None if the grid is not
+            Clifford-only or another backend than NumPy is selected
+        """
+        return self._stabilizer_state(self.get_cached_result())
+
+    def get_simulation_result(self):
+        """
+        Get probabilities and amplitudes of the circuit grid
+
+        Returns:
+            tuple: (probabilities, amplitudes) as read-only numpy.ndarray
+        """
+        result = self.get_cached_result()
+        return self._probabilities(result), self._statevector(result)
+
+    def get_statevector(self):
+        """
+        Get statevector amplitudes of the circuit grid
+        """
+        return self._statevector(self.get_cached_result())
+
+    def get_probabilities(self):
+        """
+        Get the probability of each computational basis state, from the
+        stabilizer tableau for Clifford-only grids
+        """
+        return self._probabilities(self.get_cached_result())
+
+    def get_measurement_sampler(self):
+        """
+        Get a sampler for measuring all qubits of the circuit grid, built
+        once per grid configuration
+        """
+        return self._measurement_sampler(self.get_cached_result())
+
+    def _stabilizer_state(self, result):
+        """
+        Get the stabilizer tableau from the cached results of the grid
+        """
+        if "stabilizer_state" not in result:
+            stabilizer_state = None
+            if self.backend == BACKEND_NUMPY and is_clifford_grid(self):
+                stabilizer_state = StabilizerSimulator(self.max_wires).run(self)
+            result["stabilizer_state"] = stabilizer_state
+        return result["stabilizer_state"]
+
+    def _statevector(self, result):
+        """
+        Get the statevector from the cached results of the grid
+        """
+        if "amplitudes" not in result:
+            result["amplitudes"] = self.simulate()
+        return result["amplitudes"]
+
+    def _probabilities(self, result):
+        """
+        Get the probabilities from the cached results of the grid
+        """
+        if "probabilities" not in result:
+            stabilizer_state = self._stabilizer_state(result)
+            if stabilizer_state is not None:
+                probabilities = stabilizer_state.probabilities()
+            else:
+                probabilities = np.abs(self._statevector(result)) ** 2
+            probabilities.flags.writeable = False
+            result["probabilities"] = probabilities
+        return result["probabilities"]
+
+    def _measurement_sampler(self, result):
+        """
+        Get the measurement sampler from the cached results of the grid
+        """
+        if "sampler" not in result:
+            stabilizer_state = self._stabilizer_state(result)
+            if stabilizer_state is not None:
+                sampler = StabilizerSampler(stabilizer_state, self.rng)
+            else:
+                sampler = MeasurementSampler(self._probabilities(result), self.rng)
+            result["sampler"] = sampler
+        return result["sampler"]
+
+    def measure(self):
+        """
+        Measure all qubits of the circuit grid
+
+        Returns:
+            integer: measured basis state
+        """
+        return self.get_measurement_sampler().sample()
+
+    def simulate(self):
+        """
+        Simulate the circuit grid with the selected backend
+
+        The NumPy backend resumes from the cached statevector of the last
+        column that has not changed since the previous call.
+
+        Returns:
+            numpy.ndarray: statevector amplitudes (read-only)
+        """
+        if self.backend != BACKEND_NUMPY:
+            state = simulate(self, self.backend)
+            state.flags.writeable = False
+            return state
+        return self.prefix_cache.simulate(self)
+
     def reset_circuit(self):
         """
-        Reset circuit by reinitializing nodes matrix
+        Reset circuit by reinitializing node arrays
         """
-        self.nodes = np.full(
-            (self.max_wires, self.max_columns),
-            CircuitGridNode(node_types.EMPTY),
-            dtype=CircuitGridNode,
+        self.node_type.fill(node_types.EMPTY)
+        self.radians.fill(0)
+        self.ctrl_a.fill(-1)
+        self.ctrl_b.fill(-1)
+        self.swap.fill(-1)
+        self.linked_part.fill(node_types.EMPTY)
+        self.linked_wire.fill(-1)
+        self.prefix_cache.invalidate(0)
+        self.result_cache.grid_key = None
+        self.notify_listeners(
+            {
+                (wire_num, column_num)
+                for wire_num in range(self.max_wires)
+                for column_num in range(self.max_columns)
+            }
         )
 
 
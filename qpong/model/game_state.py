@@ -0,0 +1,484 @@
+"""
+Display-free state and rules of a QPong match
+
+Nothing here depends on pygame, so matches can be simulated without
+initializing SDL. The pygame views (qpong.utils.ball.Ball and the paddle
+sprites of qpong.utils.level.Level) are layered on top.
+"""
+
+import math
+import random
+
+from qpong.utils.parameters import (
+    CLASSICAL_COMPUTER,
+    COMPUTER_PADDLE_INTERVAL,
+    LAYOUT,
+    LEFT,
+    MAX_BOUNCES_PER_STEP,
+    MEASURE_LEFT,
+    MEASURE_RIGHT,
+    MEASUREMENT_REFRESH_DELAY,
+    NO,
+    NOTHING,
+    PADDLE_SPEEDUP,
+    QUANTUM_COMPUTER,
+    RIGHT,
+    SIMULATION_RATE,
+    SPEED_TIME_UNIT,
+    WIN_SCORE,
+    YES,
+)
+from qpong.utils.score import Score
+
+
+class Paddle:
+    """
+    Axis-aligned paddle rectangle, with the attributes of pygame.Rect the
+    ball collides with
+    """
+
+    def __init__(self, xpos, ypos, width, height):
+        self.xpos = xpos
+        self.ypos = ypos
+        self.width = width
+        self.height = height
+
+    @property
+    def left(self):
+        """
+        Left side
+        """
+        return self.xpos
+
+    @property
+    def right(self):
+        """
+        Right side
+        """
+        return self.xpos + self.width
+
+    @property
+    def top(self):
+        """
+        Top side
+        """
+        return self.ypos
+
+    @property
+    def bottom(self):
+        """
+        Bottom side
+        """
+        return self.ypos + self.height
+
+    @property
+    def centerx(self):
+        """
+        Horizontal center
+        """
+        return self.xpos + self.width / 2
+
+
+class BallState:
+    """
+    Position, speed and direction of the ball, its bounces and the score it
+    makes
+    """
+
+    # pylint: disable=too-many-instance-attributes
+    def __init__(self, width=None, height=None, rng=None):
+        """
+        Parameters:
+        width (integer): ball width, the ball image size by default
+        height (integer): ball height, the ball image size by default
+        rng (random.Random): random generator of the serve directions, the
+            random module by default
+        """
+        self.rng = random if rng is None else rng
+
+        # get ball screen dimensions
+        self.screenheight = round(LAYOUT.window_height * 0.7)
+        self.screenwidth = LAYOUT.window_width
+        self.width_unit = LAYOUT.width_unit
+
+        self.left_edge = self.width_unit
+        self.right_edge = self.screenwidth - self.left_edge
+
+        self.top_edge = self.width_unit * 0
+        self.bottom_edge = self.screenheight - self.top_edge
+
+        self.width = LAYOUT.ball_size if width is None else width
+        self.height = LAYOUT.ball_size if height is None else height
+
+        self.xpos = 0
+        self.ypos = 0
+        # position before the last simulation step, for interpolation
+        self.previous_xpos = 0
+        self.previous_ypos = 0
+        self.speed = 0
+        self.initial_speed_factor = 0.8
+        self.direction = 0
+
+        # initialize ball action type, measure and bounce flags
+        self.ball_action = NOTHING
+        self.measure_flag = NO
+
+        # initialize ball reset on the left
+        self.reset_position = LEFT
+        self.reset()
+
+        self.score = Score()
+        # paddle hits since the ball was created
+        self.hits = 0
+
+    def update(self, time_step=1 / SIMULATION_RATE, paddles=()):
+        """
+        Update ball, bouncing off the top and bottom edges and the paddles
+        at their exact time of impact within the step, so that a fast ball
+        never goes through them
+
+        Parameters:
+        time_step (float): duration of the simulation step, in seconds
+        paddles (iterable): rectangles the ball bounces off, pygame.Rect or
+            Paddle
+        """
+        radians = math.radians(self.direction)
+        distance = self.speed * time_step / SPEED_TIME_UNIT
+
+        self.previous_xpos = self.xpos
+        self.previous_ypos = self.ypos
+        self.move(distance * math.sin(radians), -distance * math.cos(radians), paddles)
+
+    def move(self, delta_x, delta_y, paddles=()):
+        """
+        Move the ball along a displacement, bouncing up to
+        MAX_BOUNCES_PER_STEP times on the way
+
+        Parameters:
+        delta_x (float): horizontal displacement
+        delta_y (float): vertical displacement
+        paddles (iterable): rectangles the ball bounces off
+        """
+        # fraction of the displacement left to travel
+        remaining = 1.0
+        for _ in range(MAX_BOUNCES_PER_STEP):
+            hit_time, hit_paddle, hit_x = remaining, None, False
+
+            # top and bottom edges
+            if delta_y < 0:
+                time = max((self.top_edge - self.ypos) / delta_y, 0)
+                if time < hit_time:
+                    hit_time, hit_paddle = time, self
+            elif delta_y > 0:
+                time = max((self.bottom_edge - self.height - self.ypos) / delta_y, 0)
+                if time < hit_time:
+                    hit_time, hit_paddle = time, self
+
+            for paddle in paddles:
+                time, x_axis = self.sweep(paddle, delta_x, delta_y)
+                if time is not None and time < hit_time:
+                    hit_time, hit_paddle, hit_x = time, paddle, x_axis
+
+            self.xpos += delta_x * hit_time
+            self.ypos += delta_y * hit_time
+            remaining -= hit_time
+            if hit_paddle is None:
+                return
+
+            if hit_x:
+                self.bounce_edge()
+                delta_x, delta_y = -delta_x * PADDLE_SPEEDUP, delta_y * PADDLE_SPEEDUP
+            else:
+                self.bounce_wall()
+                delta_y = -delta_y
+
+    def sweep(self, rect, delta_x, delta_y):
+        """
+        Find when the ball moving along a displacement first hits a
+        rectangle
+
+        Parameters:
+        rect (pygame.Rect): obstacle, or a Paddle
+        delta_x (float): horizontal displacement
+        delta_y (float): vertical displacement
+
+        Returns:
+            tuple: (time of impact as a fraction of the displacement, True
+            if the ball hits a left or right side), time is None if the
+            ball misses the rectangle
+        """
+        # the ball is a point moving in the rectangle grown by the ball size
+        left, right = rect.left - self.width, rect.right
+        top, bottom = rect.top - self.height, rect.bottom
+
+        if delta_x > 0:
+            x_entry, x_exit = (left - self.xpos) / delta_x, (
+                right - self.xpos
+            ) / delta_x
+        elif delta_x < 0:
+            x_entry, x_exit = (right - self.xpos) / delta_x, (
+                left - self.xpos
+            ) / delta_x
+        elif left < self.xpos < right:
+            x_entry, x_exit = -math.inf, math.inf
+        else:
+            return None, False
+
+        if delta_y > 0:
+            y_entry, y_exit = (top - self.ypos) / delta_y, (
+                bottom - self.ypos
+            ) / delta_y
+        elif delta_y < 0:
+            y_entry, y_exit = (bottom - self.ypos) / delta_y, (
+                top - self.ypos
+            ) / delta_y
+        elif top < self.ypos < bottom:
+            y_entry, y_exit = -math.inf, math.inf
+        else:
+            return None, False
+
+        entry, exit_ = max(x_entry, y_entry), min(x_exit, y_exit)
+        if entry >= exit_ or exit_ <= 0 or entry > 1:
+            return None, False
+        if entry >= 0:
+            return entry, x_entry > y_entry
+
+        # the paddle moved onto the ball: bounce back if the ball heads to
+        # the middle of the paddle
+        if (delta_x > 0) == (self.xpos + self.width / 2 < rect.centerx):
+            return 0.0, True
+        return None, False
+
+    def reset(self):
+        """
+        Reset ball position and speed to initial settings.
+        """
+        self.ypos = self.screenheight / 2
+        self.speed = self.width_unit * self.initial_speed_factor
+
+        # alternate reset at left and right
+        if self.reset_position == LEFT:
+            self.xpos = self.left_edge + self.width_unit * 15
+            self.direction = self.rng.randrange(30, 120)
+            self.reset_position = RIGHT
+        else:
+            self.xpos = self.right_edge - self.width_unit * 15
+            self.direction = self.rng.randrange(-120, -30)
+            self.reset_position = LEFT
+
+        # jump to the new position without interpolating from the old one
+        self.previous_xpos = self.xpos
+        self.previous_ypos = self.ypos
+
+    def bounce_edge(self):
+        """
+        Bounce ball off a paddle
+        """
+        self.direction = (360 - self.direction) % 360
+        self.speed *= PADDLE_SPEEDUP
+        self.hits += 1
+
+    def bounce_wall(self):
+        """
+        Bounce ball off the top or bottom edge, or the top or bottom of a
+        paddle
+        """
+        self.direction = (180 - self.direction) % 360
+
+    def score_point(self, player):
+        """
+        Give a point to a player and serve the ball again
+        """
+        self.reset()
+        self.score.update(player)
+
+    def get_xpos(self):
+        """
+        Get ball's x position
+        """
+        xpos = self.xpos
+        return xpos
+
+    def get_ypos(self):
+        """
+        Get ball's y position
+        """
+        ypos = self.ypos
+        return ypos
+
+    # 1 = comp, 2 = player, none = 0
+    def action(self):
+        """
+        Decide ball action based on the ball's position
+        """
+        if self.xpos < self.left_edge:
+            # reset the ball when it reaches beyond left edge
+            self.score_point(QUANTUM_COMPUTER)
+
+        elif self.crossed(
+            self.left_edge + 10 * self.width_unit,
+            self.left_edge + 12 * self.width_unit,
+        ):
+            # measure the ball when it reaches the left measurement zone
+            if self.measure_flag == NO:
+                self.ball_action = MEASURE_LEFT
+                self.measure_flag = YES
+            else:
+                self.ball_action = NOTHING
+
+        elif self.crossed(
+            self.right_edge - 12 * self.width_unit,
+            self.right_edge - 10 * self.width_unit,
+        ):
+            # measure the ball when it reaches the right measurement zone
+            if self.measure_flag == NO:
+                # do measurement if not yet done
+                self.ball_action = MEASURE_RIGHT
+                self.measure_flag = YES
+            else:
+                # do nothing if measurement was done already
+                self.ball_action = NOTHING
+
+        elif self.xpos > self.right_edge:
+            # reset the ball when it reaches beyond right edge
+            self.score_point(CLASSICAL_COMPUTER)
+
+        else:
+            # reset flags and do nothing when the ball is outside measurement and bounce zone
+            self.ball_action = NOTHING
+            self.measure_flag = NO
+
+    def crossed(self, low, high):
+        """
+        Check if the ball went through a horizontal zone during the last
+        step, even if it moved past it in one step
+
+        Parameters:
+        low (float): left end of the zone
+        high (float): right end of the zone, excluded
+        """
+        return (
+            min(self.previous_xpos, self.xpos) < high
+            and max(self.previous_xpos, self.xpos) >= low
+        )
+
+    def check_score(self, player):
+        """
+        Check a player score
+        """
+        return self.score.get_score(player)
+
+
+class GameState:
+    """
+    A match between the classical computer and the quantum player: the
+    ball, both paddles, the computer paddle moves and the measurements of
+    the quantum player circuit
+    """
+
+    # pylint: disable=too-many-instance-attributes disable=too-many-arguments
+    def __init__(
+        self, circuit_grid_model, qubit_num, ball=None, rng=None, measure=None
+    ):
+        """
+        Parameters:
+        circuit_grid_model (CircuitGridModel): circuit of the quantum player
+        qubit_num (integer): number of qubits of the circuit
+        ball (BallState): ball, a new one by default
+        rng (random.Random): random generator of the serves and computer
+            paddle moves, the random module by default
+        measure (callable): measures the circuit and returns the basis
+            state, circuit_grid_model.measure by default
+        """
+        self.rng = random if rng is None else rng
+        self.ball = BallState(rng=self.rng) if ball is None else ball
+        self.qubit_num = qubit_num
+        self.measure = circuit_grid_model.measure if measure is None else measure
+
+        paddle_height = max(1, int(round(self.ball.screenheight / 2**qubit_num)))
+        width_unit = LAYOUT.width_unit
+        self.left_paddle = Paddle(
+            LAYOUT.computer_paddle_x, 0, width_unit, paddle_height
+        )
+        self.right_paddle = Paddle(LAYOUT.statevector_x, 0, width_unit, paddle_height)
+        self.paddles = (self.left_paddle, self.right_paddle)
+        self.computer_jitter = LAYOUT.computer_jitter
+
+        # simulated time in milliseconds, and times of the last computer
+        # paddle move and measurement
+        self.time = 0.0
+        self.computer_time = 0.0
+        self.measure_time = 100000
+
+        # set when the state vector paddle should be shown again after a
+        # measurement, cleared by the view
+        self.refresh_requested = False
+        self.measurements = 0
+
+    def step(self, time_step=1 / SIMULATION_RATE):
+        """
+        Simulate one step
+
+        Parameters:
+        time_step (float): duration of the step, in seconds
+        """
+        ball = self.ball
+        self.time += 1000 * time_step
+
+        # update ball position, bouncing off the paddles
+        ball.update(time_step, self.paddles)
+
+        # computer paddle movement
+        if self.time - self.computer_time > COMPUTER_PADDLE_INTERVAL:
+            self.left_paddle.ypos = round(
+                ball.get_ypos()
+                - self.left_paddle.height / 2
+                + self.rng.randint(-self.computer_jitter, self.computer_jitter)
+            )
+            self.computer_time = self.time
+
+        # check ball location and decide what to do
+        ball.action()
+
+        if ball.ball_action == MEASURE_RIGHT:
+            # paddle after measurement
+            pos = self.measure()
+            self.right_paddle.ypos = round(
+                pos * ball.screenheight / 2**self.qubit_num
+            )
+            self.measure_time = self.time
+            self.measurements += 1
+
+        if self.time - self.measure_time > MEASUREMENT_REFRESH_DELAY:
+            # show the state vector a moment after measurement
+            self.refresh_requested = True
+            # add a buffer time before measure again
+            self.measure_time = self.time + 100000
+
+    def winner(self):
+        """
+        Get the player who reached WIN_SCORE, or None
+        """
+        for player in (CLASSICAL_COMPUTER, QUANTUM_COMPUTER):
+            if self.ball.score.get_score(player) >= WIN_SCORE:
+                return player
+        return None
+
+    def play(self, time_step=1 / SIMULATION_RATE, max_steps=None):
+        """
+        Simulate steps until a player wins
+
+        Parameters:
+        time_step (float): duration of a step, in seconds
+        max_steps (integer): steps simulated at most, None for no limit
+
+        Returns:
+            integer: winner, or None if max_steps was reached first
+        """
+        steps = 0
+        while self.winner() is None:
+            if steps == max_steps:
+                return None
+            self.step(time_step)
+            steps += 1
+        return self.winner()
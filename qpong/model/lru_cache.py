@@ -0,0 +1,62 @@
+"""
+Bounded least-recently-used cache
+"""
+
+from collections import OrderedDict
+
+
+class LRUCache:
+    """
+    Maps keys to values, evicting the least recently used entry once
+    maxsize entries are stored
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def get(self, key, default=None):
+        """
+        Get the value stored for a key and mark it as recently used
+
+        Parameters:
+        key (hashable): cache key
+        default: value returned when the key is not cached
+        """
+        try:
+            value = self.entries[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        """
+        Store a value, evicting the least recently used entry if needed
+
+        Parameters:
+        key (hashable): cache key
+        value: value to be stored
+        """
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        """
+        Remove all entries and reset hit/miss counters
+        """
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
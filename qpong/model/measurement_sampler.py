@@ -0,0 +1,73 @@
+"""
+Alias-table sampler for measuring all qubits of a statevector
+"""
+
+import numpy as np
+
+
+class MeasurementSampler:
+    """
+    Draws measurement outcomes from a probability vector in O(1) per shot
+    using Vose's alias method
+
+    The table is built once per probability vector; outcomes are returned
+    as basis state integers.
+    """
+
+    def __init__(self, probabilities, rng=None):
+        """
+        Parameters:
+        probabilities (numpy.ndarray): probability of each basis state
+        rng (numpy.random.Generator or integer): random generator, or a
+            seed to create one
+        """
+        if not isinstance(rng, np.random.Generator):
+            rng = np.random.default_rng(rng)
+        self.rng = rng
+
+        probabilities = np.asarray(probabilities, dtype=float)
+        num_outcomes = len(probabilities)
+        scaled = probabilities * (num_outcomes / probabilities.sum())
+
+        self.num_outcomes = num_outcomes
+        self.prob = np.ones(num_outcomes)
+        self.alias = np.arange(num_outcomes)
+
+        small = [idx for idx in range(num_outcomes) if scaled[idx] < 1]
+        large = [idx for idx in range(num_outcomes) if scaled[idx] >= 1]
+        while small and large:
+            small_idx = small.pop()
+            large_idx = large.pop()
+            self.prob[small_idx] = scaled[small_idx]
+            self.alias[small_idx] = large_idx
+            scaled[large_idx] += scaled[small_idx] - 1
+            if scaled[large_idx] < 1:
+                small.append(large_idx)
+            else:
+                large.append(large_idx)
+
+    def sample(self):
+        """
+        Draw a single measurement outcome
+
+        Returns:
+            integer: measured basis state
+        """
+        column = int(self.rng.integers(self.num_outcomes))
+        if self.rng.random() < self.prob[column]:
+            return column
+        return int(self.alias[column])
+
+    def sample_many(self, shots):
+        """
+        Draw many measurement outcomes in one vectorized call
+
+        Parameters:
+        shots (integer): number of outcomes
+
+        Returns:
+            numpy.ndarray: measured basis states
+        """
+        columns = self.rng.integers(self.num_outcomes, size=shots)
+        accept = self.rng.random(shots) < self.prob[columns]
+        return np.where(accept, columns, self.alias[columns])
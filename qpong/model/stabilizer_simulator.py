@@ -0,0 +1,299 @@
+"""
+Stabilizer tableau simulator for circuit grids made only of Clifford gates
+"""
+
+# the tableau bits x, z, r and the gate methods h, s, cx... follow the
+# standard Aaronson-Gottesman notation
+# pylint: disable=invalid-name
+
+import numpy as np
+
+from qpong.model.statevector_simulator import column_operations
+
+# gates (with one "c" per control qubit) that keep a stabilizer state a
+# stabilizer state; any other gate needs the dense statevector simulator
+CLIFFORD_GATES = frozenset(("x", "y", "z", "h", "s", "sdg", "swap", "cx", "cy", "cz"))
+
+# largest number of qubits for which a dense probability vector is built
+DENSE_MAX_QUBITS = 20
+
+
+def is_clifford_operation(operation):
+    """
+    Tell if an operation returned by node_operation is a Clifford gate
+    """
+    name, _, _, controls = operation
+    return "c" * len(controls) + name in CLIFFORD_GATES
+
+
+def is_clifford_grid(circuit_grid_model):
+    """
+    Tell if every gate of a circuit grid is a Clifford gate
+    """
+    return all(
+        is_clifford_operation(operation)
+        for column_num in range(circuit_grid_model.max_columns)
+        for operation in column_operations(circuit_grid_model, column_num)
+    )
+
+
+class StabilizerSimulator:
+    """
+    Aaronson-Gottesman tableau of n destabilizer and n stabilizer
+    generators, starting from |0...0>
+
+    Row i holds the Pauli string with X part x[i], Z part z[i] and sign
+    (-1)**r[i]; rows n..2n-1 are the stabilizers.
+    """
+
+    def __init__(self, num_qubits):
+        self.num_qubits = num_qubits
+        self.x = np.zeros((2 * num_qubits, num_qubits), dtype=bool)
+        self.z = np.zeros((2 * num_qubits, num_qubits), dtype=bool)
+        self.r = np.zeros(2 * num_qubits, dtype=bool)
+        self.x[:num_qubits] = np.eye(num_qubits, dtype=bool)
+        self.z[num_qubits:] = np.eye(num_qubits, dtype=bool)
+
+    def h(self, qubit):
+        """Hadamard gate"""
+        self.r ^= self.x[:, qubit] & self.z[:, qubit]
+        self.x[:, qubit], self.z[:, qubit] = (
+            self.z[:, qubit].copy(),
+            self.x[:, qubit].copy(),
+        )
+
+    def s(self, qubit):
+        """Phase gate"""
+        self.r ^= self.x[:, qubit] & self.z[:, qubit]
+        self.z[:, qubit] ^= self.x[:, qubit]
+
+    def sdg(self, qubit):
+        """Inverse phase gate"""
+        self.r ^= self.x[:, qubit] & ~self.z[:, qubit]
+        self.z[:, qubit] ^= self.x[:, qubit]
+
+    def pauli_x(self, qubit):
+        """Pauli X gate"""
+        self.r ^= self.z[:, qubit]
+
+    def pauli_y(self, qubit):
+        """Pauli Y gate"""
+        self.r ^= self.x[:, qubit] ^ self.z[:, qubit]
+
+    def pauli_z(self, qubit):
+        """Pauli Z gate"""
+        self.r ^= self.x[:, qubit]
+
+    def cx(self, control, target):
+        """Controlled-X gate"""
+        self.r ^= (
+            self.x[:, control]
+            & self.z[:, target]
+            & ~(self.x[:, target] ^ self.z[:, control])
+        )
+        self.x[:, target] ^= self.x[:, control]
+        self.z[:, control] ^= self.z[:, target]
+
+    def cy(self, control, target):
+        """Controlled-Y gate"""
+        self.sdg(target)
+        self.cx(control, target)
+        self.s(target)
+
+    def cz(self, control, target):
+        """Controlled-Z gate"""
+        self.h(target)
+        self.cx(control, target)
+        self.h(target)
+
+    def swap(self, qubit_a, qubit_b):
+        """Swap gate"""
+        self.x[:, [qubit_a, qubit_b]] = self.x[:, [qubit_b, qubit_a]]
+        self.z[:, [qubit_a, qubit_b]] = self.z[:, [qubit_b, qubit_a]]
+
+    def apply_operation(self, operation):
+        """
+        Apply a Clifford operation returned by node_operation
+        """
+        name, _, targets, controls = operation
+        if name == "swap":
+            self.swap(*targets)
+        elif controls:
+            getattr(self, "c" + name)(controls[0], targets[0])
+        else:
+            single_qubit_gates = {
+                "x": self.pauli_x,
+                "y": self.pauli_y,
+                "z": self.pauli_z,
+                "h": self.h,
+                "s": self.s,
+                "sdg": self.sdg,
+            }
+            single_qubit_gates[name](targets[0])
+
+    def run(self, circuit_grid_model):
+        """
+        Apply all columns of a Clifford-only circuit grid
+
+        Returns:
+            StabilizerSimulator: self
+        """
+        for column_num in range(circuit_grid_model.max_columns):
+            for operation in column_operations(circuit_grid_model, column_num):
+                self.apply_operation(operation)
+        return self
+
+    def outcome_space(self):
+        """
+        Get the measurement outcomes of all qubits, which form an affine
+        subspace and are all equally likely
+
+        Returns:
+            tuple: (offset, basis) where offset is a bool vector of qubit
+            values and basis a (k, n) bool matrix; the outcomes are offset
+            XOR any combination of basis rows, each with probability 2**-k
+        """
+        num_qubits = self.num_qubits
+        x = self.x[num_qubits:].copy()
+        z = self.z[num_qubits:].copy()
+        r = self.r[num_qubits:].copy()
+
+        # bring the X part to echelon form, rows below the X rank are then
+        # products of Z only and fix the parity of the qubits they act on
+        rank = _eliminate(x, z, r, x, 0)
+        constraint_z = z[rank:]
+        constraint_r = r[rank:]
+        num_constraints = _eliminate(
+            np.zeros_like(constraint_z), constraint_z, constraint_r, constraint_z, 0
+        )
+
+        pivots = [int(np.argmax(row)) for row in constraint_z[:num_constraints]]
+        free = [qubit for qubit in range(num_qubits) if qubit not in pivots]
+
+        offset = np.zeros(num_qubits, dtype=bool)
+        offset[pivots] = constraint_r[:num_constraints]
+        basis = np.zeros((len(free), num_qubits), dtype=bool)
+        for row, qubit in enumerate(free):
+            basis[row, qubit] = True
+            basis[row, pivots] = constraint_z[:num_constraints, qubit]
+        return offset, basis
+
+    def probabilities(self):
+        """
+        Get the probability of each computational basis state
+
+        Returns:
+            numpy.ndarray: dense probability vector of length 2**num_qubits
+        """
+        if self.num_qubits > DENSE_MAX_QUBITS:
+            raise ValueError(
+                "Too many qubits for a dense probability vector: "
+                + str(self.num_qubits)
+            )
+        offset, basis = self.outcome_space()
+        combinations = _bit_matrix(np.arange(2 ** len(basis)), len(basis))
+        outcomes = _to_integers(offset ^ (combinations.astype(int) @ basis % 2 == 1))
+        probabilities = np.zeros(2**self.num_qubits)
+        probabilities[outcomes] = 2.0 ** -len(basis)
+        return probabilities
+
+
+class StabilizerSampler:
+    """
+    Draws measurement outcomes of a stabilizer state in polynomial time,
+    with the same interface as MeasurementSampler
+    """
+
+    def __init__(self, stabilizer_simulator, rng=None):
+        if not isinstance(rng, np.random.Generator):
+            rng = np.random.default_rng(rng)
+        self.rng = rng
+        self.offset, self.basis = stabilizer_simulator.outcome_space()
+
+    def sample_bits(self, shots):
+        """
+        Draw measurement outcomes as a (shots, num_qubits) bool array where
+        column q holds the value of qubit q
+        """
+        choices = self.rng.integers(2, size=(shots, len(self.basis)))
+        return self.offset ^ (choices @ self.basis.astype(int) % 2 == 1)
+
+    def sample(self):
+        """
+        Draw a single measurement outcome
+
+        Returns:
+            integer: measured basis state
+        """
+        return int(self.sample_many(1)[0])
+
+    def sample_many(self, shots):
+        """
+        Draw many measurement outcomes in one vectorized call
+
+        Returns:
+            numpy.ndarray: measured basis states
+        """
+        return _to_integers(self.sample_bits(shots))
+
+
+def _eliminate(x, z, r, pivot_bits, first_row):
+    """
+    Gaussian elimination of Pauli rows over the columns of pivot_bits
+    (either x or z), keeping track of signs
+
+    Returns:
+        integer: number of pivot rows
+    """
+    row = first_row
+    for column in range(pivot_bits.shape[1]):
+        candidates = np.flatnonzero(pivot_bits[row:, column])
+        if len(candidates) == 0:
+            continue
+        pivot = row + candidates[0]
+        for bits in (x, z, r):
+            bits[[row, pivot]] = bits[[pivot, row]]
+        for other in np.flatnonzero(pivot_bits[:, column]):
+            if other != row:
+                _rowsum(x, z, r, other, row)
+        row += 1
+        if row == len(pivot_bits):
+            break
+    return row - first_row
+
+
+def _rowsum(x, z, r, target, source):
+    """
+    Multiply Pauli row target by Pauli row source, in place
+    """
+    x_1, z_1 = x[source].astype(int), z[source].astype(int)
+    x_2, z_2 = x[target].astype(int), z[target].astype(int)
+    phase = np.where(
+        x_1 & z_1,
+        z_2 - x_2,
+        np.where(x_1, z_2 * (2 * x_2 - 1), x_2 * (1 - 2 * z_2) * z_1),
+    )
+    total = 2 * int(r[target]) + 2 * int(r[source]) + int(phase.sum())
+    r[target] = total % 4 == 2
+    x[target] ^= x[source]
+    z[target] ^= z[source]
+
+
+def _bit_matrix(values, num_bits):
+    """
+    Expand integers into rows of num_bits bits, least significant first
+    """
+    return (values[:, None] >> np.arange(num_bits)) & 1 == 1
+
+
+def _to_integers(bits):
+    """
+    Pack rows of qubit values into basis state integers, qubit q being
+    bit q as in the statevector ordering
+    """
+    bits = np.atleast_2d(bits)
+    if bits.shape[1] < 63:
+        return bits @ (1 << np.arange(bits.shape[1], dtype=np.int64))
+    # too many qubits for int64, fall back to Python integers
+    weights = np.array([1 << qubit for qubit in range(bits.shape[1])], dtype=object)
+    return bits.astype(object) @ weights
@@ -0,0 +1,339 @@
+"""
+Native NumPy statevector simulator for the circuit grid
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+from qpong.model import circuit_node_types as node_types
+from qpong.model.lru_cache import LRUCache
+
+BACKEND_NUMPY = "numpy"
+BACKEND_QISKIT = "qiskit"
+BACKENDS = (BACKEND_NUMPY, BACKEND_QISKIT)
+
+# Columns of grids up to this many qubits are fused into a single dense
+# operator, larger grids keep the column as a list of gate kernels
+FUSE_MAX_QUBITS = 6
+COLUMN_CACHE_SIZE = 256
+
+# complex64 halves the memory and bandwidth of the state compared to the
+# default complex128, which matters once grids get to 10 qubits
+STATE_DTYPE = np.complex64
+
+GATE_NAMES = {
+    node_types.IDEN: "i",
+    node_types.X: "x",
+    node_types.Y: "y",
+    node_types.Z: "z",
+    node_types.S: "s",
+    node_types.SDG: "sdg",
+    node_types.T: "t",
+    node_types.TDG: "tdg",
+    node_types.H: "h",
+}
+
+# Gate names (with one "c" per control qubit) that CircuitGridModel.construct_circuit
+# can emit and qiskit understands. Anything else is skipped by both backends.
+SUPPORTED_GATES = frozenset(
+    (
+        "x",
+        "y",
+        "z",
+        "s",
+        "sdg",
+        "t",
+        "tdg",
+        "h",
+        "rx",
+        "ry",
+        "rz",
+        "swap",
+        "cx",
+        "cy",
+        "cz",
+        "cs",
+        "csdg",
+        "ch",
+        "crx",
+        "cry",
+        "crz",
+        "cswap",
+        "ccx",
+        "ccz",
+    )
+)
+
+_SQRT1_2 = 1 / np.sqrt(2)
+
+GATE_MATRICES = {
+    "x": np.array([[0, 1], [1, 0]], dtype=complex),
+    "y": np.array([[0, -1j], [1j, 0]], dtype=complex),
+    "z": np.array([[1, 0], [0, -1]], dtype=complex),
+    "s": np.array([[1, 0], [0, 1j]], dtype=complex),
+    "sdg": np.array([[1, 0], [0, -1j]], dtype=complex),
+    "t": np.array([[1, 0], [0, np.exp(1j * np.pi / 4)]], dtype=complex),
+    "tdg": np.array([[1, 0], [0, np.exp(-1j * np.pi / 4)]], dtype=complex),
+    "h": np.array([[_SQRT1_2, _SQRT1_2], [_SQRT1_2, -_SQRT1_2]], dtype=complex),
+}
+
+
+def gate_matrix(name, radians=0.0):
+    """
+    Get the 2x2 matrix of a single-qubit gate, using qiskit's conventions
+
+    Parameters:
+    name (string): gate name without control prefix, e.g. "h" or "rx"
+    radians (float): rotation angle for rx/ry/rz
+    """
+    if name == "rx":
+        cos, sin = np.cos(radians / 2), np.sin(radians / 2)
+        return np.array([[cos, -1j * sin], [-1j * sin, cos]], dtype=complex)
+    if name == "ry":
+        cos, sin = np.cos(radians / 2), np.sin(radians / 2)
+        return np.array([[cos, -sin], [sin, cos]], dtype=complex)
+    if name == "rz":
+        phase = np.exp(-0.5j * radians)
+        return np.array([[phase, 0], [0, np.conj(phase)]], dtype=complex)
+    return GATE_MATRICES[name]
+
+
+# pylint: disable=too-many-arguments
+def node_operation(wire_num, node_type, radians=0.0, ctrl_a=-1, ctrl_b=-1, swap=-1):
+    """
+    Translate a grid node into an operation, following the same rules as
+    CircuitGridModel.construct_circuit
+
+    Returns:
+        tuple: (name, radians, targets, controls), or None if the node does
+        not produce a gate
+    """
+    controls = tuple(ctrl for ctrl in (ctrl_a, ctrl_b) if ctrl != -1)
+    if swap != -1:
+        name = "swap"
+        targets = (wire_num, swap)
+    elif node_type in GATE_NAMES:
+        name = GATE_NAMES[node_type]
+        if radians != 0:
+            name = "r" + name
+        targets = (wire_num,)
+    else:
+        return None
+
+    if "c" * len(controls) + name not in SUPPORTED_GATES:
+        return None
+    return name, radians, targets, controls
+
+
+def column_operations(circuit_grid_model, column_num):
+    """
+    Get the operations of a circuit grid column, in the order they are
+    applied (top wire first)
+
+    Returns:
+        tuple: operations returned by node_operation, hashable so it can be
+        used as the cache key of the column
+    """
+    operations = []
+    column = zip(
+        circuit_grid_model.node_type[:, column_num].tolist(),
+        circuit_grid_model.radians[:, column_num].tolist(),
+        circuit_grid_model.ctrl_a[:, column_num].tolist(),
+        circuit_grid_model.ctrl_b[:, column_num].tolist(),
+        circuit_grid_model.swap[:, column_num].tolist(),
+    )
+    for wire_num, node in enumerate(column):
+        operation = node_operation(wire_num, *node)
+        if operation is not None:
+            operations.append(operation)
+    return tuple(operations)
+
+
+def apply_operation(state, operation, num_qubits):
+    """
+    Apply an operation in place on a statevector
+
+    The state is viewed as a rank-n tensor where qubit q is axis n - 1 - q
+    (qiskit's little-endian ordering). Control qubits are fixed to 1 by
+    indexing, so the kernel only touches the controlled subspace. Any
+    trailing dimensions of the state are carried along untouched.
+
+    Parameters:
+    state (numpy.ndarray): statevector of length 2**num_qubits, or an array
+        of shape (2**num_qubits, ...)
+    operation (tuple): operation returned by node_operation
+    num_qubits (integer): number of qubits
+    """
+    name, radians, targets, controls = operation
+    tensor = state.reshape((2,) * num_qubits + state.shape[1:])
+
+    index = [slice(None)] * tensor.ndim
+    for ctrl in controls:
+        index[num_qubits - 1 - ctrl] = 1
+    subspace = tensor[tuple(index)]
+
+    control_axes = [num_qubits - 1 - ctrl for ctrl in controls]
+    axes = []
+    for target in targets:
+        axis = num_qubits - 1 - target
+        axes.append(axis - sum(1 for ctrl_axis in control_axes if ctrl_axis < axis))
+
+    if name == "swap":
+        _swap_kernel(subspace, axes[0], axes[1])
+    else:
+        _single_qubit_kernel(subspace, gate_matrix(name, radians), axes[0])
+
+
+def _single_qubit_kernel(tensor, matrix, axis):
+    """
+    Apply a 2x2 matrix along one axis of a tensor, in place
+    """
+    index_0 = [slice(None)] * tensor.ndim
+    index_1 = [slice(None)] * tensor.ndim
+    index_0[axis] = 0
+    index_1[axis] = 1
+    index_0 = tuple(index_0)
+    index_1 = tuple(index_1)
+
+    if matrix[0, 1] == 0 and matrix[1, 0] == 0:
+        # diagonal gate, no mixing between the two halves
+        if matrix[0, 0] != 1:
+            tensor[index_0] *= matrix[0, 0]
+        tensor[index_1] *= matrix[1, 1]
+        return
+
+    amp_0 = tensor[index_0].copy()
+    amp_1 = tensor[index_1]
+    tensor[index_0] = matrix[0, 0] * amp_0 + matrix[0, 1] * amp_1
+    tensor[index_1] = matrix[1, 0] * amp_0 + matrix[1, 1] * amp_1
+
+
+def _swap_kernel(tensor, axis_a, axis_b):
+    """
+    Swap two axes of a tensor, in place
+    """
+    index_01 = [slice(None)] * tensor.ndim
+    index_10 = [slice(None)] * tensor.ndim
+    index_01[axis_a], index_01[axis_b] = 0, 1
+    index_10[axis_a], index_10[axis_b] = 1, 0
+    index_01 = tuple(index_01)
+    index_10 = tuple(index_10)
+
+    amp_01 = tensor[index_01].copy()
+    tensor[index_01] = tensor[index_10]
+    tensor[index_10] = amp_01
+
+
+class CompiledColumn(
+    namedtuple("CompiledColumn", ("operations", "num_qubits", "operator"))
+):
+    """
+    A circuit grid column compiled once for repeated application: a fused
+    dense operator for small grids, the list of gate kernels otherwise
+    (operator is None)
+    """
+
+    __slots__ = ()
+
+    def apply(self, state):
+        """
+        Apply the column in place on a statevector
+        """
+        if self.operator is not None:
+            state[...] = self.operator @ state
+        else:
+            for operation in self.operations:
+                apply_operation(state, operation, self.num_qubits)
+        return state
+
+
+def compile_column(operations, num_qubits, dtype=STATE_DTYPE):
+    """
+    Compile the gate operations of a column, fusing them into a single
+    operator for grids of up to FUSE_MAX_QUBITS qubits
+
+    Returns:
+        CompiledColumn: the compiled column
+    """
+    operator = None
+    if num_qubits <= FUSE_MAX_QUBITS:
+        operator = np.eye(2**num_qubits, dtype=complex)
+        for operation in operations:
+            apply_operation(operator, operation, num_qubits)
+        operator = operator.astype(dtype)
+    return CompiledColumn(operations, num_qubits, operator)
+
+
+class StatevectorSimulator:
+    """
+    Simulates a circuit grid by applying its gates directly on a
+    NumPy statevector
+    """
+
+    def __init__(
+        self, num_qubits, column_cache_size=COLUMN_CACHE_SIZE, dtype=STATE_DTYPE
+    ):
+        self.num_qubits = num_qubits
+        self.dtype = dtype
+        self.column_cache = LRUCache(column_cache_size)
+
+    def initial_state(self):
+        """
+        Get the |0...0> statevector
+        """
+        state = np.zeros(2**self.num_qubits, dtype=self.dtype)
+        state[0] = 1
+        return state
+
+    def apply_column(self, state, circuit_grid_model, column_num):
+        """
+        Apply all gates of a column in place on a statevector
+
+        Columns without gates are skipped, others are compiled once and
+        looked up by their content afterwards.
+        """
+        operations = column_operations(circuit_grid_model, column_num)
+        if not operations:
+            return state
+
+        compiled_column = self.column_cache.get(operations)
+        if compiled_column is None:
+            compiled_column = compile_column(operations, self.num_qubits, self.dtype)
+            self.column_cache.put(operations, compiled_column)
+        return compiled_column.apply(state)
+
+    def run(self, circuit_grid_model):
+        """
+        Simulate all columns of a circuit grid starting from |0...0>
+
+        Returns:
+            numpy.ndarray: statevector amplitudes
+        """
+        state = self.initial_state()
+        for column_num in range(circuit_grid_model.max_columns):
+            self.apply_column(state, circuit_grid_model, column_num)
+        return state
+
+
+def simulate(circuit_grid_model, backend=BACKEND_NUMPY):
+    """
+    Get the statevector of a circuit grid with the selected backend
+
+    Parameters:
+    circuit_grid_model (CircuitGridModel): grid to simulate
+    backend (string): BACKEND_NUMPY or BACKEND_QISKIT
+
+    Returns:
+        numpy.ndarray: statevector amplitudes
+    """
+    if backend == BACKEND_QISKIT:
+        # pylint: disable=import-outside-toplevel
+        from qiskit.quantum_info import Statevector
+
+        return np.asarray(Statevector(circuit_grid_model.construct_circuit()).data)
+    if backend == BACKEND_NUMPY:
+        return StatevectorSimulator(circuit_grid_model.max_wires).run(
+            circuit_grid_model
+        )
+    raise ValueError("Unknown simulator backend: " + str(backend))
@@ -0,0 +1,45 @@
+"""
+Logical resolution of the game
+
+The layout and every asset size derive from the logical resolution, see
+qpong.utils.parameters.Layout. main.py picks the resolution at startup and
+sets it on LAYOUT before building the game objects.
+"""
+
+DEFAULT_RESOLUTION = (1200, 750)
+
+# width / height the game layout is designed for
+ASPECT_RATIO = 1.6
+
+
+def parse_resolution(text):
+    """
+    Parse a resolution written as WIDTHxHEIGHT, e.g. "1920x1200"
+
+    Returns:
+        tuple: (width, height)
+    """
+    try:
+        width, height = (int(size) for size in text.lower().split("x"))
+    except ValueError:
+        raise ValueError("Resolution must be WIDTHxHEIGHT: " + str(text)) from None
+    if width <= 0 or height <= 0:
+        raise ValueError("Resolution must be positive: " + str(text))
+    return width, height
+
+
+def fit_resolution(display_size, aspect_ratio=ASPECT_RATIO):
+    """
+    Get the largest resolution with the game aspect ratio that fits in a
+    display
+
+    Parameters:
+    display_size (tuple): (width, height) of the display
+    aspect_ratio (float): width / height of the result
+    """
+    width, height = display_size
+    if width > height * aspect_ratio:
+        width = int(height * aspect_ratio)
+    else:
+        height = int(width / aspect_ratio)
+    return width, height
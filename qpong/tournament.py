@@ -0,0 +1,366 @@
+"""
+Tournament of headless matches between quantum player policies and the
+classical computer, run on all cores
+
+Installed as the qpong-tournament command. Every policy plays the same
+seeded matches at every difficulty; match seeds derive from a master seed,
+so a tournament is reproducible whatever the number of workers. Results are
+streamed from the workers and aggregated on the fly, so that memory stays
+flat however many matches are played.
+"""
+
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+import random
+import signal
+import sys
+import threading
+
+import numpy as np
+
+from qpong.model import circuit_node_types as node_types
+from qpong.model.circuit_grid_model import CircuitGridModel, CircuitGridNode
+from qpong.model.game_state import GameState
+from qpong.utils.parameters import (
+    CIRCUIT_DEPTH,
+    EASY,
+    EXPERT,
+    NORMAL,
+    QUANTUM_COMPUTER,
+    QUBIT_NUM,
+)
+
+DIFFICULTIES = {"easy": EASY, "normal": NORMAL, "expert": EXPERT}
+
+# steps after which a match is stopped without a winner
+MAX_MATCH_STEPS = 1000000
+
+MATCH_FIELDS = (
+    "policy",
+    "difficulty",
+    "match",
+    "winner",
+    "computer_score",
+    "quantum_score",
+    "steps",
+    "hits",
+    "measurements",
+)
+REPORT_FIELDS = (
+    "policy",
+    "difficulty",
+    "matches",
+    "unfinished",
+    "win_rate",
+    "rally_length",
+    "measurements_per_match",
+    "steps_per_match",
+)
+
+# running totals of each policy and difficulty
+_TOTAL_FIELDS = (
+    "matches",
+    "unfinished",
+    "wins",
+    "points",
+    "hits",
+    "measurements",
+    "steps",
+)
+
+
+def idle_policy(state, circuit_grid_model):  # pylint: disable=unused-argument
+    """
+    Never place a gate: the quantum paddle stays at the top
+    """
+
+
+def hadamard_policy(state, circuit_grid_model):
+    """
+    Place a Hadamard gate on every wire once: the quantum paddle lands on a
+    uniformly random row
+    """
+    if state.time == 0:
+        for wire in range(state.qubit_num):
+            circuit_grid_model.set_node(wire, 0, CircuitGridNode(node_types.H))
+
+
+def tracker_policy(state, circuit_grid_model):
+    """
+    Encode the row of the ball with X gates while it heads to the quantum
+    player: a classical strategy to compare the quantum ones against
+    """
+    ball = state.ball
+    if ball.xpos <= ball.previous_xpos:
+        return
+    num_rows = 2**state.qubit_num
+    row = int((ball.ypos + ball.height / 2) * num_rows / ball.screenheight)
+    row = min(max(row, 0), num_rows - 1)
+    for wire in range(state.qubit_num):
+        node_type = node_types.X if row >> wire & 1 else node_types.EMPTY
+        if circuit_grid_model.node_type[wire, 0] != node_type:
+            circuit_grid_model.set_node(wire, 0, CircuitGridNode(node_type))
+
+
+POLICIES = {
+    "idle": idle_policy,
+    "hadamard": hadamard_policy,
+    "tracker": tracker_policy,
+}
+
+
+def match_seed(master_seed, match_num):
+    """
+    Get the seed of a match, the same for every policy and difficulty so
+    that they are compared on the same serves and paddle moves
+    """
+    return int(np.random.SeedSequence([master_seed, match_num]).generate_state(1)[0])
+
+
+def play_match(task):
+    """
+    Play one headless match
+
+    Parameters:
+    task (tuple): (policy name, difficulty name, match number, seed)
+
+    Returns:
+        dict: match result with the keys of MATCH_FIELDS
+    """
+    policy_name, difficulty, match_num, seed = task
+    policy = POLICIES[policy_name]
+    circuit_grid_model = CircuitGridModel(QUBIT_NUM, CIRCUIT_DEPTH, seed=seed)
+    state = GameState(circuit_grid_model, QUBIT_NUM, rng=random.Random(seed))
+    state.ball.initial_speed_factor = DIFFICULTIES[difficulty]
+    state.ball.reset()
+
+    steps = 0
+    while state.winner() is None and steps < MAX_MATCH_STEPS:
+        policy(state, circuit_grid_model)
+        state.step()
+        steps += 1
+
+    winner = state.winner()
+    score = state.ball.score
+    return {
+        "policy": policy_name,
+        "difficulty": difficulty,
+        "match": match_num,
+        "winner": "" if winner is None else winner,
+        "computer_score": score.computer,
+        "quantum_score": score.player,
+        "steps": steps,
+        "hits": state.ball.hits,
+        "measurements": state.measurements,
+    }
+
+
+def match_tasks(policies, difficulties, num_matches, master_seed):
+    """
+    Generate the tasks of play_match, match by match
+    """
+    for match_num in range(num_matches):
+        seed = match_seed(master_seed, match_num)
+        for policy_name in policies:
+            for difficulty in difficulties:
+                yield policy_name, difficulty, match_num, seed
+
+
+class Report:
+    """
+    Running totals of the match results of each policy and difficulty
+    """
+
+    def __init__(self):
+        self.totals = {}
+
+    def add(self, result):
+        """
+        Add a match result
+        """
+        key = result["policy"], result["difficulty"]
+        totals = self.totals.setdefault(key, dict.fromkeys(_TOTAL_FIELDS, 0))
+        totals["matches"] += 1
+        totals["unfinished"] += result["winner"] == ""
+        totals["wins"] += result["winner"] == QUANTUM_COMPUTER
+        totals["points"] += result["computer_score"] + result["quantum_score"]
+        totals["hits"] += result["hits"]
+        totals["measurements"] += result["measurements"]
+        totals["steps"] += result["steps"]
+
+    def rows(self):
+        """
+        Get one row per policy and difficulty, with the keys of
+        REPORT_FIELDS
+        """
+        for (policy_name, difficulty), totals in self.totals.items():
+            matches = totals["matches"]
+            yield {
+                "policy": policy_name,
+                "difficulty": difficulty,
+                "matches": matches,
+                "unfinished": totals["unfinished"],
+                "win_rate": totals["wins"] / matches,
+                "rally_length": totals["hits"] / max(totals["points"], 1),
+                "measurements_per_match": totals["measurements"] / matches,
+                "steps_per_match": totals["steps"] / matches,
+            }
+
+    def write(self, path):
+        """
+        Write the report as JSON if the path ends with .json, otherwise as
+        CSV
+        """
+        rows = list(self.rows())
+        with open(path, "w", newline="", encoding="utf-8") as file:
+            if path.endswith(".json"):
+                json.dump(rows, file, indent=1)
+            else:
+                writer = csv.DictWriter(file, REPORT_FIELDS)
+                writer.writeheader()
+                writer.writerows(rows)
+
+
+def init_worker():
+    """
+    Restore the default SIGTERM action in a worker process
+
+    A worker forked after pygame initialized SDL inherits the SDL signal
+    handlers, which turn SIGTERM into a quit event nobody reads, so that
+    the pool could not terminate its workers.
+    """
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
+
+def run_tournament(tasks, workers=None, chunksize=16):
+    """
+    Play matches in a process pool and iterate over their results, in task
+    order
+
+    Tasks are drawn lazily by a single imap over the pool, and at most a
+    bounded number of them are in flight, so that neither pending tasks nor
+    results pile up in memory.
+
+    Parameters:
+    tasks (iterable): tasks of play_match
+    workers (integer): worker processes, all cores by default, 0 to play
+        in this process
+    chunksize (integer): tasks sent to a worker at once
+    """
+    if workers == 0:
+        yield from map(play_match, tasks)
+        return
+
+    if workers is None:
+        workers = os.cpu_count()
+    # released whenever a result is handed out, acquired by the task
+    # handler thread of the pool before it takes the next task
+    in_flight = threading.Semaphore(chunksize * workers * 4)
+    stopped = False
+
+    def throttled_tasks():
+        for task in tasks:
+            in_flight.acquire()  # pylint: disable=consider-using-with
+            if stopped:
+                return
+            yield task
+
+    with multiprocessing.Pool(workers, init_worker) as pool:
+        try:
+            for result in pool.imap(play_match, throttled_tasks(), chunksize):
+                in_flight.release()
+                yield result
+        finally:
+            # unblock the task handler so that the pool can shut down when
+            # the results are not all consumed
+            stopped = True
+            in_flight.release()
+
+
+def parse_args(argv=None):
+    """
+    Parse command line options
+    """
+    parser = argparse.ArgumentParser(
+        prog="qpong-tournament",
+        description="Play seeded headless QPong matches on all cores",
+    )
+    parser.add_argument(
+        "--matches", type=int, default=100, help="matches per policy and difficulty"
+    )
+    parser.add_argument(
+        "--policies",
+        default=",".join(POLICIES),
+        help="comma-separated quantum player policies among " + ", ".join(POLICIES),
+    )
+    parser.add_argument(
+        "--difficulties",
+        default=",".join(DIFFICULTIES),
+        help="comma-separated difficulties among " + ", ".join(DIFFICULTIES),
+    )
+    parser.add_argument("--seed", type=int, default=0, help="master seed")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="worker processes, all cores by default, 0 to play in one process",
+    )
+    parser.add_argument(
+        "--report",
+        default="tournament.json",
+        help="report per policy and difficulty, as JSON or CSV by extension",
+    )
+    parser.add_argument(
+        "--results", help="CSV file the result of every match is streamed to"
+    )
+    args = parser.parse_args(argv)
+
+    args.policies = args.policies.split(",")
+    args.difficulties = args.difficulties.split(",")
+    for name in args.policies:
+        if name not in POLICIES:
+            parser.error("unknown policy: " + name)
+    for name in args.difficulties:
+        if name not in DIFFICULTIES:
+            parser.error("unknown difficulty: " + name)
+    return args
+
+
+def main(argv=None):
+    """
+    Run a tournament and write its report
+    """
+    args = parse_args(argv)
+    tasks = match_tasks(args.policies, args.difficulties, args.matches, args.seed)
+    report = Report()
+
+    results_file = writer = None
+    if args.results:
+        # pylint: disable=consider-using-with
+        results_file = open(args.results, "w", newline="", encoding="utf-8")
+        writer = csv.DictWriter(results_file, MATCH_FIELDS)
+        writer.writeheader()
+    try:
+        for result in run_tournament(tasks, args.workers):
+            report.add(result)
+            if writer is not None:
+                writer.writerow(result)
+    finally:
+        if results_file is not None:
+            results_file.close()
+
+    report.write(args.report)
+    for row in report.rows():
+        print(
+            "{policy:10} {difficulty:7} {matches:8} matches  win rate {win_rate:.3f}  "
+            "rally {rally_length:.2f}  measurements {measurements_per_match:.1f}".format(
+                **row
+            )
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
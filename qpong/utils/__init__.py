@@ -2,17 +2,31 @@
 Utilities for loading resources and quantum states
 """
 
-from .ball import Ball
-from .input import Input
-from .level import Level
-from .scene import Scene
-from .score import Score
-from .sound import Sound
-from .font import Font
+from qpong.lazy import lazy_attributes
 
 from .colors import *
 from .gamepad import *
 from .parameters import *
 from .navigation import *
-from .resources import *
 from .states import *
+
+# modules that depend on pygame are only imported when used
+_LAZY_ATTRIBUTES = {
+    "Ball": ".ball",
+    "Input": ".input",
+    "Level": ".level",
+    "Scene": ".scene",
+    "Score": ".score",
+    "Sound": ".sound",
+    "Font": ".font",
+    "load_image": ".resources",
+    "load_sound": ".resources",
+    "load_font": ".resources",
+    "main_dir": ".resources",
+    "data_dir": ".resources",
+}
+
+__getattr__, __dir__ = lazy_attributes(__name__, _LAZY_ATTRIBUTES)
+__all__ = [
+    name for name in dir() if not name.startswith("_") and name != "lazy_attributes"
+] + list(_LAZY_ATTRIBUTES)
@@ -2,190 +2,78 @@
 A QPong ball
 """
 
-import math
-import random
-
 import pygame
 
+from qpong.model.game_state import BallState
 from qpong.utils.colors import WHITE
-from qpong.utils.parameters import (
-    WIDTH_UNIT,
-    WINDOW_HEIGHT,
-    WINDOW_WIDTH,
-    LEFT,
-    RIGHT,
-    NOTHING,
-    NO,
-    YES,
-    MEASURE_LEFT,
-    MEASURE_RIGHT,
-)
-from qpong.utils.score import Score
+from qpong.utils.parameters import SIMULATION_RATE
 from qpong.utils.sound import Sound
 from qpong.utils.resources import load_image
 
 
-class Ball(pygame.sprite.Sprite):
+class Ball(BallState, pygame.sprite.DirtySprite):
     """
-    A QPong ball
+    A QPong ball: the ball state drawn as a sprite, with sounds
     """
 
-    # pylint: disable=too-many-instance-attributes
     def __init__(self):
-        super().__init__()
-
-        # get ball screen dimensions
-        self.screenheight = round(WINDOW_HEIGHT * 0.7)
-        self.screenwidth = WINDOW_WIDTH
-        self.width_unit = WIDTH_UNIT
-
-        self.left_edge = self.width_unit
-        self.right_edge = self.screenwidth - self.left_edge
-
-        self.top_edge = self.width_unit * 0
-        self.bottom_edge = self.screenheight - self.top_edge
-
-        # define the ball sizes
-        # self.height = self.width_unit
-        # self.width = self.width_unit
-        self.height = 32
-        self.width = 32
+        pygame.sprite.DirtySprite.__init__(self)
 
         # create a pygame Surface with ball size
         # self.image = pygame.Surface([self.height, self.width])
         self.image, self.rect = load_image("player_images/Tilas-Kabengele.png", -1)
-        
 
         # self.image.fill(WHITE)
 
-        # self.rect = self.image.get_rect()
-
-        self.xpos = 0
-        self.ypos = 0
-        self.speed = 0
-        self.initial_speed_factor = 0.8
-        self.direction = 0
-
-        # initialize ball action type, measure and bounce flags
-        self.ball_action = NOTHING
-        self.measure_flag = NO
-
-        # initialize ball reset on the left
-        self.reset_position = LEFT
-        self.reset()
+        # define the ball sizes, the image is scaled with the resolution
+        BallState.__init__(self, self.rect.width, self.rect.height)
 
         self.sound = Sound()
-        self.score = Score()
 
-    def update(self):
-        """
-        Update ball
+    # pylint: disable=arguments-differ
+    def update(self, time_step=1 / SIMULATION_RATE, paddles=()):
         """
-        radians = math.radians(self.direction)
+        Update ball and its sprite
 
-        self.xpos += self.speed * math.sin(radians)
-        self.ypos -= self.speed * math.cos(radians)
+        Parameters:
+        time_step (float): duration of the simulation step, in seconds
+        paddles (iterable): rectangles the ball bounces off
+        """
+        BallState.update(self, time_step, paddles)
 
         # Update ball position
         self.rect.x = self.xpos
         self.rect.y = self.ypos
+        self.dirty = 1
 
-        if self.ypos <= self.top_edge:
-            self.direction = (180 - self.direction) % 360
-            self.sound.edge_sound.play()
-        if self.ypos > self.bottom_edge - 1 * self.height:
-            self.direction = (180 - self.direction) % 360
-            self.sound.edge_sound.play()
-
-    def reset(self):
+    def interpolate(self, alpha):
         """
-        Reset ball position and speed to initial settings.
+        Place the ball between its previous and current simulated positions
+
+        Parameters:
+        alpha (float): 0 for the previous position, 1 for the current one
         """
-        self.ypos = self.screenheight / 2
-        self.speed = self.width_unit * self.initial_speed_factor
-
-        # alternate reset at left and right
-        if self.reset_position == LEFT:
-            self.xpos = self.left_edge + self.width_unit * 15
-            self.direction = random.randrange(30, 120)
-            self.reset_position = RIGHT
-        else:
-            self.xpos = self.right_edge - self.width_unit * 15
-            self.direction = random.randrange(-120, -30)
-            self.reset_position = LEFT
+        self.rect.x = self.previous_xpos + alpha * (self.xpos - self.previous_xpos)
+        self.rect.y = self.previous_ypos + alpha * (self.ypos - self.previous_ypos)
+        self.dirty = 1
 
     def bounce_edge(self):
         """
-        Bounce ball off a screen edge
+        Bounce ball off a paddle
         """
-        self.direction = (360 - self.direction) % 360
-        self.speed *= 1.1
+        super().bounce_edge()
         self.sound.bounce_sound.play()
 
-    def get_xpos(self):
-        """
-        Get ball's x position
-        """
-        xpos = self.xpos
-        return xpos
-
-    def get_ypos(self):
+    def bounce_wall(self):
         """
-        Get ball's y position
+        Bounce ball off the top or bottom edge
         """
-        ypos = self.ypos
-        return ypos
+        super().bounce_wall()
+        self.sound.edge_sound.play()
 
-    # 1 = comp, 2 = player, none = 0
-    def action(self):
-        """
-        Decide ball action based on the ball's position
-        """
-        if self.xpos < self.left_edge:
-            # reset the ball when it reaches beyond left edge
-            self.reset()
-            self.sound.lost_sound.play(3)
-            self.score.update(1)
-
-        elif (
-            self.left_edge + 10 * self.width_unit
-            <= self.xpos
-            < self.left_edge + 12 * self.width_unit
-        ):
-            # measure the ball when it reaches the left measurement zone
-            if self.measure_flag == NO:
-                self.ball_action = MEASURE_LEFT
-                self.measure_flag = YES
-            else:
-                self.ball_action = NOTHING
-
-        elif (
-            self.right_edge - 12 * self.width_unit
-            <= self.xpos
-            < self.right_edge - 10 * self.width_unit
-        ):
-            # measure the ball when it reaches the right measurement zone
-            if self.measure_flag == NO:
-                # do measurement if not yet done
-                self.ball_action = MEASURE_RIGHT
-                self.measure_flag = YES
-            else:
-                # do nothing if measurement was done already
-                self.ball_action = NOTHING
-
-        elif self.xpos > self.right_edge:
-            # reset the ball when it reaches beyond right edge
-            self.reset()
-            self.sound.lost_sound.play(3)
-            self.score.update(0)
-
-        else:
-            # reset flags and do nothing when the ball is outside measurement and bounce zone
-            self.ball_action = NOTHING
-            self.measure_flag = NO
-
-    def check_score(self, player):
+    def score_point(self, player):
         """
-        Check a player score
+        Give a point to a player and serve the ball again
         """
-        return self.score.get_score(player)
+        super().score_point(player)
+        self.sound.lost_sound.play(3)
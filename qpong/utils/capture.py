@@ -0,0 +1,61 @@
+"""
+Frame capture to NumPy arrays or PNG files
+"""
+
+import os
+
+import pygame
+
+
+class FrameCapture:
+    """
+    Captures frames of a surface every Nth frame or on demand, either kept
+    in memory as NumPy arrays or written as a numbered PNG sequence
+    """
+
+    def __init__(self, screen, every=0, directory=None):
+        """
+        Parameters:
+        screen (pygame.Surface): surface to capture
+        every (integer): capture every Nth frame, 0 to capture on demand only
+        directory (string): directory of the PNG files, created on the
+            first capture, None to keep arrays
+        """
+        self.screen = screen
+        self.every = every
+        self.directory = directory
+        self.frames = []
+        self.num_captured = 0
+
+    def capture(self, frame_num=None):
+        """
+        Capture the current content of the surface
+
+        Parameters:
+        frame_num (integer): frame number used in the PNG file name,
+            defaults to the number of frames captured so far
+
+        Returns:
+            numpy.ndarray: RGB pixels of shape (height, width, 3), or None
+            when writing PNG files
+        """
+        if frame_num is None:
+            frame_num = self.num_captured
+        self.num_captured += 1
+        if self.directory is not None:
+            os.makedirs(self.directory, exist_ok=True)
+            pygame.image.save(
+                self.screen,
+                os.path.join(self.directory, "frame_{:06d}.png".format(frame_num)),
+            )
+            return None
+        frame = pygame.surfarray.array3d(self.screen).swapaxes(0, 1)
+        self.frames.append(frame)
+        return frame
+
+    def end_frame(self, frame_num):
+        """
+        Capture the frame if it is one of every Nth frames
+        """
+        if self.every > 0 and frame_num % self.every == 0:
+            self.capture(frame_num)
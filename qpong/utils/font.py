@@ -2,7 +2,7 @@
 Various fonts used through out the game
 """
 
-from qpong.utils.parameters import WIDTH_UNIT
+from qpong.utils.parameters import LAYOUT
 
 from qpong.utils.resources import load_font
 
@@ -13,9 +13,10 @@ class Font:
     """
 
     def __init__(self):
-        self.gameover_font = load_font("bit5x3.ttf", 10 * WIDTH_UNIT)
-        self.credit_font = load_font("bit5x3.ttf", 2 * WIDTH_UNIT)
-        self.replay_font = load_font("bit5x3.ttf", 5 * WIDTH_UNIT)
-        self.score_font = load_font("bit5x3.ttf", 12 * WIDTH_UNIT)
-        self.vector_font = load_font("bit5x3.ttf", 3 * WIDTH_UNIT)
-        self.player_font = load_font("bit5x3.ttf", 3 * WIDTH_UNIT)
+        width_unit = LAYOUT.width_unit
+        self.gameover_font = load_font("bit5x3.ttf", 10 * width_unit)
+        self.credit_font = load_font("bit5x3.ttf", 2 * width_unit)
+        self.replay_font = load_font("bit5x3.ttf", 5 * width_unit)
+        self.score_font = load_font("bit5x3.ttf", 12 * width_unit)
+        self.vector_font = load_font("bit5x3.ttf", 3 * width_unit)
+        self.player_font = load_font("bit5x3.ttf", 3 * width_unit)
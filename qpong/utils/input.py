@@ -8,6 +8,7 @@ import pygame
 
 from qpong.utils import gamepad
 from qpong.utils.navigation import MOVE_UP, MOVE_DOWN, MOVE_LEFT, MOVE_RIGHT
+from qpong.utils.profiler import PROFILER
 
 
 class Input:
@@ -32,7 +33,18 @@ class Input:
         self.gamepad_pressed_timer = 0
         self.gamepad_last_update = pygame.time.get_ticks()
 
-    def handle_input(self, level, screen, scene):
+        # input events only change the circuit and mark the paddle as
+        # stale, update_frame then simulates it once per frame
+        self.paddle_stale = False
+        self.paddle_update_requests = 0
+        self.paddle_updates = 0
+
+        # set when the player asks for a screenshot or toggles the profiler
+        # overlay, cleared by the game loop
+        self.capture_requested = False
+        self.profiler_toggle_requested = False
+
+    def handle_input(self, level):
         # pylint: disable=too-many-branches disable=too-many-statements
         """
         Handle quantum player input
@@ -61,19 +73,13 @@ class Input:
                 self.gamepad_pressed_timer -= self.gamepad_repeat_delay
             if gamepad_move:
                 if joystick_hat == (-1, 0):
-                    self.move_update_circuit_grid_display(
-                        screen, circuit_grid, MOVE_LEFT
-                    )
+                    self.move_update_circuit_grid_display(circuit_grid, MOVE_LEFT)
                 elif joystick_hat == (1, 0):
-                    self.move_update_circuit_grid_display(
-                        screen, circuit_grid, MOVE_RIGHT
-                    )
+                    self.move_update_circuit_grid_display(circuit_grid, MOVE_RIGHT)
                 elif joystick_hat == (0, 1):
-                    self.move_update_circuit_grid_display(screen, circuit_grid, MOVE_UP)
+                    self.move_update_circuit_grid_display(circuit_grid, MOVE_UP)
                 elif joystick_hat == (0, -1):
-                    self.move_update_circuit_grid_display(
-                        screen, circuit_grid, MOVE_DOWN
-                    )
+                    self.move_update_circuit_grid_display(circuit_grid, MOVE_DOWN)
             self.gamepad_last_update = pygame.time.get_ticks()
 
             # Check left thumbstick position
@@ -90,42 +96,30 @@ class Input:
                 if event.button == gamepad.BTN_A:
                     # Place X gate
                     circuit_grid.handle_input_x()
-                    circuit_grid.draw(screen)
-                    self.update_paddle(level, screen, scene)
-                    pygame.display.flip()
+                    self.request_paddle_update()
                 elif event.button == gamepad.BTN_X:
                     # Place Y gate
                     circuit_grid.handle_input_y()
-                    circuit_grid.draw(screen)
-                    self.update_paddle(level, screen, scene)
-                    pygame.display.flip()
+                    self.request_paddle_update()
                 elif event.button == gamepad.BTN_B:
                     # Place Z gate
                     circuit_grid.handle_input_z()
-                    circuit_grid.draw(screen)
-                    self.update_paddle(level, screen, scene)
-                    pygame.display.flip()
+                    self.request_paddle_update()
                 elif event.button == gamepad.BTN_Y:
                     # Place Hadamard gate
                     circuit_grid.handle_input_h()
-                    circuit_grid.draw(screen)
-                    self.update_paddle(level, screen, scene)
-                    pygame.display.flip()
+                    self.request_paddle_update()
                 elif event.button == gamepad.BTN_RIGHT_TRIGGER:
                     # Delete gate
                     circuit_grid.handle_input_delete()
-                    circuit_grid.draw(screen)
-                    self.update_paddle(level, screen, scene)
-                    pygame.display.flip()
+                    self.request_paddle_update()
                 elif event.button == gamepad.BTN_RIGHT_THUMB:
                     # Add or remove a control
                     circuit_grid.handle_input_ctrl()
-                    circuit_grid.draw(screen)
-                    self.update_paddle(level, screen, scene)
-                    pygame.display.flip()
+                    self.request_paddle_update()
                 elif event.button == gamepad.BTN_LEFT_BUMPER:
                     # Update visualizations
-                    self.update_paddle(level, screen, scene)
+                    self.request_paddle_update()
 
             elif event.type == pygame.JOYAXISMOTION:
                 # print("event: ", event)
@@ -134,33 +128,25 @@ class Input:
                     and self.joystick.get_axis(gamepad.AXIS_RIGHT_THUMB_X) >= 0.95
                 ):
                     circuit_grid.handle_input_rotate(np.pi / 8)
-                    circuit_grid.draw(screen)
-                    self.update_paddle(level, screen, scene)
-                    pygame.display.flip()
+                    self.request_paddle_update()
                 if (
                     event.axis == gamepad.AXIS_RIGHT_THUMB_X
                     and self.joystick.get_axis(gamepad.AXIS_RIGHT_THUMB_X) <= -0.95
                 ):
                     circuit_grid.handle_input_rotate(-np.pi / 8)
-                    circuit_grid.draw(screen)
-                    self.update_paddle(level, screen, scene)
-                    pygame.display.flip()
+                    self.request_paddle_update()
                 if (
                     event.axis == gamepad.AXIS_RIGHT_THUMB_Y
                     and self.joystick.get_axis(gamepad.AXIS_RIGHT_THUMB_Y) <= -0.95
                 ):
                     circuit_grid.handle_input_move_ctrl(MOVE_UP)
-                    circuit_grid.draw(screen)
-                    self.update_paddle(level, screen, scene)
-                    pygame.display.flip()
+                    self.request_paddle_update()
                 if (
                     event.axis == gamepad.AXIS_RIGHT_THUMB_Y
                     and self.joystick.get_axis(gamepad.AXIS_RIGHT_THUMB_Y) >= 0.95
                 ):
                     circuit_grid.handle_input_move_ctrl(MOVE_DOWN)
-                    circuit_grid.draw(screen)
-                    self.update_paddle(level, screen, scene)
-                    pygame.display.flip()
+                    self.request_paddle_update()
 
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
@@ -169,83 +155,89 @@ class Input:
                 elif event.key == pygame.K_a:
                     #move selector left
                     circuit_grid.move_to_adjacent_node(MOVE_LEFT)
-                    circuit_grid.draw(screen)
-                    pygame.display.flip()
                 elif event.key == pygame.K_d:
                     #move selector right
                     circuit_grid.move_to_adjacent_node(MOVE_RIGHT)
-                    circuit_grid.draw(screen)
-                    pygame.display.flip()
                 elif event.key == pygame.K_w:
                     #move selector up
                     circuit_grid.move_to_adjacent_node(MOVE_UP)
-                    circuit_grid.draw(screen)
-                    pygame.display.flip()
                 elif event.key == pygame.K_s:
                     #move selector down
                     circuit_grid.move_to_adjacent_node(MOVE_DOWN)
-                    circuit_grid.draw(screen)
-                    pygame.display.flip()
                 elif event.key == pygame.K_x:
                     #place x gate
                     circuit_grid.handle_input_x()
-                    circuit_grid.draw(screen)
-                    self.update_paddle(level, screen, scene)
-                    pygame.display.flip()
+                    self.request_paddle_update()
                 elif event.key == pygame.K_z:
                     #place z gate
                     circuit_grid.handle_input_z()
-                    circuit_grid.draw(screen)
-                    self.update_paddle(level, screen, scene)
-                    pygame.display.flip()
+                    self.request_paddle_update()
                 elif event.key == pygame.K_h:
                     #place hadamard gate
                     circuit_grid.handle_input_h()
-                    circuit_grid.draw(screen)
-                    self.update_paddle(level, screen, scene)
-                    pygame.display.flip()
+                    self.request_paddle_update()
                 elif event.key == pygame.K_SPACE:
                     #remove gate
                     circuit_grid.handle_input_delete()
-                    circuit_grid.draw(screen)
-                    self.update_paddle(level, screen, scene)
-                    pygame.display.flip()
+                    self.request_paddle_update()
                 elif event.key == pygame.K_c:
                     # Add or remove a control gate
                     circuit_grid.handle_input_ctrl()
-                    circuit_grid.draw(screen)
-                    self.update_paddle(level, screen, scene)
-                    pygame.display.flip()
+                    self.request_paddle_update()
                 # elif event.key == pygame.K_UP:
                 #     # Move a control qubit up
                 #     circuit_grid.handle_input_move_ctrl(MOVE_UP)
-                #     circuit_grid.draw(screen)
-                #     self.update_paddle(level, screen, scene)
-                #     pygame.display.flip()
+                #     self.request_paddle_update()
                 # elif event.key == pygame.K_DOWN:
                 #     # Move a control qubit down
                 #     circuit_grid.handle_input_move_ctrl(MOVE_DOWN)
-                #     circuit_grid.draw(screen)
-                #     self.update_paddle(level, screen, scene)
-                #     pygame.display.flip()
+                #     self.request_paddle_update()
                 elif event.key == pygame.K_LEFT:
                     # Rotate a gate left
                     circuit_grid.handle_input_rotate(-np.pi / 8)
-                    circuit_grid.draw(screen)
-                    self.update_paddle(level, screen, scene)
-                    pygame.display.flip()
+                    self.request_paddle_update()
                 elif event.key == pygame.K_RIGHT:
                     # Rotate a gate right
                     circuit_grid.handle_input_rotate(np.pi / 8)
-                    circuit_grid.draw(screen)
-                    self.update_paddle(level, screen, scene)
-                    pygame.display.flip()
+                    self.request_paddle_update()
                 elif event.key == pygame.K_TAB:
                     # Update visualizations
-                    self.update_paddle(level, screen, scene)
+                    self.request_paddle_update()
+                elif event.key == pygame.K_F3:
+                    # Show or hide the frame time profiler
+                    self.profiler_toggle_requested = True
+                elif event.key == pygame.K_F12:
+                    # Capture the screen
+                    self.capture_requested = True
+
+    def request_paddle_update(self):
+        """
+        Mark the state vector paddle as stale after a circuit change, it is
+        recomputed once at the end of the frame by update_frame
+        """
+        self.paddle_update_requests += 1
+        self.paddle_stale = True
+
+    def update_frame(self, level, scene):
+        """
+        Run the work requested by the input events of a frame, at most
+        once per frame however many events requested it
+        """
+        if self.paddle_stale:
+            self.update_paddle(level, scene)
+            self.paddle_updates += 1
+            self.paddle_stale = False
+
+    @property
+    def coalesced_paddle_updates(self):
+        """
+        Number of paddle update requests that were served by another
+        request of the same frame
+        """
+        return self.paddle_update_requests - self.paddle_updates - self.paddle_stale
 
     @staticmethod
-    def update_paddle(level, screen, scene):
+    def update_paddle(level, scene):
         """
         Update state vector paddle
         """
@@ -253,20 +245,18 @@ class Input:
 
         circuit_grid_model = level.circuit_grid_model
         right_statevector = level.right_statevector
-        circuit_grid = level.circuit_grid
         statevector_grid = level.statevector_grid
 
-        circuit = circuit_grid_model.construct_circuit()
-        statevector_grid.paddle_before_measurement(circuit, scene.qubit_num)
-        right_statevector.arrange()
-        circuit_grid.draw(screen)
-        pygame.display.flip()
+        with PROFILER.stage("simulate"):
+            statevector_grid.paddle_before_measurement(
+                circuit_grid_model, scene.qubit_num
+            )
+        with PROFILER.stage("arrange"):
+            right_statevector.arrange()
 
     @staticmethod
-    def move_update_circuit_grid_display(screen, circuit_grid, direction):
+    def move_update_circuit_grid_display(circuit_grid, direction):
         """
         Update circuit grid after move
         """
         circuit_grid.move_to_adjacent_node(direction)
-        circuit_grid.draw(screen)
-        pygame.display.flip()
@@ -8,8 +8,15 @@ from qpong.model.circuit_grid_model import CircuitGridModel
 from qpong.containers.vbox import VBox
 from qpong.viz.statevector_grid import StatevectorGrid
 from qpong.controls.circuit_grid import CircuitGrid
+from qpong.utils.states import MAX_NUM_QUBITS
 
-from qpong.utils.parameters import WIDTH_UNIT, CIRCUIT_DEPTH
+from qpong.utils.parameters import (
+    LAYOUT,
+    QUBIT_NUM,
+    CIRCUIT_DEPTH,
+    SIMULATOR_BACKEND,
+    MEASUREMENT_SEED,
+)
 
 
 class Level:
@@ -18,11 +25,10 @@ class Level:
     """
 
     def __init__(self):
-        self.level = 3  # game level
+        self.level = QUBIT_NUM  # game level, the number of qubits
         self.win = False  # flag for winning the game
-        self.left_paddle = pygame.sprite.Sprite()
-        self.right_paddle = pygame.sprite.Sprite()
-        self.circuit = None
+        self.left_paddle = pygame.sprite.DirtySprite()
+        self.right_paddle = pygame.sprite.DirtySprite()
         self.circuit_grid = None
         self.circuit_grid_model = None
         self.statevector_grid = None
@@ -32,33 +38,43 @@ class Level:
         """
         Setup a level with a certain level number
         """
-        scene.qubit_num = self.level
-        self.circuit_grid_model = CircuitGridModel(scene.qubit_num, CIRCUIT_DEPTH)
+        scene.qubit_num = min(self.level, MAX_NUM_QUBITS)
+        self.circuit_grid_model = CircuitGridModel(
+            scene.qubit_num, CIRCUIT_DEPTH, SIMULATOR_BACKEND, MEASUREMENT_SEED
+        )
 
-        self.circuit = self.circuit_grid_model.construct_circuit()
-        self.statevector_grid = StatevectorGrid(self.circuit, scene.qubit_num)
+        self.statevector_grid = StatevectorGrid(
+            self.circuit_grid_model, scene.qubit_num
+        )
         self.right_statevector = VBox(
-            WIDTH_UNIT * 90, WIDTH_UNIT * 0, self.statevector_grid
+            LAYOUT.statevector_x, LAYOUT.width_unit * 0, self.statevector_grid
         )
         self.circuit_grid = CircuitGrid(0, ball.screenheight, self.circuit_grid_model)
 
         # computer paddle
 
         self.left_paddle.image = pygame.Surface(
-            [WIDTH_UNIT, int(round(ball.screenheight / 2**scene.qubit_num))]
+            [
+                LAYOUT.width_unit,
+                max(1, int(round(ball.screenheight / 2**scene.qubit_num))),
+            ]
         )
         self.left_paddle.image.fill((255, 255, 255))
         self.left_paddle.image.set_alpha(255)
         self.left_paddle.rect = self.left_paddle.image.get_rect()
-        self.left_paddle.rect.x = 9 * WIDTH_UNIT
+        self.left_paddle.rect.x = LAYOUT.computer_paddle_x
 
         # player paddle for detection of collision. It is invisible on the screen
 
         self.right_paddle.image = pygame.Surface(
-            [WIDTH_UNIT, int(round(ball.screenheight / 2**scene.qubit_num))]
+            [
+                LAYOUT.width_unit,
+                max(1, int(round(ball.screenheight / 2**scene.qubit_num))),
+            ]
         )
         self.right_paddle.image.fill((255, 255, 255))
         self.right_paddle.image.set_alpha(0)
+        self.right_paddle.visible = 0
         self.right_paddle.rect = self.right_paddle.image.get_rect()
         self.right_paddle.rect.x = self.right_statevector.xpos
 
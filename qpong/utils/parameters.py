@@ -1,33 +1,101 @@
 """
 Global constants
 """
+from qpong.resolution import DEFAULT_RESOLUTION
+
 # Define global parameters
 
-# For main.py
 
-# For 15-inch MacBook Pro
-# WINDOW_WIDTH=2880
-# WINDOW_HEIGHT=1800
+class Layout:  # pylint: disable=too-few-public-methods
+    """
+    Sizes of the game, which all derive from the logical resolution
+
+    The game objects read them from LAYOUT when they are built, so the
+    resolution must be set before, but the game modules may be imported at
+    any time.
+    """
+
+    # pylint: disable=too-many-instance-attributes
+    def __init__(self, resolution=DEFAULT_RESOLUTION):
+        self.set_resolution(resolution)
+
+    def set_resolution(self, resolution):
+        """
+        Derive every size from a logical resolution
+
+        Parameters:
+        resolution (tuple): (width, height)
+        """
+        self.window_width, self.window_height = resolution
+        self.window_size = self.window_width, self.window_height
+        self.width_unit = round(self.window_width / 100)
+
+        # images are drawn for a width unit of 13 pixels
+        self.image_scale = self.width_unit / 13
+
+        # size of the ball image (32 pixels), scaled like all images
+        self.ball_size = round(self.image_scale * 32)
+
+        # left side of the computer paddle and of the state vector (quantum
+        # paddle)
+        self.computer_paddle_x = 9 * self.width_unit
+        self.statevector_x = 90 * self.width_unit
 
-# For 13-inch MacBook Pro
-# WINDOW_WIDTH=2560
-# WINDOW_HEIGHT=1600
+        # largest random offset of the computer paddle from the ball
+        self.computer_jitter = 4 * self.width_unit
 
-# For lower resolution screen
-WINDOW_WIDTH = 1200
-WINDOW_HEIGHT = 750
+        # circuit grid tiles
+        self.grid_width = self.width_unit * 4.96
+        self.grid_height = self.grid_width
+        self.gate_tile_width = self.grid_width * 0.76
+        self.gate_tile_height = self.gate_tile_width
+        self.line_width = round(self.width_unit * 0.15)
 
-WIDTH_UNIT = round(WINDOW_WIDTH / 100)
-WINDOW_SIZE = WINDOW_WIDTH, WINDOW_HEIGHT
-QUBIT_NUM = 2
+
+# For main.py
+
+# Logical resolution, picked from the display at startup by main.py (or
+# given with --resolution), 1200x750 otherwise
+LAYOUT = Layout()
+
+QUBIT_NUM = 3  # number of qubits of the quantum player, up to 10
 CIRCUIT_DEPTH = 18
 
 WIN_SCORE = 7
 
-# For ball.py
+# Statevector simulator backend, "numpy" (built-in) or "qiskit"
+SIMULATOR_BACKEND = "numpy"
+# Seed for measurement outcomes, None for a different game every time
+MEASUREMENT_SEED = None
+
+# Simulation steps and rendered frames per second, and simulation steps run
+# per frame at most when frames are late
+SIMULATION_RATE = 60
+RENDER_RATE = 60
+MAX_STEPS_PER_FRAME = 5
+# time unit of the ball speed, in seconds: the ball moves by its speed in
+# pixels every 1/60 s whatever the simulation rate
+SPEED_TIME_UNIT = 1 / 60
+# bounces of the ball handled within one simulation step at most
+MAX_BOUNCES_PER_STEP = 4
+
+# Frame time samples kept per stage by the profiler, and frames between two
+# refreshes of its overlay
+PROFILER_CAPACITY = 600
+PROFILER_OVERLAY_INTERVAL = 30
+
+# For ball.py and game_state.py
 LEFT = 0
 RIGHT = 1
 
+# milliseconds between two computer paddle moves, and from a measurement to
+# the refresh of the state vector paddle
+COMPUTER_PADDLE_INTERVAL = 300
+MEASUREMENT_REFRESH_DELAY = 400
+
+# speed-up of the ball on every paddle hit
+PADDLE_SPEEDUP = 1.1
+
 MEASURE_RIGHT = 1
 MEASURE_LEFT = 2
 NOTHING = 0
@@ -35,15 +103,6 @@ NOTHING = 0
 YES = 1
 NO = 0
 
-# For circuit_grid.py
-GRID_WIDTH = WIDTH_UNIT * 4.96
-GRID_HEIGHT = GRID_WIDTH
-
-GATE_TILE_WIDTH = GRID_WIDTH * 0.76
-GATE_TILE_HEIGHT = GATE_TILE_WIDTH
-
-LINE_WIDTH = round(WIDTH_UNIT * 0.15)
-
 # For scene.py
 CLASSICAL_COMPUTER = 0
 QUANTUM_COMPUTER = 1
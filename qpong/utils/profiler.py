@@ -0,0 +1,263 @@
+"""
+Per-stage frame time instrumentation and on-screen profiler overlay
+"""
+
+import csv
+import json
+import time
+
+import numpy as np
+import pygame
+
+from qpong.utils.colors import WHITE
+from qpong.utils.parameters import (
+    PROFILER_CAPACITY,
+    PROFILER_OVERLAY_INTERVAL,
+    LAYOUT,
+)
+from qpong.utils.resources import load_font
+
+
+class _Stage:
+    """
+    Context manager timing one stage into the ring buffer of the profiler
+    """
+
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.profiler.record(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class _NullStage:
+    """
+    Context manager doing nothing, used while the profiler is disabled
+    """
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class Profiler:
+    """
+    Keeps the duration of the last frames of each stage of the game loop in
+    fixed-size ring buffers
+
+    Stages are timed with
+
+        with PROFILER.stage("name"):
+            ...
+
+    which costs one method call and one attribute lookup while disabled.
+    """
+
+    def __init__(self, capacity=PROFILER_CAPACITY, enabled=False):
+        """
+        Parameters:
+        capacity (integer): samples kept per stage
+        enabled (bool): record timings
+        """
+        self.capacity = capacity
+        self.enabled = enabled
+        # the timings are exported on exit, so they are recorded whether
+        # the overlay is shown or not
+        self.export_requested = enabled
+        self.frame = 0
+
+        # per stage: duration in seconds and frame number of each sample,
+        # and the number of samples recorded so far
+        self.durations = {}
+        self.frames = {}
+        self.counts = {}
+        self._stages = {}
+
+    def clear(self):
+        """
+        Drop all samples
+        """
+        self.frame = 0
+        self.durations = {}
+        self.frames = {}
+        self.counts = {}
+
+    def stage(self, name):
+        """
+        Get a context manager timing a stage
+
+        Parameters:
+        name (string): stage name
+        """
+        if not self.enabled:
+            return _NULL_STAGE
+        stage = self._stages.get(name)
+        if stage is None:
+            stage = self._stages[name] = _Stage(self, name)
+        return stage
+
+    def record(self, name, seconds):
+        """
+        Record the duration of a stage in the current frame
+        """
+        durations = self.durations.get(name)
+        if durations is None:
+            durations = self.durations[name] = np.zeros(self.capacity)
+            self.frames[name] = np.zeros(self.capacity, dtype=np.int64)
+            self.counts[name] = 0
+        index = self.counts[name] % self.capacity
+        durations[index] = seconds
+        self.frames[name][index] = self.frame
+        self.counts[name] += 1
+
+    def end_frame(self):
+        """
+        Start a new frame
+        """
+        self.frame += 1
+
+    def samples(self, name):
+        """
+        Get the samples of a stage still in its ring buffer, oldest first
+
+        Returns:
+            tuple: (frame numbers, durations in seconds)
+        """
+        count = self.counts[name]
+        order = np.arange(max(count - self.capacity, 0), count) % self.capacity
+        return self.frames[name][order], self.durations[name][order]
+
+    def percentiles(self, percents=(50, 99)):
+        """
+        Get percentiles of the duration of each stage
+
+        Parameters:
+        percents (tuple): percentiles to compute
+
+        Returns:
+            dict: stage name to the list of percentiles, in milliseconds
+        """
+        return {
+            name: list(1000 * np.percentile(self.samples(name)[1], percents))
+            for name in self.durations
+        }
+
+    def export(self, path):
+        """
+        Write the samples of all stages, as JSON if the path ends with
+        .json, otherwise as CSV rows of stage, frame and milliseconds
+        """
+        if path.endswith(".json"):
+            result = {}
+            for name, (p50, p99) in self.percentiles().items():
+                frames, durations = self.samples(name)
+                result[name] = {
+                    "p50_ms": p50,
+                    "p99_ms": p99,
+                    "frames": frames.tolist(),
+                    "ms": (1000 * durations).tolist(),
+                }
+            with open(path, "w", encoding="utf-8") as file:
+                json.dump(result, file)
+            return
+
+        with open(path, "w", newline="", encoding="utf-8") as file:
+            writer = csv.writer(file)
+            writer.writerow(["stage", "frame", "ms"])
+            for name in self.durations:
+                frames, durations = self.samples(name)
+                writer.writerows(
+                    zip([name] * len(frames), frames.tolist(), 1000 * durations)
+                )
+
+
+# profiler of the game loop, shared by the modules it times
+PROFILER = Profiler()
+
+
+class ProfilerOverlay(pygame.sprite.DirtySprite):
+    """
+    Table of the p50 and p99 duration of each stage, drawn over the game and
+    refreshed every PROFILER_OVERLAY_INTERVAL frames while visible
+    """
+
+    def __init__(self, profiler=PROFILER, position=None):
+        """
+        Parameters:
+        profiler (Profiler): profiler whose timings are shown
+        position (tuple): top left corner, 2 width units from the left and
+            one from the top by default
+        """
+        super().__init__()
+        self.width_unit = LAYOUT.width_unit
+        if position is None:
+            position = (self.width_unit * 2, self.width_unit)
+        self.profiler = profiler
+        self.position = position
+        self.font = load_font("bit5x3.ttf", 2 * self.width_unit)
+        self.image = pygame.Surface((0, 0))
+        self.rect = self.image.get_rect(topleft=position)
+        self.visible = 0
+        self.frames_to_refresh = 0
+
+    def toggle(self):
+        """
+        Show or hide the overlay, recording timings while it is shown
+        """
+        self.visible = 1 - self.visible
+        self.profiler.enabled = self.profiler.export_requested or bool(self.visible)
+        self.frames_to_refresh = 0
+        self.dirty = 1
+
+    def update(self):  # pylint: disable=arguments-differ
+        """
+        Render the table again when it is due
+        """
+        if not self.visible:
+            return
+        if self.frames_to_refresh > 0:
+            self.frames_to_refresh -= 1
+            return
+        self.frames_to_refresh = PROFILER_OVERLAY_INTERVAL
+
+        rows = [("stage", "p50 ms", "p99 ms")] + [
+            (name, f"{p50:.2f}", f"{p99:.2f}")
+            for name, (p50, p99) in self.profiler.percentiles().items()
+        ]
+        texts = [[self.font.render(cell, 1, WHITE) for cell in row] for row in rows]
+        column_widths = [
+            max(row[column].get_width() for row in texts) + self.width_unit
+            for column in range(3)
+        ]
+        line_height = self.font.get_linesize()
+        self.image = pygame.Surface(
+            (sum(column_widths), line_height * len(texts)), pygame.SRCALPHA
+        )
+        self.image.fill((0, 0, 0, 192))
+        for i, row in enumerate(texts):
+            column_x = 0
+            for text, width in zip(row, column_widths):
+                # numbers are right aligned
+                offset = 0
+                if column_x > 0:
+                    offset = width - self.width_unit - text.get_width()
+                self.image.blit(text, (column_x + offset, i * line_height))
+                column_x += width
+        self.rect = self.image.get_rect(topleft=self.position)
+        self.dirty = 1
@@ -0,0 +1,93 @@
+"""
+Dirty-rectangle renderer for the game screen
+"""
+
+import pygame
+
+from qpong.utils.profiler import PROFILER
+
+
+class Renderer:
+    """
+    Draws the game sprites over a static background and pushes only the
+    screen regions that changed since the previous frame
+
+    Sprites must be pygame.sprite.DirtySprite instances and set their dirty
+    flag whenever they move or their image changes. They are drawn in the
+    order they are added, later ones on top.
+    """
+
+    def __init__(self, screen, scene, ball, present=True):
+        """
+        Parameters:
+        screen (pygame.Surface): surface to draw on
+        scene (Scene): scene drawing the background
+        ball (Ball): ball holding the score
+        present (bool): push the changed regions to the display, False when
+            running headless
+        """
+        self.screen = screen
+        self.present = present
+        self.scene = scene
+        self.ball = ball
+        self.sprites = pygame.sprite.LayeredDirty()
+        self.background = pygame.Surface(screen.get_size()).convert()
+        self.score_version = None
+
+        # pixels sent to the display by the last frame, and in total
+        self.pixels_pushed = 0
+        self.total_pixels_pushed = 0
+        self.frames = 0
+
+    def add(self, *sprites):
+        """
+        Add sprites on top of the ones already added
+        """
+        self.sprites.add(*sprites)
+
+    def update_background(self):
+        """
+        Redraw the background (dashed line, labels and scores) when a
+        score changes
+        """
+        if self.ball.score.version == self.score_version:
+            return
+        self.score_version = self.ball.score.version
+        self.scene.hud(self.background, self.ball)
+        self.sprites.clear(self.screen, self.background)
+        self.repaint()
+
+    def repaint(self):
+        """
+        Redraw the whole screen on the next frame, e.g. after another
+        screen was shown
+        """
+        self.sprites.repaint_rect(self.screen.get_rect())
+
+    def draw(self):
+        """
+        Draw the changed regions and push them to the display, if presenting
+
+        Returns:
+            list: updated rectangles
+        """
+        with PROFILER.stage("background"):
+            self.update_background()
+        with PROFILER.stage("sprites"):
+            rects = self.sprites.draw(self.screen)
+
+        # the screen may be a subsurface of the display, e.g. centered in
+        # full screen
+        if self.present:
+            with PROFILER.stage("present"):
+                offset = self.screen.get_abs_offset()
+                pygame.display.update([rect.move(offset) for rect in rects])
+
+        screen_rect = self.screen.get_rect()
+        self.pixels_pushed = 0
+        for rect in rects:
+            clipped = screen_rect.clip(rect)
+            self.pixels_pushed += clipped.width * clipped.height
+        self.total_pixels_pushed += self.pixels_pushed
+        self.frames += 1
+        return rects
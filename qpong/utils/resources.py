@@ -5,19 +5,22 @@ Utilities for loading resources (fonts, images and sounds)
 import os
 
 import pygame
-from qpong.utils.parameters import WIDTH_UNIT
+from qpong.utils.parameters import LAYOUT
 
 main_dir = os.path.split(os.path.abspath(__file__))[0]
 data_dir = os.path.join(main_dir, "..", "data")
 
 
-def load_image(name, colorkey=None, scale=WIDTH_UNIT / 13):
+def load_image(name, colorkey=None, scale=None):
     """
     Load image with pygame
 
     Parameters:
     name (string): file name
+    scale (float): scale of the image, LAYOUT.image_scale by default
     """
+    if scale is None:
+        scale = LAYOUT.image_scale
     if not pygame.get_init():
         pygame.init()
 
@@ -59,13 +62,16 @@ def load_sound(name):
     return sound
 
 
-def load_font(name, size=2 * WIDTH_UNIT):
+def load_font(name, size=None):
     """
     Load font with pygame font
 
     Parameters:
     name (string): file name
+    size (integer): font size, 2 width units by default
     """
+    if size is None:
+        size = 2 * LAYOUT.width_unit
     if not pygame.font.get_init():
         pygame.font.init()
 
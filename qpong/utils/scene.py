@@ -5,9 +5,7 @@ A container for managing game screens
 import pygame
 
 from qpong.utils.parameters import (
-    WIDTH_UNIT,
-    WINDOW_WIDTH,
-    WINDOW_HEIGHT,
+    LAYOUT,
     QUANTUM_COMPUTER,
     CLASSICAL_COMPUTER,
     EASY,
@@ -32,37 +30,46 @@ class Scene:
         self.qubit_num = 3
         self.font = Font()
 
+        # dashed line and player labels, drawn once
+        self.static_layer = None
+
+        # rendered score digits and the score version they show
+        self.score_texts = []
+        self.score_version = None
+
     def start(self, screen, ball):
         # pylint: disable=too-many-branches disable=too-many-return-statements
         """
         Show start screen
         """
+        width_unit = LAYOUT.width_unit
+        window_width = LAYOUT.window_width
 
         screen.fill(BLACK)
 
         gameover_text = "QPong"
         text = self.font.gameover_font.render(gameover_text, 1, WHITE)
-        text_pos = text.get_rect(center=(WINDOW_WIDTH / 2, WIDTH_UNIT * 15))
+        text_pos = text.get_rect(center=(window_width / 2, width_unit * 15))
         screen.blit(text, text_pos)
 
         gameover_text = "Select difficulty level"
         text = self.font.replay_font.render(gameover_text, 5, WHITE)
-        text_pos = text.get_rect(center=(WINDOW_WIDTH / 2, WIDTH_UNIT * 30))
+        text_pos = text.get_rect(center=(window_width / 2, width_unit * 30))
         screen.blit(text, text_pos)
 
         gameover_text = "[A] Easy  "
         text = self.font.replay_font.render(gameover_text, 5, WHITE)
-        text_pos = text.get_rect(center=(WINDOW_WIDTH / 2, WIDTH_UNIT * 35))
+        text_pos = text.get_rect(center=(window_width / 2, width_unit * 35))
         screen.blit(text, text_pos)
 
         gameover_text = "[B] Normal"
         text = self.font.replay_font.render(gameover_text, 5, WHITE)
-        text_pos = text.get_rect(center=(WINDOW_WIDTH / 2, WIDTH_UNIT * 40))
+        text_pos = text.get_rect(center=(window_width / 2, width_unit * 40))
         screen.blit(text, text_pos)
 
         gameover_text = "[X] Expert"
         text = self.font.replay_font.render(gameover_text, 5, WHITE)
-        text_pos = text.get_rect(center=(WINDOW_WIDTH / 2, WIDTH_UNIT * 45))
+        text_pos = text.get_rect(center=(window_width / 2, width_unit * 45))
         screen.blit(text, text_pos)
 
         self.credits(screen)
@@ -116,23 +123,25 @@ class Scene:
         """
         Display Game Over screen
         """
+        width_unit = LAYOUT.width_unit
+        window_width = LAYOUT.window_width
         if player == CLASSICAL_COMPUTER:
 
             screen.fill(BLACK)
 
             gameover_text = "Game Over"
             text = self.font.gameover_font.render(gameover_text, 1, WHITE)
-            text_pos = text.get_rect(center=(WINDOW_WIDTH / 2, WIDTH_UNIT * 10))
+            text_pos = text.get_rect(center=(window_width / 2, width_unit * 10))
             screen.blit(text, text_pos)
 
             gameover_text = "Classical computer"
             text = self.font.replay_font.render(gameover_text, 5, WHITE)
-            text_pos = text.get_rect(center=(WINDOW_WIDTH / 2, WIDTH_UNIT * 22))
+            text_pos = text.get_rect(center=(window_width / 2, width_unit * 22))
             screen.blit(text, text_pos)
 
             gameover_text = "still rules the world"
             text = self.font.replay_font.render(gameover_text, 5, WHITE)
-            text_pos = text.get_rect(center=(WINDOW_WIDTH / 2, WIDTH_UNIT * 27))
+            text_pos = text.get_rect(center=(window_width / 2, width_unit * 27))
             screen.blit(text, text_pos)
 
             self.credits(screen)
@@ -143,17 +152,17 @@ class Scene:
 
             gameover_text = "Congratulations!"
             text = self.font.gameover_font.render(gameover_text, 5, WHITE)
-            text_pos = text.get_rect(center=(WINDOW_WIDTH / 2, WIDTH_UNIT * 10))
+            text_pos = text.get_rect(center=(window_width / 2, width_unit * 10))
             screen.blit(text, text_pos)
 
             gameover_text = "You demonstrated quantum supremacy"
             text = self.font.replay_font.render(gameover_text, 5, WHITE)
-            text_pos = text.get_rect(center=(WINDOW_WIDTH / 2, WIDTH_UNIT * 22))
+            text_pos = text.get_rect(center=(window_width / 2, width_unit * 22))
             screen.blit(text, text_pos)
 
             gameover_text = "for the first time in human history!"
             text = self.font.replay_font.render(gameover_text, 5, WHITE)
-            text_pos = text.get_rect(center=(WINDOW_WIDTH / 2, WIDTH_UNIT * 27))
+            text_pos = text.get_rect(center=(window_width / 2, width_unit * 27))
             screen.blit(text, text_pos)
 
             self.credits(screen)
@@ -163,54 +172,87 @@ class Scene:
         """
         Show dashed line diving the playing field
         """
+        width_unit = LAYOUT.width_unit
+        window_width = LAYOUT.window_width
 
-        for i in range(10, ball.screenheight, 2 * WIDTH_UNIT):  # draw dashed line
+        for i in range(10, ball.screenheight, 2 * width_unit):  # draw dashed line
             pygame.draw.rect(
                 screen,
                 GRAY,
-                (WINDOW_WIDTH // 2 - 5, i, 0.5 * WIDTH_UNIT, WIDTH_UNIT),
+                (window_width // 2 - 5, i, 0.5 * width_unit, width_unit),
                 0,
             )
 
-    def score(self, screen, ball):
+    def labels(self, screen):
         """
-        Show score for both player
+        Show player labels above the scores
         """
-        # Print the score
+        width_unit = LAYOUT.width_unit
+        window_width = LAYOUT.window_width
         text = self.font.player_font.render("Classical Computer", 1, GRAY)
         text_pos = text.get_rect(
-            center=(round(WINDOW_WIDTH * 0.25) + WIDTH_UNIT * 4.5, WIDTH_UNIT * 1.5)
+            center=(round(window_width * 0.25) + width_unit * 4.5, width_unit * 1.5)
         )
         screen.blit(text, text_pos)
 
         text = self.font.player_font.render("Quantum Computer", 1, GRAY)
         text_pos = text.get_rect(
-            center=(round(WINDOW_WIDTH * 0.75) - WIDTH_UNIT * 4.5, WIDTH_UNIT * 1.5)
+            center=(round(window_width * 0.75) - width_unit * 4.5, width_unit * 1.5)
         )
         screen.blit(text, text_pos)
 
-        score_print = str(ball.check_score(0))
-        text = self.font.score_font.render(score_print, 1, GRAY)
-        text_pos = text.get_rect(
-            center=(round(WINDOW_WIDTH * 0.25) + WIDTH_UNIT * 4.5, WIDTH_UNIT * 8)
-        )
-        screen.blit(text, text_pos)
+    def score(self, screen, ball):
+        """
+        Show score for both player, rendering the digits again only
+        when a score has changed
+        """
+        width_unit = LAYOUT.width_unit
+        window_width = LAYOUT.window_width
+        if ball.score.version != self.score_version:
+            self.score_version = ball.score.version
+            self.score_texts = []
+
+            score_print = str(ball.check_score(0))
+            text = self.font.score_font.render(score_print, 1, GRAY)
+            text_pos = text.get_rect(
+                center=(round(window_width * 0.25) + width_unit * 4.5, width_unit * 8)
+            )
+            self.score_texts.append((text, text_pos))
 
-        score_print = str(ball.check_score(1))
-        text = self.font.score_font.render(score_print, 1, GRAY)
-        text_pos = text.get_rect(
-            center=(round(WINDOW_WIDTH * 0.75) - WIDTH_UNIT * 4.5, WIDTH_UNIT * 8)
-        )
-        screen.blit(text, text_pos)
+            score_print = str(ball.check_score(1))
+            text = self.font.score_font.render(score_print, 1, GRAY)
+            text_pos = text.get_rect(
+                center=(round(window_width * 0.75) - width_unit * 4.5, width_unit * 8)
+            )
+            self.score_texts.append((text, text_pos))
+
+        for text, text_pos in self.score_texts:
+            screen.blit(text, text_pos)
+
+    def hud(self, screen, ball):
+        """
+        Show the playing field background: one blit of the static layer
+        with the dashed line and labels, then the scores
+        """
+        if self.static_layer is None:
+            self.static_layer = pygame.Surface(screen.get_size()).convert()
+            self.static_layer.fill(BLACK)
+            self.dashed_line(self.static_layer, ball)
+            self.labels(self.static_layer)
+        screen.blit(self.static_layer, (0, 0))
+        self.score(screen, ball)
 
     def credits(self, screen):
         """
         Show credits screen
         """
+        width_unit = LAYOUT.width_unit
+        window_width = LAYOUT.window_width
+        window_height = LAYOUT.window_height
         credit_text = "Credits"
         text = self.font.credit_font.render(credit_text, 1, WHITE)
         text_pos = text.get_rect(
-            center=(WINDOW_WIDTH / 2, WINDOW_HEIGHT - WIDTH_UNIT * 8)
+            center=(window_width / 2, window_height - width_unit * 8)
         )
         screen.blit(text, text_pos)
 
@@ -219,28 +261,40 @@ class Scene:
         )
         text = self.font.credit_font.render(credit_text, 1, WHITE)
         text_pos = text.get_rect(
-            center=(WINDOW_WIDTH / 2, WINDOW_HEIGHT - WIDTH_UNIT * 5)
+            center=(window_width / 2, window_height - width_unit * 5)
         )
         screen.blit(text, text_pos)
 
         credit_text = "Inspired by IBM Qiskit camp 2019"
         text = self.font.credit_font.render(credit_text, 1, WHITE)
         text_pos = text.get_rect(
-            center=(WINDOW_WIDTH / 2, WINDOW_HEIGHT - WIDTH_UNIT * 3)
+            center=(window_width / 2, window_height - width_unit * 3)
         )
         screen.blit(text, text_pos)
 
         credit_text = "Powered by JavaFXpert/quantum-circuit-game"
         text = self.font.credit_font.render(credit_text, 1, WHITE)
         text_pos = text.get_rect(
-            center=(WINDOW_WIDTH / 2, WINDOW_HEIGHT - WIDTH_UNIT * 1)
+            center=(window_width / 2, window_height - width_unit * 1)
         )
         screen.blit(text, text_pos)
 
+    @staticmethod
+    def reset_game(score, circuit_grid_model, circuit_grid):
+        """
+        Reset all parameters to restart the game
+        """
+        score.reset_score()
+        circuit_grid_model.reset_circuit()
+        circuit_grid.update()
+        circuit_grid.reset_cursor()
+
     def replay(self, screen, score, circuit_grid_model, circuit_grid):
         """
         Pause the game and ask if the player wants to play again
         """
+        width_unit = LAYOUT.width_unit
+        window_width = LAYOUT.window_width
         blink_time = pygame.time.get_ticks()
 
         while not self.restart:
@@ -254,11 +308,7 @@ class Scene:
                     self.restart = True
 
             if self.restart:
-                # reset all parameters to restart the game
-                score.reset_score()
-                circuit_grid_model.reset_circuit()
-                circuit_grid.update()
-                circuit_grid.reset_cursor()
+                self.reset_game(score, circuit_grid_model, circuit_grid)
 
             # Make blinking text
             if pygame.time.get_ticks() - blink_time > 1000:
@@ -266,7 +316,7 @@ class Scene:
             if pygame.time.get_ticks() - blink_time > 500:
                 replay_text = "Press Any Key to Play Again"
                 text = self.font.replay_font.render(replay_text, 1, WHITE)
-                text_pos = text.get_rect(center=(WINDOW_WIDTH / 2, WIDTH_UNIT * 40))
+                text_pos = text.get_rect(center=(window_width / 2, width_unit * 40))
                 screen.blit(text, text_pos)
                 pygame.display.flip()
             else:
@@ -275,10 +325,10 @@ class Scene:
                     screen,
                     BLACK,
                     (
-                        WIDTH_UNIT * 10,
-                        WIDTH_UNIT * 35,
-                        WIDTH_UNIT * 80,
-                        WIDTH_UNIT * 10,
+                        width_unit * 10,
+                        width_unit * 35,
+                        width_unit * 80,
+                        width_unit * 10,
                     ),
                 )
                 pygame.display.flip()
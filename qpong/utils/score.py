@@ -1,20 +1,21 @@
 """
 Game score
 """
-import pygame
 
 
-class Score(pygame.sprite.Sprite):
+class Score:
     """
     Score container for ongoing game
     """
 
     def __init__(self):
-        super().__init__()
-
         self.player = 0
         self.computer = 0
 
+        # incremented on every score change, so that views can tell when
+        # to redraw
+        self.version = 0
+
     # Computer = 0, Player = 1
     def update(self, player):
         """
@@ -25,9 +26,11 @@ class Score(pygame.sprite.Sprite):
         """
         if player == 0:
             self.computer += 1
+            self.version += 1
 
         if player == 1:
             self.player += 1
+            self.version += 1
 
     def get_score(self, player):
         """
@@ -44,5 +47,7 @@ class Score(pygame.sprite.Sprite):
         """
         Reset score
         """
+        if self.computer != 0 or self.player != 0:
+            self.version += 1
         self.computer = 0
         self.player = 0
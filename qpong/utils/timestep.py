@@ -0,0 +1,51 @@
+"""
+Fixed-timestep accumulator decoupling the simulation from the frame rate
+"""
+
+from qpong.utils.parameters import MAX_STEPS_PER_FRAME, SIMULATION_RATE
+
+
+class FixedTimestep:
+    """
+    Turns the time elapsed between rendered frames into a whole number of
+    simulation steps of fixed duration
+
+    The time left over is carried to the next frame, and its fraction of a
+    step is the interpolation factor between the last two simulated states.
+    """
+
+    def __init__(self, rate=SIMULATION_RATE, max_steps=MAX_STEPS_PER_FRAME):
+        """
+        Parameters:
+        rate (integer): simulation steps per second
+        max_steps (integer): steps simulated per frame at most, the time
+            beyond them is dropped so that a slow frame does not make the
+            next ones slower still
+        """
+        self.step = 1 / rate
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+
+    def advance(self, seconds):
+        """
+        Add the time elapsed since the previous frame and iterate over the
+        simulation steps it covers
+
+        Parameters:
+        seconds (float): time elapsed
+        """
+        # half a step of margin, so that rounding never drops a step
+        self.accumulator = min(
+            self.accumulator + seconds, self.max_steps * self.step + self.step / 2
+        )
+        while self.accumulator >= self.step:
+            self.accumulator -= self.step
+            yield
+
+    @property
+    def alpha(self):
+        """
+        Interpolation factor between the previous and the current simulated
+        state, from 0 to 1
+        """
+        return self.accumulator / self.step
@@ -1,3 +1,8 @@
 """Module for quantum vizualizations"""
 
-from .statevector_grid import StatevectorGrid
+from qpong.lazy import lazy_attributes
+
+_LAZY_ATTRIBUTES = {"StatevectorGrid": ".statevector_grid"}
+
+__getattr__, __dir__ = lazy_attributes(__name__, _LAZY_ATTRIBUTES)
+__all__ = list(_LAZY_ATTRIBUTES)
@@ -2,86 +2,173 @@
 Statevector grid for quantum player
 """
 
+import numpy as np
 import pygame
 
-from qiskit.quantum_info import Statevector
-
 from qpong.utils.colors import WHITE, BLACK
-from qpong.utils.parameters import WIDTH_UNIT
+from qpong.utils.parameters import LAYOUT
 from qpong.utils.states import comp_basis_states
 from qpong.utils.ball import Ball
 from qpong.utils.font import Font
+from qpong.utils.resources import load_font
+
+# width available for basis state labels right of the paddle, in width
+# units
+LABEL_WIDTH = 8
+
+# label layers already rendered, see StatevectorGrid.label_layer
+_label_layers = {}
 
 
-class StatevectorGrid(pygame.sprite.Sprite):
+class StatevectorGrid(pygame.sprite.DirtySprite):
     """
     Displays a statevector grid
+
+    When there are more basis states than pixel rows, neighbouring basis
+    states are aggregated into bins and only the labels that fit are drawn.
     """
 
-    def __init__(self, circuit, qubit_num):
-        pygame.sprite.Sprite.__init__(self)
-        self.image = None
-        self.rect = None
+    def __init__(self, circuit_grid_model, qubit_num):
+        pygame.sprite.DirtySprite.__init__(self)
         self.ball = Ball()
         self.font = Font()
-        self.block_size = int(round(self.ball.screenheight / 2**qubit_num))
-        self.basis_states = comp_basis_states(circuit.width())
-        self.circuit = circuit
+        self.num_states = 2**qubit_num
+        self.basis_states = comp_basis_states(circuit_grid_model.max_wires)
+        self.circuit_grid_model = circuit_grid_model
+        self.width_unit = LAYOUT.width_unit
+
+        # one paddle row per basis state, or per power-of-two bin of basis
+        # states once they outnumber the pixel rows
+        self.num_rows = min(self.num_states, 2 ** int(np.log2(self.ball.screenheight)))
+        self.row_edges = self.state_edges(self.num_rows)
 
-        self.paddle = pygame.Surface([WIDTH_UNIT, self.block_size])
+        # persistent image, and the paddle column whose alpha values are
+        # written in one pass, white over the black background
+        self.image = pygame.Surface(
+            [
+                (circuit_grid_model.max_wires + 1) * 3 * self.width_unit,
+                self.ball.screenheight,
+            ]
+        ).convert()
+        self.rect = self.image.get_rect()
+        self.paddle = pygame.Surface(
+            [self.width_unit, self.ball.screenheight], pygame.SRCALPHA
+        ).convert_alpha()
         self.paddle.fill(WHITE)
-        self.paddle.convert()
 
-        self.paddle_before_measurement(circuit, qubit_num)
+        # paddle row shown by each pixel row
+        self.pixel_rows = (
+            np.searchsorted(self.row_edges, np.arange(self.ball.screenheight), "right")
+            - 1
+        )
+
+        self.paddle_before_measurement(circuit_grid_model, qubit_num)
+
+    def state_edges(self, num_rows):
+        """
+        Get the pixel boundaries of num_rows equally tall rows covering the
+        height of the statevector grid
+        """
+        return np.round(
+            np.arange(num_rows + 1) * self.ball.screenheight / num_rows
+        ).astype(int)
+
+    def label_style(self):
+        """
+        Get the font of the basis state labels and the step between
+        labelled basis states
+
+        Returns:
+            tuple: (font, step) where font is shrunk for long bitstrings so
+            that labels fit, and every step-th basis state is labelled so
+            that labels do not overlap
+        """
+        label_font = self.font.vector_font
+        label_width = label_font.size("|" + self.basis_states[-1] + ">")[0]
+        max_label_width = LABEL_WIDTH * self.width_unit
+        if label_width > max_label_width:
+            label_font = load_font(
+                "bit5x3.ttf",
+                max(1, int(3 * self.width_unit * max_label_width / label_width)),
+            )
+
+        text_height = label_font.get_height()
+        label_step = 1
+        while (
+            label_step < self.num_states
+            and label_step * self.ball.screenheight / self.num_states < text_height
+        ):
+            label_step *= 2
+        return label_font, label_step
+
+    def label_layer(self, qubit_num):
+        """
+        Get the basis state labels for a number of qubits on a black
+        background, rendered once per number of qubits and size
+        """
+        key = (qubit_num, self.num_states, self.image.get_size(), self.width_unit)
+        if key not in _label_layers:
+            label_font, label_step = self.label_style()
+            layer = pygame.Surface(self.image.get_size()).convert()
+            layer.fill(BLACK)
+            block_height = self.ball.screenheight / 2**qubit_num
+            for qb_idx in range(0, 2**qubit_num, label_step):
+                text = label_font.render(
+                    "|" + self.basis_states[qb_idx] + ">", 1, WHITE
+                )
+                text_height = text.get_height()
+                y_offset = block_height * 0.5 - text_height * 0.5
+                layer.blit(
+                    text, (2 * self.width_unit, qb_idx * block_height + y_offset)
+                )
+            _label_layers[key] = layer
+        return _label_layers[key]
 
     def display_statevector(self, qubit_num):
         """
         Draw computational basis for a statevector of a specified
         number of qubits
         """
-        for qb_idx in range(2**qubit_num):
-            text = self.font.vector_font.render(
-                "|" + self.basis_states[qb_idx] + ">", 1, WHITE
-            )
-            text_height = text.get_height()
-            y_offset = self.block_size * 0.5 - text_height * 0.5
-            self.image.blit(text, (2 * WIDTH_UNIT, qb_idx * self.block_size + y_offset))
+        self.image.blit(self.label_layer(qubit_num), (0, 0))
+        self.dirty = 1
+
+    def draw_paddle(self, alpha):
+        """
+        Draw the paddle column over the labels
+
+        Parameters:
+        alpha (numpy.ndarray): opacity (0-255) of each pixel row
+        """
+        pixels_alpha = pygame.surfarray.pixels_alpha(self.paddle)
+        pixels_alpha[...] = alpha[None, :]
+        del pixels_alpha  # unlock the surface before blitting it
+        self.image.blit(self.paddle, (0, 0))
+        self.dirty = 1
 
-    def paddle_before_measurement(self, circuit, qubit_num):
+    def paddle_before_measurement(self, circuit_grid_model, qubit_num):
         """
-        Get statevector from circuit, and set the
+        Get statevector from circuit grid, and set the
         paddle(s) alpha values according to basis
         state(s) probabilitie(s)
         """
-        self.update()
         self.display_statevector(qubit_num)
-        quantum_state = Statevector(circuit)
-
-        for basis_state, ampl in enumerate(quantum_state):
-            self.paddle.set_alpha(int(round(abs(ampl) ** 2 * 255)))
-            self.image.blit(self.paddle, (0, basis_state * self.block_size))
+        probabilities = circuit_grid_model.get_probabilities()
+        row_probabilities = probabilities.reshape(self.num_rows, -1).sum(axis=1)
+        row_alpha = np.round(np.clip(row_probabilities, 0, 1) * 255).astype(np.uint8)
+        self.draw_paddle(row_alpha[self.pixel_rows])
 
-    def paddle_after_measurement(self, circuit, qubit_num):
+    def paddle_after_measurement(self, circuit_grid_model, qubit_num):
         """
-        Measure all qubits on circuit
+        Measure all qubits on circuit grid
         """
-        self.update()
         self.display_statevector(qubit_num)
-        measurement_bitstring = Statevector(circuit).sample_memory(1)[0]
-        measurement_int = int(measurement_bitstring, 2)
+        measurement_int = circuit_grid_model.measure()
 
-        self.paddle.set_alpha(255)
-        self.image.blit(self.paddle, (0, measurement_int * self.block_size))
+        top, bottom = self.state_edges(self.num_states)[
+            measurement_int : measurement_int + 2
+        ]
+        alpha = np.zeros(self.ball.screenheight, dtype=np.uint8)
+        alpha[top : max(bottom, top + 1)] = 255
+        self.draw_paddle(alpha)
 
         return measurement_int
-
-    def update(self):
-        """
-        Update statevector grid
-        """
-        self.image = pygame.Surface(
-            [(self.circuit.width() + 1) * 3 * WIDTH_UNIT, self.ball.screenheight]
-        )
-        self.image.convert()
-        self.image.fill(BLACK)
-        self.rect = self.image.get_rect()
@@ -14,5 +14,8 @@ setuptools.setup(
     long_description=long_description,
     packages=setuptools.find_packages(),
     install_requires=install_requires,
+    entry_points={
+        "console_scripts": ["qpong-tournament=qpong.tournament:main"],
+    },
     python_requires='>=3.6'
 )
@@ -0,0 +1,149 @@
+"""
+Vectorized matches against the display-free game state
+"""
+
+import unittest
+
+import numpy as np
+
+from qpong.model.batch_game import BatchGame
+from qpong.model.circuit_grid_model import CircuitGridModel
+from qpong.model.game_state import GameState
+from qpong.utils.parameters import (
+    CIRCUIT_DEPTH,
+    NORMAL,
+    QUBIT_NUM,
+)
+
+NUM_MATCHES = 16
+NUM_STEPS = 4000
+
+
+class ReplayedRandom:
+    """
+    Random generator of a game state serving the ball in the direction of
+    the batch match it is compared with, and moving the computer paddle
+    without jitter
+    """
+
+    def __init__(self):
+        self.direction = None
+
+    def randrange(self, start, stop):
+        """
+        Serve in the direction of the batch match
+        """
+        assert start <= self.direction < stop
+        return self.direction
+
+    def randint(self, low, high):  # pylint: disable=unused-argument
+        """
+        No jitter of the computer paddle
+        """
+        return 0
+
+
+def serve_directions(batch):
+    """
+    Get the serve directions in degrees of the balls of a batch
+    """
+    return np.rint(np.degrees(np.arctan2(batch.velocity_x, -batch.velocity_y))).astype(
+        int
+    )
+
+
+def game_states(batch, outcomes):
+    """
+    Make a game state per match of a batch, serving in the same direction
+    and measuring the given outcome
+    """
+    states = []
+    for direction, outcome in zip(serve_directions(batch), outcomes):
+        rng = ReplayedRandom()
+        rng.direction = direction
+        state = GameState(
+            CircuitGridModel(QUBIT_NUM, CIRCUIT_DEPTH),
+            QUBIT_NUM,
+            rng=rng,
+            measure=lambda outcome=outcome: outcome,
+        )
+        state.ball.initial_speed_factor = NORMAL
+        state.ball.speed = state.ball.width_unit * NORMAL
+        states.append(state)
+    return states
+
+
+class TestBatchGame(unittest.TestCase):
+    """
+    A batch of matches plays like as many game states given the same serves
+    and measurement outcomes
+    """
+
+    def setUp(self):
+        self.batch = BatchGame(NUM_MATCHES, computer_jitter=0, rng=0)
+        self.batch.reset()
+        # paddle hits and measurements of the game states at the end of
+        # their last match
+        self.hits = np.zeros(NUM_MATCHES, dtype=np.int64)
+        self.measurements = np.zeros(NUM_MATCHES, dtype=np.int64)
+
+    def check_step(self, num, state, step):
+        """
+        Step a game state and compare it with its match in the batch step
+
+        Returns:
+            bool: whether the match was won in this step
+        """
+        _, rewards, done, info = step
+        score = state.ball.score
+        points = score.player, score.computer
+        state.step()
+
+        ball = state.ball
+        self.assertAlmostEqual(ball.xpos, self.batch.xpos[num], places=6)
+        self.assertAlmostEqual(ball.ypos, self.batch.ypos[num], places=6)
+        self.assertEqual(
+            score.player - points[0] - score.computer + points[1], rewards[num]
+        )
+
+        winner = state.winner()
+        self.assertEqual(done[num], winner is not None)
+        if winner is None:
+            return False
+        self.assertEqual(info["winner"][num], winner)
+        self.assertEqual(info["hits"][num], ball.hits - self.hits[num])
+        self.assertEqual(
+            info["measurements"][num], state.measurements - self.measurements[num]
+        )
+        self.hits[num], self.measurements[num] = ball.hits, state.measurements
+        score.reset_score()
+        return True
+
+    def test_matches_game_states(self):
+        """
+        Ball positions, rewards, finished matches and their statistics match
+        step by step
+        """
+        # every match measures its own basis state
+        outcomes = np.arange(NUM_MATCHES) % 2**QUBIT_NUM
+        actions = np.eye(2**QUBIT_NUM)[outcomes]
+        states = game_states(self.batch, outcomes)
+
+        finished = set()
+        for _ in range(NUM_STEPS):
+            step = self.batch.step(actions)
+            for num, (state, direction) in enumerate(
+                zip(states, serve_directions(self.batch))
+            ):
+                # the game state serves after the batch, in the same direction
+                state.rng.direction = direction
+                if self.check_step(num, state, step):
+                    finished.add(num)
+
+        # every match was played to the end at least once, with rallies
+        self.assertEqual(finished, set(range(NUM_MATCHES)))
+        self.assertGreater(self.hits.sum(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
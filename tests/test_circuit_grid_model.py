@@ -0,0 +1,215 @@
+"""
+Caching and bookkeeping of the circuit grid model
+"""
+
+import random
+import unittest
+
+import numpy as np
+
+from qpong.model import circuit_node_types as node_types
+from qpong.model.circuit_grid_model import CircuitGridModel, CircuitGridNode
+from qpong.model.statevector_simulator import StatevectorSimulator
+from tests.test_statevector_simulator import TOLERANCE, random_grid
+
+QUBIT_NUM = 4
+DEPTH = 8
+
+
+class TestPrefixCache(unittest.TestCase):
+    """
+    Statevector prefixes are only recomputed from the edited column onwards
+    """
+
+    def test_edit_recomputes_suffix(self):
+        """
+        Editing column k invalidates and recomputes columns k and later only,
+        and the result matches a simulation from scratch
+        """
+        rng = random.Random(5)
+        model = random_grid(rng, QUBIT_NUM, DEPTH)
+        model.simulate()
+        self.assertEqual(model.prefix_cache.num_valid_columns, DEPTH)
+        self.assertEqual(model.prefix_cache.last_recomputed_columns, DEPTH)
+
+        for column_num in (DEPTH - 1, 0, 3, 5):
+            model.set_node(
+                rng.randrange(QUBIT_NUM),
+                column_num,
+                CircuitGridNode(rng.choice((node_types.X, node_types.H))),
+            )
+            self.assertEqual(model.prefix_cache.num_valid_columns, column_num)
+            state = model.simulate()
+            self.assertEqual(
+                model.prefix_cache.last_recomputed_columns, DEPTH - column_num
+            )
+            np.testing.assert_allclose(
+                state, StatevectorSimulator(QUBIT_NUM).run(model), atol=TOLERANCE
+            )
+
+    def test_earliest_edit_wins(self):
+        """
+        Several edits before a simulation resume from the earliest one
+        """
+        model = random_grid(random.Random(6), QUBIT_NUM, DEPTH)
+        model.simulate()
+        model.set_node(0, 6, CircuitGridNode(node_types.X))
+        model.set_node(1, 2, CircuitGridNode(node_types.H))
+        model.set_node(2, 4, CircuitGridNode(node_types.Z))
+        self.assertEqual(model.prefix_cache.num_valid_columns, 2)
+        model.simulate()
+        self.assertEqual(model.prefix_cache.last_recomputed_columns, DEPTH - 2)
+
+    def test_unchanged_grid_recomputes_nothing(self):
+        """
+        Simulating again without edits reuses the last column state
+        """
+        model = random_grid(random.Random(7), QUBIT_NUM, DEPTH)
+        state = model.simulate()
+        recomputed_columns = model.prefix_cache.recomputed_columns
+        self.assertIs(model.simulate(), state)
+        self.assertEqual(model.prefix_cache.last_recomputed_columns, 0)
+        self.assertEqual(model.prefix_cache.recomputed_columns, recomputed_columns)
+
+    def test_reset_invalidates_all_columns(self):
+        """
+        Resetting the circuit recomputes every column back to |0...0>
+        """
+        model = random_grid(random.Random(8), QUBIT_NUM, DEPTH)
+        model.simulate()
+        model.reset_circuit()
+        self.assertEqual(model.prefix_cache.num_valid_columns, 0)
+        state = model.simulate()
+        self.assertEqual(model.prefix_cache.last_recomputed_columns, DEPTH)
+        np.testing.assert_allclose(
+            state, CircuitGridModel(QUBIT_NUM, DEPTH).simulate(), atol=TOLERANCE
+        )
+
+
+class TestResultCache(unittest.TestCase):
+    """
+    Simulation results are looked up by the exact content of the grid
+    """
+
+    def test_undo_hits(self):
+        """
+        Undoing an edit finds the results of the grid before the edit
+        """
+        model = random_grid(random.Random(10), QUBIT_NUM, DEPTH)
+        probabilities = model.get_probabilities()
+        node = model.get_node(1, 3)
+        model.set_node(1, 3, CircuitGridNode(node_types.H))
+        model.get_probabilities()
+        self.assertEqual(model.result_cache.misses, 2)
+
+        model.set_node(1, 3, node)
+        self.assertIs(model.get_probabilities(), probabilities)
+        self.assertEqual(model.result_cache.hits, 1)
+        self.assertEqual(model.result_cache.misses, 2)
+
+    def test_different_grids_miss(self):
+        """
+        Every distinct grid gets its own results, even when it holds the
+        same gates as another grid on other cells
+        """
+        model = CircuitGridModel(QUBIT_NUM, DEPTH)
+        cells = [(0, 0), (1, 0), (0, 1), (1, 1)]
+        for wire_num, column_num in cells:
+            model.reset_circuit()
+            model.set_node(wire_num, column_num, CircuitGridNode(node_types.X))
+            np.testing.assert_allclose(
+                model.get_statevector(),
+                StatevectorSimulator(QUBIT_NUM).run(model),
+                atol=TOLERANCE,
+            )
+        self.assertEqual(model.result_cache.hits, 0)
+        self.assertEqual(model.result_cache.misses, len(cells))
+        self.assertEqual(len(model.result_cache), len(cells))
+
+    def test_matching_results_on_hit(self):
+        """
+        Results served from the cache are those of a fresh simulation
+        """
+        rng = random.Random(11)
+        model = CircuitGridModel(QUBIT_NUM, DEPTH)
+        grids = [random_grid(rng, QUBIT_NUM, DEPTH) for _ in range(5)]
+        for _ in range(3):
+            for grid in grids:
+                for wire_num in range(QUBIT_NUM):
+                    for column_num in range(DEPTH):
+                        model.set_node(
+                            wire_num, column_num, grid.get_node(wire_num, column_num)
+                        )
+                np.testing.assert_allclose(
+                    model.get_statevector(), grid.simulate(), atol=TOLERANCE
+                )
+        self.assertEqual(model.result_cache.misses, len(grids))
+        self.assertEqual(model.result_cache.hits, 2 * len(grids))
+
+
+class TestReverseIndex(unittest.TestCase):
+    """
+    The control/swap index answers like a scan of the column's nodes
+    """
+
+    def test_gate_part_matches_column_scan(self):
+        """
+        Empty wires show the part of the topmost gate that links them
+        """
+        rng = random.Random(9)
+        for _ in range(20):
+            model = random_grid(rng, rng.randint(2, 6), 4)
+            for wire_num in range(model.max_wires):
+                for column_num in range(model.max_columns):
+                    expected = int(model.node_type[wire_num, column_num])
+                    if expected == node_types.EMPTY:
+                        expected = scan_gate_part(model, wire_num, column_num)
+                    self.assertEqual(
+                        model.get_node_gate_part(wire_num, column_num), expected
+                    )
+
+    def test_bottommost_gate_owns_a_shared_control(self):
+        """
+        A control wire shared by two gates belongs to the bottom one
+        """
+        model = CircuitGridModel(4, 1)
+        model.set_node(0, 0, CircuitGridNode(node_types.X, 0, 2))
+        model.set_node(3, 0, CircuitGridNode(node_types.Z, 0, 2))
+        self.assertEqual(model.get_node_gate_part(2, 0), node_types.CTRL)
+        self.assertEqual(model.get_gate_wire_for_control_node(2, 0), 3)
+
+        model.set_node(3, 0, CircuitGridNode(node_types.EMPTY))
+        self.assertEqual(model.get_gate_wire_for_control_node(2, 0), 0)
+        model.set_node(0, 0, CircuitGridNode(node_types.EMPTY))
+        self.assertEqual(model.get_node_gate_part(2, 0), node_types.EMPTY)
+        self.assertEqual(model.get_gate_wire_for_control_node(2, 0), -1)
+
+    def test_control_shadowed_by_swap(self):
+        """
+        A wire that is a swap partner above and a control below shows the
+        swap but still reports the gate it controls
+        """
+        model = CircuitGridModel(4, 1)
+        model.set_node(0, 0, CircuitGridNode(node_types.SWAP, swap=2))
+        model.set_node(3, 0, CircuitGridNode(node_types.X, 0, 2))
+        self.assertEqual(model.get_node_gate_part(2, 0), node_types.SWAP)
+        self.assertEqual(model.get_gate_wire_for_control_node(2, 0), 3)
+
+
+def scan_gate_part(model, wire_num, column_num):
+    """
+    Find the CTRL/SWAP part of an empty wire by scanning the other nodes of
+    its column from the top, like the model did before the reverse index
+    """
+    for other_wire_num in range(model.max_wires):
+        if other_wire_num != wire_num:
+            node = model.get_node(other_wire_num, column_num)
+            if wire_num in (node.ctrl_a, node.ctrl_b):
+                return node_types.CTRL
+            if node.swap == wire_num:
+                return node_types.SWAP
+    return node_types.EMPTY
+
+
+if __name__ == "__main__":
+    unittest.main()
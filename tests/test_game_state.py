@@ -0,0 +1,311 @@
+"""
+Display-free game state: swept collisions of the ball with the edges and
+paddles, and the rules of a match
+"""
+
+import math
+import random
+import unittest
+
+from qpong.model.circuit_grid_model import CircuitGridModel
+from qpong.model.game_state import BallState, GameState, Paddle
+from qpong.utils.parameters import (
+    CIRCUIT_DEPTH,
+    CLASSICAL_COMPUTER,
+    COMPUTER_PADDLE_INTERVAL,
+    MAX_BOUNCES_PER_STEP,
+    MEASUREMENT_REFRESH_DELAY,
+    PADDLE_SPEEDUP,
+    QUANTUM_COMPUTER,
+    QUBIT_NUM,
+    SIMULATION_RATE,
+    WIN_SCORE,
+)
+
+# basis state every measurement of the quantum player gives
+MEASURED_STATE = 5
+
+
+class CountingBall(BallState):
+    """
+    Ball counting its bounces off the edges and the tops of paddles
+    """
+
+    def __init__(self):
+        super().__init__(rng=random.Random(0))
+        self.wall_bounces = 0
+
+    def bounce_wall(self):
+        super().bounce_wall()
+        self.wall_bounces += 1
+
+    def place(self, xpos, ypos, direction, speed):
+        """
+        Put the ball somewhere with a direction in degrees and a speed
+        """
+        self.xpos, self.ypos = xpos, ypos
+        self.direction = direction
+        self.speed = speed
+
+
+def per_frame_update(ball, paddles):
+    """
+    Move the ball by one step and bounce it once it overlaps an edge or a
+    paddle, as the ball did before swept collisions
+    """
+    radians = math.radians(ball.direction)
+    ball.xpos += ball.speed * math.sin(radians)
+    ball.ypos -= ball.speed * math.cos(radians)
+    if ball.ypos <= ball.top_edge or ball.ypos > ball.bottom_edge - ball.height:
+        ball.bounce_wall()
+    for paddle in paddles:
+        if (
+            paddle.left - ball.width < ball.xpos < paddle.right
+            and paddle.top - ball.height < ball.ypos < paddle.bottom
+        ):
+            ball.bounce_edge()
+
+
+class TestSweptCollisions(unittest.TestCase):
+    """
+    A ball bounces at its exact time of impact whatever its speed
+    """
+
+    def setUp(self):
+        self.ball = CountingBall()
+        # a paddle in the middle of the field, as tall as a quarter of it
+        self.paddle = Paddle(
+            self.ball.screenwidth // 2,
+            self.ball.screenheight // 4,
+            self.ball.width_unit,
+            self.ball.screenheight // 4,
+        )
+
+    def test_fast_ball_does_not_tunnel_through_a_paddle(self):
+        """
+        A ball moving many paddle widths in one step bounces off the paddle
+        """
+        ball, paddle = self.ball, self.paddle
+        start = paddle.left - ball.width - 10
+        ball.place(start, paddle.top + 5, 90, 10 * paddle.width + 40)
+        ball.move(ball.speed, 0, (paddle,))
+        self.assertEqual(ball.hits, 1)
+        self.assertEqual(ball.direction, 270)
+        self.assertAlmostEqual(ball.speed, (10 * paddle.width + 40) * PADDLE_SPEEDUP)
+        self.assertLessEqual(ball.xpos, paddle.left - ball.width)
+        # the rest of the displacement is travelled backwards, sped up
+        travelled = 10 * paddle.width + 40 - 10
+        self.assertAlmostEqual(ball.xpos, start + 10 - travelled * PADDLE_SPEEDUP)
+
+    def test_fast_ball_does_not_tunnel_through_an_edge(self):
+        """
+        A ball moving further than the field height in one step stays in
+        the field
+        """
+        ball = self.ball
+        for direction, sign in ((180, 1), (0, -1)):
+            ball.place(ball.left_edge, ball.screenheight / 2, direction, 0)
+            ball.move(0, sign * ball.screenheight * 0.9, ())
+            self.assertGreaterEqual(ball.ypos, ball.top_edge)
+            self.assertLessEqual(ball.ypos, ball.bottom_edge - ball.height)
+        self.assertEqual(ball.wall_bounces, 2)
+
+    def test_bounces_within_one_step(self):
+        """
+        Every bounce within a step is resolved, up to MAX_BOUNCES_PER_STEP
+        """
+        ball = self.ball
+        span = ball.bottom_edge - ball.height - ball.top_edge
+
+        # down to the bottom, up to the top, and down by a quarter of the
+        # field: two bounces
+        ball.place(ball.left_edge, ball.top_edge + span / 2, 180, 0)
+        ball.move(0, span * 2.25 - span / 2, ())
+        self.assertEqual(ball.wall_bounces, 2)
+        self.assertAlmostEqual(ball.ypos, ball.top_edge + span * 0.25)
+        self.assertEqual(ball.direction, 180)
+
+        # far more bounces than allowed: the ball stops on an edge
+        ball.wall_bounces = 0
+        ball.move(0, span * (MAX_BOUNCES_PER_STEP + 3), ())
+        self.assertEqual(ball.wall_bounces, MAX_BOUNCES_PER_STEP)
+        self.assertIn(
+            round(ball.ypos, 6), (ball.top_edge, ball.bottom_edge - ball.height)
+        )
+
+    def test_paddle_moved_onto_the_ball(self):
+        """
+        A paddle jumping onto the ball sends it back when the ball heads to
+        the middle of the paddle, and lets it leave otherwise
+        """
+        ball, paddle = self.ball, self.paddle
+        ypos = paddle.top + 5
+
+        # overlapping the left half of the paddle, heading right: bounce
+        ball.place(paddle.left - ball.width / 2, ypos, 90, 5)
+        ball.move(5, 0, (paddle,))
+        self.assertEqual(ball.hits, 1)
+        self.assertEqual(ball.direction, 270)
+        self.assertLess(ball.xpos, paddle.left - ball.width / 2)
+
+        # same place, heading left and out of the paddle: no bounce
+        ball.place(paddle.left - ball.width / 2, ypos, 270, 5)
+        ball.move(-5, 0, (paddle,))
+        self.assertEqual(ball.hits, 1)
+        self.assertEqual(ball.direction, 270)
+        self.assertAlmostEqual(ball.xpos, paddle.left - ball.width / 2 - 5)
+
+    def test_matches_per_frame_collisions_at_low_speed(self):
+        """
+        At low speed the swept ball bounces off the same edges and paddles
+        in the same order as the per-frame ball, which only bounces once it
+        overlaps and so falls behind by up to a step per bounce
+        """
+        paddles = (self.paddle,)
+        for direction in (55, 85, 95, 140):
+            swept, per_frame = CountingBall(), CountingBall()
+            for ball in (swept, per_frame):
+                ball.place(swept.left_edge * 4, self.paddle.top + 50, direction, 2)
+
+            swept_bounces, per_frame_bounces = [], []
+            for step in range(1500):
+                radians = math.radians(swept.direction)
+                swept.move(
+                    swept.speed * math.sin(radians),
+                    -swept.speed * math.cos(radians),
+                    paddles,
+                )
+                per_frame_update(per_frame, paddles)
+                for ball, bounces in (
+                    (swept, swept_bounces),
+                    (per_frame, per_frame_bounces),
+                ):
+                    count = (ball.hits, ball.wall_bounces)
+                    if count != (bounces[-1][1] if bounces else (0, 0)):
+                        bounces.append((step, count))
+                tolerance = 2 * swept.speed * (len(swept_bounces) + 1)
+                self.assertLess(abs(swept.xpos - per_frame.xpos), tolerance)
+                self.assertLess(abs(swept.ypos - per_frame.ypos), tolerance)
+
+            self.assertEqual(
+                [count for _, count in swept_bounces],
+                [count for _, count in per_frame_bounces],
+            )
+            self.assertGreater(swept.hits, 0)
+            for num, ((step, _), (per_frame_step, _)) in enumerate(
+                zip(swept_bounces, per_frame_bounces)
+            ):
+                self.assertLessEqual(per_frame_step - num - 1, step)
+                self.assertLessEqual(step, per_frame_step)
+
+
+class TestGameState(unittest.TestCase):
+    """
+    Scoring, computer paddle moves and measurements of a match
+    """
+
+    def setUp(self):
+        self.measured = []
+        self.state = GameState(
+            CircuitGridModel(QUBIT_NUM, CIRCUIT_DEPTH),
+            QUBIT_NUM,
+            ball=CountingBall(),
+            rng=random.Random(0),
+            measure=self.measure,
+        )
+        self.state.computer_jitter = 0
+        self.ball = self.state.ball
+
+    def measure(self):
+        """
+        Measure the quantum player circuit, always in MEASURED_STATE
+        """
+        self.measured.append(self.state.time)
+        return MEASURED_STATE
+
+    def step_until(self, condition, max_steps=1000):
+        """
+        Step the match until a condition holds
+
+        Returns:
+            integer: steps simulated
+        """
+        for steps in range(1, max_steps + 1):
+            self.state.step()
+            if condition():
+                return steps
+        return self.fail(f"condition not met after {max_steps} steps")
+
+    def test_points_and_winner(self):
+        """
+        A ball beyond an edge scores for the other player and is served
+        again, the first player to WIN_SCORE points wins
+        """
+        state, ball = self.state, self.ball
+        for point in range(WIN_SCORE):
+            self.assertIsNone(state.winner())
+            ball.place(ball.left_edge - 50, ball.screenheight / 2, 270, 1)
+            state.step()
+            self.assertEqual(ball.check_score(QUANTUM_COMPUTER), point + 1)
+            self.assertGreater(ball.xpos, ball.left_edge)
+        self.assertEqual(ball.check_score(CLASSICAL_COMPUTER), 0)
+        self.assertEqual(state.winner(), QUANTUM_COMPUTER)
+
+        ball.score.reset_score()
+        ball.place(ball.right_edge + 50, ball.screenheight / 2, 90, 1)
+        state.step()
+        self.assertEqual(ball.check_score(CLASSICAL_COMPUTER), 1)
+        self.assertIsNone(state.winner())
+
+    def test_computer_paddle_follows_ball(self):
+        """
+        The computer paddle centres on the ball every
+        COMPUTER_PADDLE_INTERVAL milliseconds
+        """
+        state, ball = self.state, self.ball
+        paddle = state.left_paddle
+        ball.place(ball.screenwidth / 2, ball.screenheight / 3, 180, 1)
+        steps = self.step_until(lambda: paddle.ypos != 0)
+        self.assertEqual(steps, COMPUTER_PADDLE_INTERVAL * SIMULATION_RATE // 1000 + 1)
+        self.assertEqual(paddle.ypos, round(ball.ypos - paddle.height / 2))
+
+        # the paddle stays put until the next move is due
+        ypos = paddle.ypos
+        state.step()
+        self.assertEqual(paddle.ypos, ypos)
+
+    def test_measurement_in_right_zone(self):
+        """
+        The circuit is measured once when the ball goes through the right
+        measurement zone, the paddle moves to the measured basis state and
+        the statevector is shown again after MEASUREMENT_REFRESH_DELAY
+        """
+        state, ball = self.state, self.ball
+        zone_start = ball.right_edge - 12 * ball.width_unit
+        ball.place(zone_start - 20, ball.screenheight / 2, 90, 2)
+        self.step_until(lambda: self.measured)
+        self.assertEqual(state.measurements, 1)
+        self.assertEqual(
+            state.right_paddle.ypos,
+            round(MEASURED_STATE * ball.screenheight / 2**QUBIT_NUM),
+        )
+
+        # still in the zone: no new measurement
+        state.step()
+        self.assertEqual(len(self.measured), 1)
+        self.assertFalse(state.refresh_requested)
+        self.step_until(lambda: state.refresh_requested)
+        self.assertGreater(state.time - self.measured[0], MEASUREMENT_REFRESH_DELAY)
+        self.assertEqual(len(self.measured), 1)
+
+    def test_play(self):
+        """
+        play() stops at the winner, or after max_steps steps
+        """
+        self.assertIsNone(self.state.play(max_steps=10))
+        self.assertAlmostEqual(self.state.time, 10 * 1000 / SIMULATION_RATE)
+        self.assertIn(self.state.play(), (CLASSICAL_COMPUTER, QUANTUM_COMPUTER))
+
+
+if __name__ == "__main__":
+    unittest.main()
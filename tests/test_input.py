@@ -0,0 +1,68 @@
+"""
+Paddle updates requested by the input events of a frame
+"""
+
+import unittest
+from types import SimpleNamespace
+
+from qpong.utils.input import Input
+
+
+class TestPaddleUpdates(unittest.TestCase):
+    """
+    Circuit changes only mark the paddle as stale, it is simulated at most
+    once per frame
+    """
+
+    def setUp(self):
+        self.input = Input()
+        # qubit numbers the paddle was simulated with
+        self.simulations = []
+        self.level = SimpleNamespace(
+            circuit_grid_model=None,
+            right_statevector=SimpleNamespace(arrange=lambda: None),
+            statevector_grid=SimpleNamespace(
+                paddle_before_measurement=lambda model, qubit_num: (
+                    self.simulations.append(qubit_num)
+                )
+            ),
+        )
+        self.scene = SimpleNamespace(qubit_num=3)
+
+    def test_events_of_a_frame_update_once(self):
+        """
+        Many requests in a frame give a single paddle update
+        """
+        for _ in range(5):
+            self.input.request_paddle_update()
+        self.assertEqual(len(self.simulations), 0)
+        self.assertEqual(self.input.coalesced_paddle_updates, 4)
+
+        self.input.update_frame(self.level, self.scene)
+        self.assertEqual(len(self.simulations), 1)
+        self.assertEqual(self.input.paddle_updates, 1)
+        self.assertEqual(self.input.coalesced_paddle_updates, 4)
+
+    def test_frames_without_requests(self):
+        """
+        Frames without requests do not update the paddle, later requests
+        update it again
+        """
+        self.input.update_frame(self.level, self.scene)
+        self.assertEqual(len(self.simulations), 0)
+
+        self.input.request_paddle_update()
+        for _ in range(3):
+            self.input.update_frame(self.level, self.scene)
+        self.assertEqual(len(self.simulations), 1)
+
+        self.input.request_paddle_update()
+        self.input.request_paddle_update()
+        self.input.update_frame(self.level, self.scene)
+        self.assertEqual(len(self.simulations), 2)
+        self.assertEqual(self.input.paddle_update_requests, 3)
+        self.assertEqual(self.input.coalesced_paddle_updates, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+"""
+Alias-table measurement sampler
+"""
+
+import unittest
+
+import numpy as np
+
+from qpong.model.measurement_sampler import MeasurementSampler
+
+SHOTS = 200000
+
+# chi-square critical value for 15 degrees of freedom at p = 0.001
+CHI_SQUARE_15_DOF = 37.70
+
+
+def random_probabilities(rng, num_outcomes, num_zeros=0):
+    """
+    Draw a random probability vector with some outcomes set to zero
+    """
+    probabilities = rng.random(num_outcomes)
+    probabilities[rng.choice(num_outcomes, num_zeros, replace=False)] = 0
+    return probabilities / probabilities.sum()
+
+
+class TestMeasurementSampler(unittest.TestCase):
+    """
+    Check the distribution and reproducibility of sampled outcomes
+    """
+
+    def test_distribution(self):
+        """
+        Outcome frequencies pass a chi-square test against the probabilities
+        """
+        probabilities = random_probabilities(np.random.default_rng(0), 16)
+        sampler = MeasurementSampler(probabilities, 1)
+        counts = np.bincount(sampler.sample_many(SHOTS), minlength=16)
+        expected = probabilities * SHOTS
+        chi_square = ((counts - expected) ** 2 / expected).sum()
+        self.assertLess(chi_square, CHI_SQUARE_15_DOF)
+
+    def test_single_samples_follow_the_distribution(self):
+        """
+        sample() draws from the same distribution as sample_many()
+        """
+        probabilities = np.array([0.5, 0.25, 0.125, 0.125])
+        sampler = MeasurementSampler(probabilities, 2)
+        counts = np.bincount([sampler.sample() for _ in range(20000)], minlength=4)
+        np.testing.assert_allclose(counts / 20000, probabilities, atol=0.02)
+
+    def test_seed_is_reproducible(self):
+        """
+        Samplers seeded alike draw the same sequence, other seeds do not
+        """
+        probabilities = random_probabilities(np.random.default_rng(3), 8)
+        first, second, other = (
+            MeasurementSampler(probabilities, seed) for seed in (7, 7, 8)
+        )
+        np.testing.assert_array_equal(first.sample_many(100), second.sample_many(100))
+        self.assertEqual(
+            [first.sample() for _ in range(100)], [second.sample() for _ in range(100)]
+        )
+        self.assertFalse(np.array_equal(first.sample_many(100), other.sample_many(100)))
+
+    def test_shared_generator(self):
+        """
+        A generator passed in is used as is, not reseeded
+        """
+        rng = np.random.default_rng(4)
+        sampler = MeasurementSampler([0.5, 0.5], rng)
+        self.assertIs(sampler.rng, rng)
+
+    def test_zero_probabilities_never_drawn(self):
+        """
+        Outcomes of probability 0 never come out
+        """
+        rng = np.random.default_rng(5)
+        for num_outcomes in (2, 5, 64, 1024):
+            probabilities = random_probabilities(
+                rng, num_outcomes, num_zeros=num_outcomes // 2
+            )
+            sampler = MeasurementSampler(probabilities, rng)
+            outcomes = sampler.sample_many(SHOTS // 10)
+            self.assertTrue((probabilities[outcomes] > 0).all())
+            self.assertGreater(probabilities[sampler.sample()], 0)
+
+    def test_deterministic_state(self):
+        """
+        A single outcome of probability 1 is always drawn
+        """
+        probabilities = np.zeros(32)
+        probabilities[19] = 1
+        sampler = MeasurementSampler(probabilities, 6)
+        np.testing.assert_array_equal(sampler.sample_many(1000), 19)
+
+
+if __name__ == "__main__":
+    unittest.main()
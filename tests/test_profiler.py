@@ -0,0 +1,61 @@
+"""
+Frame time profiler and its overlay
+"""
+
+import unittest
+
+from qpong.utils.profiler import Profiler, ProfilerOverlay
+
+
+class TestProfiler(unittest.TestCase):
+    """
+    Record stage timings only when they are shown or exported
+    """
+
+    def test_disabled_profiler_records_nothing(self):
+        """
+        Stages of a disabled profiler are not timed
+        """
+        profiler = Profiler()
+        with profiler.stage("draw"):
+            pass
+        self.assertEqual(profiler.durations, {})
+
+        profiler.enabled = True
+        with profiler.stage("draw"):
+            pass
+        self.assertEqual(profiler.counts["draw"], 1)
+
+    def test_ring_buffer(self):
+        """
+        Only the last capacity samples of a stage are kept, oldest first
+        """
+        profiler = Profiler(capacity=4, enabled=True)
+        for frame in range(6):
+            profiler.record("step", frame / 1000)
+            profiler.end_frame()
+        frames, durations = profiler.samples("step")
+        self.assertEqual(frames.tolist(), [2, 3, 4, 5])
+        self.assertEqual((durations * 1000).round().tolist(), [2, 3, 4, 5])
+
+    def test_overlay_toggle(self):
+        """
+        Showing the overlay starts recording and hiding it stops recording,
+        unless the timings are exported
+        """
+        profiler = Profiler()
+        overlay = ProfilerOverlay(profiler, (0, 0))
+        overlay.toggle()
+        self.assertTrue(profiler.enabled)
+        overlay.toggle()
+        self.assertFalse(profiler.enabled)
+
+        profiler = Profiler(enabled=True)
+        overlay = ProfilerOverlay(profiler, (0, 0))
+        overlay.toggle()
+        overlay.toggle()
+        self.assertTrue(profiler.enabled)
+
+
+if __name__ == "__main__":
+    unittest.main()
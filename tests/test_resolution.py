@@ -0,0 +1,55 @@
+"""
+Logical resolution and the layout derived from it
+"""
+
+import unittest
+
+from qpong.model.game_state import GameState
+from qpong.resolution import DEFAULT_RESOLUTION, fit_resolution, parse_resolution
+from qpong.utils.parameters import LAYOUT
+
+
+class TestResolution(unittest.TestCase):
+    """
+    Parse and fit resolutions, and size the game from LAYOUT
+    """
+
+    def tearDown(self):
+        LAYOUT.set_resolution(DEFAULT_RESOLUTION)
+
+    def test_parse_resolution(self):
+        """
+        Resolutions are written WIDTHxHEIGHT with positive sizes
+        """
+        self.assertEqual(parse_resolution("1920X1200"), (1920, 1200))
+        for text in ("1920", "1920x", "axb", "0x100", "-5x100"):
+            with self.assertRaises(ValueError):
+                parse_resolution(text)
+
+    def test_fit_resolution(self):
+        """
+        The fitted resolution keeps the game aspect ratio within the display
+        """
+        self.assertEqual(fit_resolution((1920, 1080)), (1728, 1080))
+        self.assertEqual(fit_resolution((1280, 1024)), (1280, 800))
+
+    def test_layout_read_at_setup(self):
+        """
+        Objects built after the resolution is set are sized from it, even
+        though their modules were imported before
+        """
+        LAYOUT.set_resolution((1728, 1080))
+        state = GameState(None, 3, measure=lambda: 0)
+        self.assertEqual(LAYOUT.width_unit, 17)
+        self.assertEqual(state.ball.screenwidth, 1728)
+        self.assertEqual(state.ball.screenheight, 756)
+        self.assertEqual(state.right_paddle.xpos, 90 * 17)
+
+        LAYOUT.set_resolution(DEFAULT_RESOLUTION)
+        state = GameState(None, 3, measure=lambda: 0)
+        self.assertEqual(state.ball.screenwidth, DEFAULT_RESOLUTION[0])
+        self.assertEqual(state.right_paddle.xpos, 90 * 12)
+
+
+if __name__ == "__main__":
+    unittest.main()
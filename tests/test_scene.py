@@ -0,0 +1,72 @@
+"""
+Score digits drawn by the game scene
+"""
+
+import random
+import unittest
+
+import pygame
+
+from qpong.model.game_state import BallState
+from qpong.utils.parameters import CLASSICAL_COMPUTER, LAYOUT, QUANTUM_COMPUTER
+from qpong.utils.scene import Scene
+
+
+class TestScoreCache(unittest.TestCase):
+    """
+    Score digits are rendered again only when a score changes
+    """
+
+    def setUp(self):
+        self.scene = Scene()
+        self.screen = pygame.Surface(LAYOUT.window_size)
+        self.ball = BallState(rng=random.Random(0))
+
+    def rendered_digits(self):
+        """
+        Draw the scores and get the digit surfaces drawn
+        """
+        self.scene.score(self.screen, self.ball)
+        return [text for text, _ in self.scene.score_texts]
+
+    def test_unchanged_score_reuses_digits(self):
+        """
+        Drawing the same score again blits the cached surfaces
+        """
+        digits = self.rendered_digits()
+        self.assertEqual(len(digits), 2)
+        for cached, drawn in zip(digits, self.rendered_digits()):
+            self.assertIs(cached, drawn)
+
+    def test_score_change_renders_again(self):
+        """
+        A point bumps the score version and renders the digits again
+        """
+        score = self.ball.score
+        digits = self.rendered_digits()
+        for player in (CLASSICAL_COMPUTER, QUANTUM_COMPUTER):
+            version = score.version
+            score.update(player)
+            self.assertEqual(score.version, version + 1)
+            drawn = self.rendered_digits()
+            for cached, new in zip(digits, drawn):
+                self.assertIsNot(cached, new)
+            digits = drawn
+
+        score.reset_score()
+        self.assertEqual(score.version, version + 2)
+        self.assertIsNot(self.rendered_digits()[0], digits[0])
+
+    def test_reset_of_zero_score_keeps_digits(self):
+        """
+        Resetting a score that is already zero keeps the cached digits
+        """
+        digits = self.rendered_digits()
+        version = self.ball.score.version
+        self.ball.score.reset_score()
+        self.assertEqual(self.ball.score.version, version)
+        self.assertIs(self.rendered_digits()[0], digits[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
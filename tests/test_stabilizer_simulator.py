@@ -0,0 +1,146 @@
+"""
+Stabilizer tableau fast path for Clifford-only circuit grids
+"""
+
+import random
+import unittest
+
+import numpy as np
+
+from qpong.model import circuit_node_types as node_types
+from qpong.model.circuit_grid_model import CircuitGridModel, CircuitGridNode
+from qpong.model.measurement_sampler import MeasurementSampler
+from qpong.model.stabilizer_simulator import (
+    StabilizerSampler,
+    StabilizerSimulator,
+    is_clifford_grid,
+)
+from qpong.model.statevector_simulator import BACKEND_QISKIT, StatevectorSimulator
+from tests.test_statevector_simulator import TOLERANCE, random_grid
+
+NUM_GRIDS = 40
+
+
+def numpy_probabilities(model):
+    """
+    Get the probabilities of a grid from the NumPy statevector simulator
+    """
+    return np.abs(StatevectorSimulator(model.max_wires).run(model)) ** 2
+
+
+class TestStabilizerSimulator(unittest.TestCase):
+    """
+    Compare the tableau with the NumPy statevector simulator
+    """
+
+    def test_probabilities(self):
+        """
+        The probabilities of random Clifford grids of 1 to 10 qubits match
+        the NumPy statevector ones
+        """
+        rng = random.Random(12)
+        for _ in range(NUM_GRIDS):
+            qubit_num = rng.randint(1, 10)
+            model = random_grid(rng, qubit_num, rng.randint(1, 8), clifford=True)
+            self.assertTrue(is_clifford_grid(model))
+            probabilities = StabilizerSimulator(qubit_num).run(model).probabilities()
+            np.testing.assert_allclose(
+                probabilities, numpy_probabilities(model), atol=TOLERANCE
+            )
+
+    def test_model_uses_tableau(self):
+        """
+        The model measures Clifford grids with the tableau and samples only
+        outcomes of non-zero probability
+        """
+        rng = random.Random(13)
+        for _ in range(NUM_GRIDS // 4):
+            model = random_grid(rng, 6, 6, clifford=True)
+            self.assertIsNotNone(model.get_stabilizer_state())
+            self.assertIsInstance(model.get_measurement_sampler(), StabilizerSampler)
+            probabilities = model.get_probabilities()
+            np.testing.assert_allclose(
+                probabilities, numpy_probabilities(model), atol=TOLERANCE
+            )
+            outcomes = model.get_measurement_sampler().sample_many(1000)
+            self.assertTrue((probabilities[outcomes] > 0).all())
+
+    def test_outcome_space(self):
+        """
+        The outcome space of a GHZ state is 0...0 and 1...1
+        """
+        model = CircuitGridModel(4, 2)
+        model.set_node(0, 0, CircuitGridNode(node_types.H))
+        for wire_num in range(1, 4):
+            model.set_node(wire_num, 1, CircuitGridNode(node_types.X, 0, 0))
+        offset, basis = StabilizerSimulator(4).run(model).outcome_space()
+        self.assertFalse(offset.any())
+        np.testing.assert_array_equal(basis, [[True] * 4])
+
+
+class TestCliffordDetection(unittest.TestCase):
+    """
+    Grids with a non-Clifford gate fall back to the dense simulator
+    """
+
+    NON_CLIFFORD_NODES = {
+        "t": ((0, CircuitGridNode(node_types.T)),),
+        "tdg": ((0, CircuitGridNode(node_types.TDG)),),
+        "rx": ((0, CircuitGridNode(node_types.X, np.pi / 4)),),
+        "ry": ((0, CircuitGridNode(node_types.Y, np.pi / 2)),),
+        "rz": ((0, CircuitGridNode(node_types.Z, np.pi)),),
+        "ch": (
+            (1, CircuitGridNode(node_types.CTRL)),
+            (0, CircuitGridNode(node_types.H, 0, 1)),
+        ),
+        "cs": (
+            (1, CircuitGridNode(node_types.CTRL)),
+            (0, CircuitGridNode(node_types.S, 0, 1)),
+        ),
+        "ccx": (
+            (1, CircuitGridNode(node_types.CTRL)),
+            (2, CircuitGridNode(node_types.CTRL)),
+            (0, CircuitGridNode(node_types.X, 0, 1, 2)),
+        ),
+        "cswap": (
+            (1, CircuitGridNode(node_types.CTRL)),
+            (0, CircuitGridNode(node_types.SWAP, 0, 1, swap=2)),
+        ),
+    }
+
+    def test_non_clifford_grids(self):
+        """
+        A single non-Clifford gate among Clifford ones disables the tableau,
+        and the probabilities come from the statevector
+        """
+        for name, nodes in self.NON_CLIFFORD_NODES.items():
+            with self.subTest(gate=name):
+                model = random_grid(random.Random(14), 3, 4, clifford=True)
+                for wire_num in range(3):
+                    model.set_node(wire_num, 2, CircuitGridNode(node_types.H))
+                self.assertTrue(is_clifford_grid(model))
+                for wire_num, node in nodes:
+                    model.set_node(wire_num, 2, node)
+                self.assertFalse(is_clifford_grid(model))
+                self.assertIsNone(model.get_stabilizer_state())
+                self.assertIsInstance(
+                    model.get_measurement_sampler(), MeasurementSampler
+                )
+                np.testing.assert_allclose(
+                    model.get_probabilities(),
+                    numpy_probabilities(model),
+                    atol=TOLERANCE,
+                )
+
+    def test_qiskit_backend_skips_tableau(self):
+        """
+        Only the NumPy backend measures with the tableau
+        """
+        model = CircuitGridModel(2, 1, BACKEND_QISKIT)
+        model.set_node(0, 0, CircuitGridNode(node_types.H))
+        self.assertTrue(is_clifford_grid(model))
+        self.assertIsNone(model.get_stabilizer_state())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,230 @@
+"""
+Equivalence of the NumPy, batch and stabilizer simulators with qiskit
+"""
+
+import random
+import unittest
+
+import numpy as np
+
+from qpong.model import circuit_node_types as node_types
+from qpong.model.batch_simulator import probabilities_batch, stack_grids
+from qpong.model.circuit_grid_model import CircuitGridModel, CircuitGridNode
+from qpong.model.stabilizer_simulator import StabilizerSimulator, is_clifford_grid
+from qpong.model.statevector_simulator import (
+    BACKEND_NUMPY,
+    BACKEND_QISKIT,
+    FUSE_MAX_QUBITS,
+    StatevectorSimulator,
+    column_operations,
+    simulate,
+)
+
+# amplitudes are complex64
+TOLERANCE = 1e-6
+
+NUM_GRIDS = 40
+
+GATES = (
+    node_types.IDEN,
+    node_types.X,
+    node_types.Y,
+    node_types.Z,
+    node_types.S,
+    node_types.SDG,
+    node_types.T,
+    node_types.TDG,
+    node_types.H,
+    node_types.SWAP,
+)
+CLIFFORD_GATES = (
+    node_types.IDEN,
+    node_types.X,
+    node_types.Y,
+    node_types.Z,
+    node_types.S,
+    node_types.SDG,
+    node_types.H,
+    node_types.SWAP,
+)
+
+
+def random_grid(rng, qubit_num, depth, clifford=False):
+    """
+    Build a circuit grid of random gates, rotations, controls and swaps
+
+    Parameters:
+    rng (random.Random): random generator
+    qubit_num (integer): number of wires
+    depth (integer): number of columns
+    clifford (boolean): only place Clifford gates: X, Y and Z with at most
+        one control, the other gates without control
+    """
+    model = CircuitGridModel(qubit_num, depth, BACKEND_NUMPY)
+    for column_num in range(depth):
+        free = list(range(qubit_num))
+        rng.shuffle(free)
+        while free:
+            wire_num = free.pop()
+            if rng.random() < 0.3:
+                continue
+            node_type = rng.choice(CLIFFORD_GATES if clifford else GATES)
+            radians = 0.0
+            if not clifford and node_type in (node_types.X, node_types.Y, node_types.Z):
+                radians = rng.choice((0.0, np.pi / 8 * rng.randint(1, 15)))
+            ctrl_a = ctrl_b = swap = -1
+            if node_type == node_types.SWAP:
+                if not free:
+                    continue
+                swap = free.pop()
+            controllable = not clifford or node_type in (
+                node_types.X,
+                node_types.Y,
+                node_types.Z,
+            )
+            if controllable and free and rng.random() < 0.4:
+                ctrl_a = free.pop()
+                model.set_node(ctrl_a, column_num, CircuitGridNode(node_types.CTRL))
+            if not clifford and free and rng.random() < 0.3:
+                ctrl_b = free.pop()
+                model.set_node(ctrl_b, column_num, CircuitGridNode(node_types.CTRL))
+            model.set_node(
+                wire_num,
+                column_num,
+                CircuitGridNode(node_type, radians, ctrl_a, ctrl_b, swap),
+            )
+    return model
+
+
+class TestSimulators(unittest.TestCase):
+    """
+    Compare each simulator with qiskit on seeded random grids
+    """
+
+    def test_statevector_simulator(self):
+        """
+        The NumPy statevector matches the qiskit one
+        """
+        rng = random.Random(1)
+        for _ in range(NUM_GRIDS):
+            qubit_num = rng.randint(1, 5)
+            model = random_grid(rng, qubit_num, rng.randint(1, 6))
+            expected = simulate(model, BACKEND_QISKIT)
+            np.testing.assert_allclose(
+                simulate(model, BACKEND_NUMPY), expected, atol=TOLERANCE
+            )
+            np.testing.assert_allclose(
+                StatevectorSimulator(qubit_num).run(model), expected, atol=TOLERANCE
+            )
+
+    def test_unfused_columns(self):
+        """
+        The per-gate kernels of grids too large to fuse match qiskit,
+        including controlled rotations, ccx, ccz and swaps
+        """
+        rng = random.Random(4)
+        gate_names = set()
+        for _ in range(NUM_GRIDS // 2):
+            qubit_num = rng.randint(FUSE_MAX_QUBITS + 1, 10)
+            model = random_grid(rng, qubit_num, 6)
+            simulator = StatevectorSimulator(qubit_num)
+            np.testing.assert_allclose(
+                simulator.run(model),
+                simulate(model, BACKEND_QISKIT),
+                atol=TOLERANCE,
+            )
+            for compiled_column in simulator.column_cache.entries.values():
+                self.assertIsNone(compiled_column.operator)
+            for column_num in range(model.max_columns):
+                for name, _, _, controls in column_operations(model, column_num):
+                    gate_names.add("c" * len(controls) + name)
+        self.assertLessEqual(
+            {"crx", "cry", "crz", "ccx", "ccz", "swap", "cswap"}, gate_names
+        )
+
+    def test_probabilities_batch(self):
+        """
+        The batched probabilities match those of qiskit, grid by grid
+        """
+        rng = random.Random(2)
+        for qubit_num in range(1, 5):
+            models = [random_grid(rng, qubit_num, 6) for _ in range(NUM_GRIDS // 4)]
+            probabilities = probabilities_batch(*stack_grids(models))
+            for model, row in zip(models, probabilities):
+                expected = np.abs(simulate(model, BACKEND_QISKIT)) ** 2
+                np.testing.assert_allclose(row, expected, atol=TOLERANCE)
+
+    def test_stabilizer_simulator(self):
+        """
+        The stabilizer probabilities of Clifford-only grids match those of
+        qiskit
+        """
+        rng = random.Random(3)
+        for _ in range(NUM_GRIDS):
+            qubit_num = rng.randint(1, 5)
+            model = random_grid(rng, qubit_num, rng.randint(1, 6), clifford=True)
+            self.assertTrue(is_clifford_grid(model))
+            expected = np.abs(simulate(model, BACKEND_QISKIT)) ** 2
+            probabilities = StabilizerSimulator(qubit_num).run(model).probabilities()
+            np.testing.assert_allclose(probabilities, expected, atol=TOLERANCE)
+
+
+class TestColumnCache(unittest.TestCase):
+    """
+    Columns are compiled once and looked up by content afterwards
+    """
+
+    def test_empty_columns_are_skipped(self):
+        """
+        Columns without gates leave the state untouched and are not compiled
+        """
+        model = CircuitGridModel(3, 4, BACKEND_NUMPY)
+        model.set_node(1, 0, CircuitGridNode(node_types.CTRL))
+        model.set_node(2, 2, CircuitGridNode(node_types.TRACE))
+        simulator = StatevectorSimulator(3)
+        state = simulator.initial_state()
+        for column_num in range(model.max_columns):
+            simulator.apply_column(state, model, column_num)
+        np.testing.assert_array_equal(state, simulator.initial_state())
+        self.assertEqual(len(simulator.column_cache), 0)
+        self.assertEqual(simulator.column_cache.misses, 0)
+
+    def test_identical_columns_share_an_entry(self):
+        """
+        Columns with the same gates, on the same or on another grid, reuse
+        the compiled column
+        """
+        simulator = StatevectorSimulator(3)
+        models = []
+        for _ in range(2):
+            model = CircuitGridModel(3, 4, BACKEND_NUMPY)
+            for column_num in range(model.max_columns):
+                model.set_node(0, column_num, CircuitGridNode(node_types.H))
+                model.set_node(2, column_num, CircuitGridNode(node_types.X, 0, 0))
+            models.append(model)
+        for model in models:
+            np.testing.assert_allclose(
+                simulator.run(model), simulate(model, BACKEND_QISKIT), atol=TOLERANCE
+            )
+        self.assertEqual(len(simulator.column_cache), 1)
+        self.assertEqual(simulator.column_cache.misses, 1)
+        self.assertEqual(simulator.column_cache.hits, 7)
+
+    def test_edited_column_is_compiled_again(self):
+        """
+        A column whose gates changed misses the cache
+        """
+        model = CircuitGridModel(3, 1, BACKEND_NUMPY)
+        model.set_node(0, 0, CircuitGridNode(node_types.H))
+        simulator = StatevectorSimulator(3)
+        simulator.run(model)
+        model.set_node(1, 0, CircuitGridNode(node_types.Y))
+        np.testing.assert_allclose(
+            simulator.run(model), simulate(model, BACKEND_QISKIT), atol=TOLERANCE
+        )
+        self.assertEqual(len(simulator.column_cache), 2)
+        self.assertEqual(simulator.column_cache.misses, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
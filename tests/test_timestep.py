@@ -0,0 +1,88 @@
+"""
+Fixed-timestep accumulator of the game loop
+"""
+
+import unittest
+
+from qpong.utils.timestep import FixedTimestep
+
+RATE = 60
+STEP = 1 / RATE
+
+
+class TestFixedTimestep(unittest.TestCase):
+    """
+    Elapsed frame times turn into whole simulation steps
+    """
+
+    def test_steps_per_frame(self):
+        """
+        A frame simulates as many steps as it lasted, the rest is carried
+        over to the next frame
+        """
+        timestep = FixedTimestep(RATE, max_steps=10)
+        self.assertEqual(len(list(timestep.advance(STEP / 2))), 0)
+        self.assertEqual(len(list(timestep.advance(STEP / 2))), 1)
+        self.assertEqual(len(list(timestep.advance(3 * STEP))), 3)
+        self.assertEqual(len(list(timestep.advance(2.5 * STEP))), 2)
+        self.assertEqual(len(list(timestep.advance(STEP / 2))), 1)
+
+    def test_no_time_lost_whatever_the_frame_rate(self):
+        """
+        Over a second, the steps simulated and the fraction of a step
+        carried over add up to the simulation rate however the second is
+        cut into frames
+        """
+        for frame_rate in (30, 60, 75, 144, 240):
+            timestep = FixedTimestep(RATE)
+            steps = sum(
+                len(list(timestep.advance(1 / frame_rate))) for _ in range(frame_rate)
+            )
+            self.assertAlmostEqual(steps + timestep.alpha, RATE)
+
+    def test_deterministic(self):
+        """
+        The same frame times give the same steps and interpolation factors
+        """
+        frame_times = [(7 * frame % 23 + 4) / 1000 for frame in range(500)]
+        runs = []
+        for _ in range(2):
+            timestep = FixedTimestep(RATE)
+            runs.append(
+                [
+                    (len(list(timestep.advance(frame_time))), timestep.alpha)
+                    for frame_time in frame_times
+                ]
+            )
+        self.assertEqual(runs[0], runs[1])
+
+    def test_slow_frame_is_clamped(self):
+        """
+        A frame longer than max_steps steps only simulates max_steps steps
+        and drops the rest, so that the next frames are not slower still
+        """
+        timestep = FixedTimestep(RATE, max_steps=5)
+        self.assertEqual(len(list(timestep.advance(2.0))), 5)
+        self.assertLess(timestep.accumulator, STEP)
+        self.assertEqual(len(list(timestep.advance(STEP))), 1)
+
+    def test_alpha(self):
+        """
+        The interpolation factor is the fraction of a step left over
+        """
+        timestep = FixedTimestep(RATE)
+        self.assertEqual(timestep.alpha, 0)
+        list(timestep.advance(STEP / 4))
+        self.assertAlmostEqual(timestep.alpha, 0.25)
+        list(timestep.advance(STEP))
+        self.assertAlmostEqual(timestep.alpha, 0.25)
+        list(timestep.advance(STEP / 2))
+        self.assertAlmostEqual(timestep.alpha, 0.75)
+        for _ in range(100):
+            list(timestep.advance(0.7 * STEP))
+            self.assertGreaterEqual(timestep.alpha, 0)
+            self.assertLess(timestep.alpha, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+"""
+Headless tournament between quantum player policies and the computer
+"""
+
+import json
+import os
+import tempfile
+import unittest
+
+from qpong.tournament import Report, match_tasks, run_tournament
+from qpong.utils.parameters import CLASSICAL_COMPUTER, QUANTUM_COMPUTER
+
+POLICIES = ("idle", "tracker")
+DIFFICULTIES = ("easy", "expert")
+
+
+def result(policy, winner, points=(7, 0), steps=100, hits=0, measurements=0):
+    """
+    Make a match result of the normal difficulty
+    """
+    return {
+        "policy": policy,
+        "difficulty": "normal",
+        "match": 0,
+        "winner": winner,
+        "computer_score": points[0],
+        "quantum_score": points[1],
+        "steps": steps,
+        "hits": hits,
+        "measurements": measurements,
+    }
+
+
+class TestRunTournament(unittest.TestCase):
+    """
+    Matches are reproducible and come out in task order whatever the
+    number of workers
+    """
+
+    def test_workers_reproducible(self):
+        """
+        Playing in this process and in a pool gives the same results
+        """
+        expected = list(
+            run_tournament(match_tasks(POLICIES, DIFFICULTIES, 3, 0), workers=0)
+        )
+        self.assertEqual(len(expected), 3 * len(POLICIES) * len(DIFFICULTIES))
+        for chunksize in (1, 16):
+            tasks = match_tasks(POLICIES, DIFFICULTIES, 3, 0)
+            self.assertEqual(
+                list(run_tournament(tasks, workers=2, chunksize=chunksize)), expected
+            )
+
+    def test_seed_changes_matches(self):
+        """
+        Another master seed plays other matches
+        """
+        first, other = (
+            list(run_tournament(match_tasks(POLICIES, ("easy",), 2, seed), workers=0))
+            for seed in (0, 1)
+        )
+        self.assertNotEqual(first, other)
+
+    def test_results_not_all_consumed(self):
+        """
+        Stopping early shuts the pool down, even with more tasks than can
+        be in flight
+        """
+        results = run_tournament(
+            match_tasks(POLICIES, DIFFICULTIES, 50, 0), workers=2, chunksize=1
+        )
+        first = next(results)
+        results.close()
+        self.assertEqual((first["policy"], first["match"]), (POLICIES[0], 0))
+
+
+class TestReport(unittest.TestCase):
+    """
+    Match results are aggregated per policy and difficulty
+    """
+
+    def setUp(self):
+        self.report = Report()
+        for match_result in (
+            result("idle", CLASSICAL_COMPUTER, (7, 2), 300, 6, 4),
+            result("idle", QUANTUM_COMPUTER, (5, 7), 500, 10, 8),
+            result("idle", "", (3, 3), 1000, 2, 6),
+            result("tracker", QUANTUM_COMPUTER, (0, 7), 200, 7, 5),
+        ):
+            self.report.add(match_result)
+
+    def test_rows(self):
+        """
+        Rows hold the rates and averages of each policy and difficulty
+        """
+        rows = {row["policy"]: row for row in self.report.rows()}
+        self.assertEqual(
+            rows["idle"],
+            {
+                "policy": "idle",
+                "difficulty": "normal",
+                "matches": 3,
+                "unfinished": 1,
+                "win_rate": 1 / 3,
+                "rally_length": 18 / 27,
+                "measurements_per_match": 6,
+                "steps_per_match": 600,
+            },
+        )
+        self.assertEqual(rows["tracker"]["win_rate"], 1)
+        self.assertEqual(rows["tracker"]["rally_length"], 1)
+
+    def test_no_points(self):
+        """
+        A policy without any point has a rally length of its hits
+        """
+        report = Report()
+        report.add(result("idle", "", (0, 0), hits=3))
+        self.assertEqual(next(report.rows())["rally_length"], 3)
+
+    def test_write(self):
+        """
+        The report is written as JSON or CSV by extension
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "report.json")
+            self.report.write(path)
+            with open(path, encoding="utf-8") as file:
+                self.assertEqual(json.load(file), list(self.report.rows()))
+
+            path = os.path.join(directory, "report.csv")
+            self.report.write(path)
+            with open(path, encoding="utf-8") as file:
+                lines = file.read().splitlines()
+            self.assertEqual(len(lines), 3)
+            self.assertTrue(lines[0].startswith("policy,difficulty,matches"))
+
+
+if __name__ == "__main__":
+    unittest.main()